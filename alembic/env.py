@@ -5,7 +5,9 @@ from alembic import context
 from app.database.core import *
 from app.config import settings
 from app.userapp.entities import DocumentUser
-from app.taskapp.entities import DocumentCollection, DocumentCollectionFile
+from app.taskapp.entities import DocumentCollection
+from app.fileapp.entities import DocumentCollectionFile
+from app.audit.entities import RequestAuditLog
 
 # alembic config obj
 config = context.config
@@ -33,8 +35,25 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def do_run_migrations(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,  # Optional: detects type changes
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    # a caller may hand in its own connection (tests/database/test_migrations.py)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        do_run_migrations(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix="sqlalchemy.",
@@ -42,14 +61,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            compare_type=True,  # Optional: detects type changes
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
@@ -0,0 +1,32 @@
+"""keyset pagination indexes
+
+Revision ID: 4b7e1c9a2f3d
+Revises: 085daf3367f0
+Create Date: 2026-10-16 10:12:41.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e1c9a2f3d'
+down_revision: Union[str, Sequence[str], None] = '085daf3367f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_document_collection_user_id_created_at_id', 'document_collection', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_document_files_user_id_is_active_created_at_id', 'document_files', ['user_id', 'is_active', 'created_at', 'id'], unique=False)
+    op.create_index('ix_document_files_document_id_created_at_id', 'document_files', ['document_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_files_document_id_created_at_id', table_name='document_files')
+    op.drop_index('ix_document_files_user_id_is_active_created_at_id', table_name='document_files')
+    op.drop_index('ix_document_collection_user_id_created_at_id', table_name='document_collection')
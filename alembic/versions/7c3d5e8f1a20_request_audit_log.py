@@ -0,0 +1,46 @@
+"""request audit log
+
+Revision ID: 7c3d5e8f1a20
+Revises: 4b7e1c9a2f3d
+Create Date: 2026-10-16 14:05:12.481920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3d5e8f1a20'
+down_revision: Union[str, Sequence[str], None] = '4b7e1c9a2f3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # parent table only, daily partitions are created ahead of time by app.audit.partitions
+    op.create_table('request_audit_log',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('method', sa.String(length=10), nullable=False),
+    sa.Column('path', sa.String(length=2048), nullable=False),
+    sa.Column('status_code', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('ip', sa.String(length=64), nullable=True),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.Column('request_payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('response_payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_request_audit_log_user_id_created_at', 'request_audit_log', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_request_audit_log_user_id_created_at', table_name='request_audit_log')
+    # dropping the partitioned parent drops every partition with it
+    op.drop_table('request_audit_log')
@@ -0,0 +1,49 @@
+"""resumable upload sessions
+
+Revision ID: 9e2f6a4b7c81
+Revises: 7c3d5e8f1a20
+Create Date: 2026-10-16 16:41:37.912344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2f6a4b7c81'
+down_revision: Union[str, Sequence[str], None] = '7c3d5e8f1a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('upload_sessions',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('extension', sa.String(length=10), nullable=False),
+    sa.Column('total_size', sa.BigInteger(), nullable=False),
+    sa.Column('received_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('checksum', sa.String(length=64), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['document_collection.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['document_users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_sessions_updated_at'), 'upload_sessions', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_upload_sessions_user_id'), 'upload_sessions', ['user_id'], unique=False)
+    # resumable uploads can exceed 2 GiB
+    op.alter_column('document_files', 'file_size', existing_type=sa.Integer(), type_=sa.BigInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('document_files', 'file_size', existing_type=sa.BigInteger(), type_=sa.Integer(), existing_nullable=False)
+    op.drop_index(op.f('ix_upload_sessions_user_id'), table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_updated_at'), table_name='upload_sessions')
+    op.drop_table('upload_sessions')
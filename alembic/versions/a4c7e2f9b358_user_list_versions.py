@@ -0,0 +1,30 @@
+"""per user document and file list versions
+
+Revision ID: a4c7e2f9b358
+Revises: f3a8d5b1c246
+Create Date: 2026-10-17 03:48:12.906135
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2f9b358'
+down_revision: Union[str, Sequence[str], None] = 'f3a8d5b1c246'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('document_users', sa.Column('documents_version', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('document_users', sa.Column('files_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('document_users', 'files_version')
+    op.drop_column('document_users', 'documents_version')
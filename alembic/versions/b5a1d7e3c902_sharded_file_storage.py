@@ -0,0 +1,39 @@
+"""sharded file storage, file_path only kept for unmigrated files
+
+Revision ID: b5a1d7e3c902
+Revises: 9e2f6a4b7c81
+Create Date: 2026-10-16 23:41:08.215670
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5a1d7e3c902'
+down_revision: Union[str, Sequence[str], None] = '9e2f6a4b7c81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('document_files', 'file_path',
+               existing_type=sa.String(length=255),
+               nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # write the derived sharded path back so the column can be NOT NULL again
+    op.execute(sa.text(
+        "UPDATE document_files SET file_path = :upload_dir || '/' || substr(checksum, 1, 2) || '/' "
+        "|| substr(checksum, 3, 2) || '/' || checksum || extension WHERE file_path IS NULL"
+    ).bindparams(upload_dir=str(settings.upload_dir.resolve())))
+    op.alter_column('document_files', 'file_path',
+               existing_type=sa.String(length=255),
+               nullable=False)
@@ -0,0 +1,42 @@
+"""file blobs with reference counts
+
+Revision ID: c8e4f2a6b913
+Revises: b5a1d7e3c902
+Create Date: 2026-10-17 00:12:44.530187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e4f2a6b913'
+down_revision: Union[str, Sequence[str], None] = 'b5a1d7e3c902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('file_blobs',
+    sa.Column('checksum', sa.String(length=64), nullable=False),
+    sa.Column('extension', sa.String(length=10), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('checksum')
+    )
+    # existing content: one reference per active row, fully deleted content starts at 0
+    op.execute(
+        "INSERT INTO file_blobs (checksum, extension, size, ref_count) "
+        "SELECT checksum, MIN(extension), MAX(file_size), SUM(CASE WHEN is_active THEN 1 ELSE 0 END) "
+        "FROM document_files WHERE checksum IS NOT NULL GROUP BY checksum"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('file_blobs')
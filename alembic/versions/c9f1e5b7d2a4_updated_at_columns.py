@@ -0,0 +1,36 @@
+"""updated_at columns as mapped
+
+Revision ID: c9f1e5b7d2a4
+Revises: b7d4e1a9c350
+Create Date: 2026-10-17 10:02:18.664913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9f1e5b7d2a4'
+down_revision: Union[str, Sequence[str], None] = 'b7d4e1a9c350'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # mapped since the initial tables but never migrated; NULL until the user is first updated, like the model
+    op.add_column('document_users', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    # the models insert NULL here until the first update
+    op.alter_column('document_collection', 'updated_at', existing_type=sa.DateTime(), nullable=True)
+    op.alter_column('document_files', 'updated_at', existing_type=sa.DateTime(), nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE document_files SET updated_at = created_at WHERE updated_at IS NULL")
+    op.alter_column('document_files', 'updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.execute("UPDATE document_collection SET updated_at = created_at WHERE updated_at IS NULL")
+    op.alter_column('document_collection', 'updated_at', existing_type=sa.DateTime(), nullable=False)
+    op.drop_column('document_users', 'updated_at')
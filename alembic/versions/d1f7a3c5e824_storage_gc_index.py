@@ -0,0 +1,28 @@
+"""storage gc index on released blobs
+
+Revision ID: d1f7a3c5e824
+Revises: c8e4f2a6b913
+Create Date: 2026-10-17 01:03:52.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f7a3c5e824'
+down_revision: Union[str, Sequence[str], None] = 'c8e4f2a6b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_file_blobs_released_updated_at', 'file_blobs', ['updated_at'], unique=False, postgresql_where=sa.text('ref_count = 0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_file_blobs_released_updated_at', table_name='file_blobs', postgresql_where=sa.text('ref_count = 0'))
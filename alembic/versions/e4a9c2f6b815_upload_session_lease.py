@@ -0,0 +1,30 @@
+"""upload session lease
+
+Revision ID: e4a9c2f6b815
+Revises: c9f1e5b7d2a4
+Create Date: 2026-10-17 14:21:40.318275
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c2f6b815'
+down_revision: Union[str, Sequence[str], None] = 'c9f1e5b7d2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('upload_sessions', sa.Column('lease_token', sa.String(length=32), nullable=True))
+    op.add_column('upload_sessions', sa.Column('leased_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('upload_sessions', 'leased_until')
+    op.drop_column('upload_sessions', 'lease_token')
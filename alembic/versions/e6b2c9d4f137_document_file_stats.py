@@ -0,0 +1,43 @@
+"""document file count and size counters
+
+Revision ID: e6b2c9d4f137
+Revises: d1f7a3c5e824
+Create Date: 2026-10-17 02:14:27.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b2c9d4f137'
+down_revision: Union[str, Sequence[str], None] = 'd1f7a3c5e824'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('document_collection', sa.Column('file_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('document_collection', sa.Column('total_bytes', sa.BigInteger(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE document_collection SET
+            file_count = (
+                SELECT count(*) FROM document_files
+                WHERE document_files.document_id = document_collection.id AND document_files.is_active
+            ),
+            total_bytes = (
+                SELECT coalesce(sum(file_size), 0) FROM document_files
+                WHERE document_files.document_id = document_collection.id AND document_files.is_active
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('document_collection', 'total_bytes')
+    op.drop_column('document_collection', 'file_count')
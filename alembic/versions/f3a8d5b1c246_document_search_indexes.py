@@ -0,0 +1,49 @@
+"""document search and sort indexes
+
+Revision ID: f3a8d5b1c246
+Revises: e6b2c9d4f137
+Create Date: 2026-10-17 03:05:41.264718
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8d5b1c246'
+down_revision: Union[str, Sequence[str], None] = 'e6b2c9d4f137'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_document_collection_user_id_title_id', 'document_collection', ['user_id', 'title', 'id'], unique=False)
+
+    # must stay identical to app.taskapp.document_service.search_vector() for the planner to use it
+    op.execute(
+        "CREATE INDEX ix_document_collection_search ON document_collection USING gin "
+        "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))"
+    )
+
+    # substring search: ILIKE '%fragment%' on either column. pg_trgm ships with postgres contrib; builds
+    # without it keep working, substring matches just scan the user's rows
+    trgm_available = op.get_bind().scalar(sa.text("SELECT count(*) FROM pg_available_extensions WHERE name = 'pg_trgm'"))
+    if not trgm_available:
+        logging.getLogger("alembic").warning("pg_trgm is not available, skipping the substring search indexes")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_document_collection_title_trgm ON document_collection USING gin (title gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_document_collection_description_trgm ON document_collection USING gin (description gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_document_collection_description_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_document_collection_title_trgm")
+    op.drop_index('ix_document_collection_search', table_name='document_collection')
+    op.drop_index('ix_document_collection_user_id_title_id', table_name='document_collection')
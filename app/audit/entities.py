@@ -0,0 +1,47 @@
+import uuid
+
+from sqlalchemy import DDL, Integer, String, DateTime, Float, JSON, Uuid, event, func, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import mapped_column, Mapped
+
+from app.database.core import Base
+
+PayloadType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class RequestAuditLog(Base):
+    """
+    one row per handled request, range partitioned by created_at (one partition per UTC day) on postgres
+    """
+    __tablename__ = 'request_audit_log'
+    __table_args__ = (
+        Index('ix_request_audit_log_user_id_created_at', 'user_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    # the partition key has to be part of the primary key
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    method: Mapped[str] = mapped_column(String(10), nullable=False)
+    path: Mapped[str] = mapped_column(String(2048), nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # no FK, audit rows outlive the users they describe
+    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    ip: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    duration_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    request_payload: Mapped[dict | str | None] = mapped_column(PayloadType, nullable=True)
+    response_payload: Mapped[dict | str | None] = mapped_column(PayloadType, nullable=True)
+
+    def __repr__(self):
+        return f"<RequestAuditLog(id={self.id}, method='{self.method}', path='{self.path}', status_code={self.status_code})>"
+
+
+# catches rows no daily partition covers yet (e.g. maintenance did not run), instead of failing their batch
+DEFAULT_PARTITION = f"{RequestAuditLog.__tablename__}_default"
+
+event.listen(
+    RequestAuditLog.__table__,
+    "after_create",
+    DDL(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {RequestAuditLog.__tablename__} DEFAULT")
+    .execute_if(dialect="postgresql")
+)
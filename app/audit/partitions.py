@@ -0,0 +1,93 @@
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.audit.entities import DEFAULT_PARTITION, RequestAuditLog
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+AUDIT_TABLE = RequestAuditLog.__tablename__
+PARTITION_PATTERN = re.compile(rf"^{AUDIT_TABLE}_(\d{{8}})$")
+
+
+def partition_name(day: date) -> str:
+    return f"{AUDIT_TABLE}_{day:%Y%m%d}"
+
+
+async def ensure_partitions(conn: AsyncConnection, start: date, days: int) -> List[str]:
+    """
+    create the daily partitions for [start, start + days], bounds are UTC midnights. rows of such a day
+    already sitting in the default partition are moved into the new partition before it is attached,
+    postgres refuses the attach otherwise
+    """
+    existing = await list_partitions(conn)
+    created = []
+    for offset in range(days + 1):
+        day = start + timedelta(days=offset)
+        name = partition_name(day)
+        if name in existing:
+            continue
+
+        lower = f"'{day.isoformat()} 00:00:00+00'"
+        upper = f"'{(day + timedelta(days=1)).isoformat()} 00:00:00+00'"
+        await conn.execute(text(f"CREATE TABLE {name} (LIKE {AUDIT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        await conn.execute(text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= {lower} AND created_at < {upper} "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        ))
+        await conn.execute(text(f"ALTER TABLE {AUDIT_TABLE} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"))
+        created.append(name)
+    return created
+
+
+async def list_partitions(conn: AsyncConnection) -> Dict[str, date]:
+    rows = await conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {"table": AUDIT_TABLE})
+
+    partitions = {}
+    for (name,) in rows:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions[name] = datetime.strptime(match.group(1), "%Y%m%d").date()
+    return partitions
+
+
+async def drop_expired_partitions(conn: AsyncConnection, today: date, retention_days: int) -> List[str]:
+    """
+    drop whole daily partitions older than retention_days. only the stragglers in the default partition
+    are deleted row by row
+    """
+    cutoff = today - timedelta(days=retention_days)
+    dropped = []
+    for name, day in sorted((await list_partitions(conn)).items(), key=lambda item: item[1]):
+        if day < cutoff:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+
+    await conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < '{cutoff.isoformat()} 00:00:00+00'"))
+    return dropped
+
+
+async def maintain_partitions(engine: AsyncEngine, retention_days: int, premake_days: int) -> Dict[str, List[str]]:
+    """
+    make sure upcoming partitions exist and expired ones are gone; a no-op on non-postgres databases
+    """
+    if engine.dialect.name != "postgresql":
+        return {"created": [], "dropped": []}
+
+    today = datetime.now(timezone.utc).date()
+    async with engine.begin() as conn:
+        created = await ensure_partitions(conn, today, premake_days)
+        dropped = await drop_expired_partitions(conn, today, retention_days)
+
+    if dropped:
+        logger.info("audit log partitions dropped", partitions=dropped)
+    return {"created": created, "dropped": dropped}
@@ -0,0 +1,38 @@
+"""
+audit log partition retention, meant for cron:
+
+    python -m app.audit.retention --retention-days 30 --premake-days 3
+
+the API worker runs the same maintenance hourly; this entry point covers deployments that disable it
+"""
+import argparse
+import asyncio
+
+from app.audit.partitions import maintain_partitions
+from app.config import settings
+from app.database.core import engine
+from app.logger import configure_logger, get_logger
+
+logger = get_logger(__name__)
+
+
+async def run(retention_days: int, premake_days: int) -> None:
+    try:
+        result = await maintain_partitions(engine, retention_days, premake_days)
+        logger.info("audit log retention finished", created=len(result["created"]), dropped=result["dropped"])
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="create upcoming and drop expired audit log partitions")
+    parser.add_argument("--retention-days", type=int, default=settings.audit_log_retention_days)
+    parser.add_argument("--premake-days", type=int, default=settings.audit_log_premake_days)
+    args = parser.parse_args()
+
+    configure_logger()
+    asyncio.run(run(args.retention_days, args.premake_days))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.audit.entities import RequestAuditLog
+from app.audit.partitions import maintain_partitions
+from app.config import settings
+from app.database.core import engine
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+# asyncpg binds at most 32767 parameters per statement, one per column and row of the multi-row INSERT
+MAX_BATCH_ROWS = 32767 // len(RequestAuditLog.__table__.columns)
+
+
+class AuditLogWriter:
+    """
+    buffers audit entries in memory and writes them with one multi-row INSERT per batch from a background task.
+    a flush happens when batch_size entries are pending or every flush_interval seconds; once max_buffer
+    entries are waiting new ones are dropped and counted instead of growing memory. a batch that failed for a
+    transient reason goes back to the front of the buffer, within max_buffer
+    """
+    def __init__(
+            self,
+            db_engine: AsyncEngine,
+            batch_size: int,
+            flush_interval: float,
+            max_buffer: int,
+            retention_days: int,
+            premake_days: int,
+            maintenance_interval: float
+    ):
+        self.engine = db_engine
+        self.batch_size = min(batch_size, MAX_BATCH_ROWS)
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.retention_days = retention_days
+        self.premake_days = premake_days
+        self.maintenance_interval = maintenance_interval
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_maintenance = 0.0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def record(
+            self,
+            method: str,
+            path: str,
+            status_code: Optional[int],
+            duration_ms: float,
+            user_id: Optional[int] = None,
+            ip: Optional[str] = None,
+            request_payload: Any = None,
+            response_payload: Any = None
+    ) -> None:
+        if len(self._buffer) >= self.max_buffer:
+            self.dropped += 1
+            return
+
+        self._buffer.append({
+            "id": uuid.uuid4(),
+            "created_at": datetime.now(timezone.utc),
+            "method": method,
+            "path": path[:2048],
+            "status_code": status_code,
+            "user_id": user_id,
+            "ip": ip,
+            "duration_ms": round(duration_ms, 3),
+            "request_payload": request_payload,
+            "response_payload": response_payload,
+        })
+
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+
+        await self.__maintain()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self.__run(), name="audit-log-writer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+
+        while self._buffer:
+            if not await self.flush():
+                break
+
+    async def flush(self) -> bool:
+        """
+        write up to batch_size buffered entries. a batch the database rejects for its data is discarded,
+        any other failure requeues it for the next flush
+        """
+        if not self._buffer:
+            return True
+
+        batch = self._buffer[:self.batch_size]
+        del self._buffer[:self.batch_size]
+
+        try:
+            async with self.engine.begin() as conn:
+                await conn.execute(insert(RequestAuditLog).values(batch))
+            self.written += len(batch)
+            return True
+        except (IntegrityError, DataError) as e:
+            # retrying would fail the same way
+            self.failed += len(batch)
+            logger.error("audit log flush failed", error_type=type(e).__name__, error=str(e), rows=len(batch))
+            return False
+        except (SQLAlchemyError, OSError) as e:
+            requeued = batch[:max(self.max_buffer - len(self._buffer), 0)]
+            self._buffer[:0] = requeued
+            self.dropped += len(batch) - len(requeued)
+            logger.error(
+                "audit log flush failed", error_type=type(e).__name__, error=str(e),
+                rows=len(batch), requeued=len(requeued)
+            )
+            return False
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._buffer:
+                if not await self.flush():
+                    break
+
+            if time.monotonic() - self._last_maintenance >= self.maintenance_interval:
+                await self.__maintain()
+
+    async def __maintain(self) -> None:
+        self._last_maintenance = time.monotonic()
+        try:
+            await maintain_partitions(self.engine, self.retention_days, self.premake_days)
+        except (SQLAlchemyError, OSError) as e:
+            logger.error("audit log partition maintenance failed", error_type=type(e).__name__, error=str(e))
+
+
+audit_log_writer = AuditLogWriter(
+    db_engine=engine,
+    batch_size=settings.audit_log_batch_size,
+    flush_interval=settings.audit_log_flush_interval_seconds,
+    max_buffer=settings.audit_log_max_buffer,
+    retention_days=settings.audit_log_retention_days,
+    premake_days=settings.audit_log_premake_days,
+    maintenance_interval=settings.audit_log_maintenance_interval_seconds
+)
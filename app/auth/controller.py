@@ -26,7 +26,7 @@ logger = get_logger(__name__)
         500: {'description': 'Internal server error'}
     }
 )
-def refresh_user_access_token(db: DbSession, authorization: str = Header(...)) -> RefreshTokenResponse:
+async def refresh_user_access_token(db: DbSession, authorization: str = Header(...)) -> RefreshTokenResponse:
     """
     Refresh user access token using a valid refresh token
     """
@@ -40,7 +40,7 @@ def refresh_user_access_token(db: DbSession, authorization: str = Header(...)) -
     refresh_token = authorization.removeprefix("Bearer").strip()
 
     try:
-        new_access_token = AuthenticationService.refresh_access_token(refresh_token, db)
+        new_access_token = await AuthenticationService.refresh_access_token(refresh_token, db)
 
         return RefreshTokenResponse(
             message='Access token refreshed successfully',
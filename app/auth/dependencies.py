@@ -1,30 +1,44 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Annotated
 
 from app.database.core import DbSession
 from app.userapp.entities import DocumentUser
+from app.userapp.model import UserOut
 from app.auth.service import AuthenticationService
+from app.auth.user_cache import user_cache
 from app.logger import get_logger
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/api/users/login')
 logger = get_logger(__name__)
 
 
-def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: DbSession) -> DocumentUser:
+def _get_user_id(request: Request, token: str) -> int | None:
     """
-    Get current user from JWT token
+    reuse the user id LoggingContextMiddleware already resolved for this token
+    """
+    if getattr(request.state, 'access_token', None) == token:
+        return request.state.token_user_id
+
+    return AuthenticationService.get_user_from_token(
+        token,
+        token_type='access'
+    )
+
+
+async def get_current_user(request: Request, token: Annotated[str, Depends(oauth2_scheme)], db: DbSession) -> UserOut:
+    """
+    Get current user from JWT token.
+    Served from user_cache when possible; FastAPI caches the result for the rest of the request.
+    :param request:
     :param token:
     :param db:
     :return:
     """
 
     try:
-        user_id = AuthenticationService.get_user_from_token(
-            token,
-            token_type='access'
-        )
+        user_id = _get_user_id(request, token)
 
         if not user_id:
             logger.warning('Invalid or expired token')
@@ -34,7 +48,11 @@ def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: DbSessio
                 headers={'WWW-Authenticate': 'Bearer'}
             )
 
-        user = db.get(DocumentUser, user_id)
+        cached_user = user_cache.get(user_id)
+        if cached_user:
+            return cached_user
+
+        user = await db.get(DocumentUser, user_id)
         if not user:
             logger.warning(f'User-{user_id} not found')
             raise HTTPException(
@@ -42,7 +60,10 @@ def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: DbSessio
                 detail=f'User-{user_id} not found',
                 headers={'WWW-Authenticate': 'Bearer'}
             )
-        return user
+
+        current_user = UserOut.model_validate(user)
+        user_cache.put(current_user)
+        return current_user
     except SQLAlchemyError as err:
         logger.error('user retrival failed', error_type='database error', error=str(err), exc_info=True)
         raise HTTPException(
@@ -59,4 +80,4 @@ def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: DbSessio
         ) from err
 
 
-CurrentUser = Annotated[DocumentUser, Depends(get_current_user)]
\ No newline at end of file
+CurrentUser = Annotated[UserOut, Depends(get_current_user)]
\ No newline at end of file
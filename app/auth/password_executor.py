@@ -0,0 +1,73 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import settings
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordExecutorBusyError(Exception):
+    """Raised when the password hashing queue is full."""
+    pass
+
+
+class PasswordHashingExecutor:
+    """
+    bounded process pool for argon2 work so logins and registrations do not pin request workers.
+    at most max_pending jobs (running + queued) are accepted; further calls fail fast with PasswordExecutorBusyError
+    """
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        # max_workers=0 falls back to the event loop's default thread pool
+        if self.max_workers <= 0:
+            return None
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            logger.warning("password hashing queue full", pending=self._pending, max_pending=self.max_pending)
+            raise PasswordExecutorBusyError("password hashing queue is full")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # a crashed worker poisons the whole pool, drop it so the next call starts fresh
+            logger.error("password hashing pool broken, recreating", max_workers=self.max_workers)
+            self.shutdown()
+            raise
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_executor = PasswordHashingExecutor(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_queue_size
+)
@@ -0,0 +1,26 @@
+"""
+argon2 primitives executed inside the password hashing worker processes.
+kept free of app imports so spawned workers start cheaply
+"""
+from argon2 import PasswordHasher
+
+_pwd_hasher = PasswordHasher(
+    time_cost=3,
+    memory_cost=65536,
+    parallelism=2,
+    hash_len=32,
+    salt_len=16,
+)
+
+
+def hash_password(pwd_str: str) -> str:
+    return _pwd_hasher.hash(pwd_str)
+
+
+def verify_password(pwd_hashed: str, pwd_str: str) -> tuple[bool, bool]:
+    """
+    :return: (is_valid, needs_rehash)
+    :raises VerifyMismatchError, InvalidHashError: on mismatch or malformed hash
+    """
+    is_valid = _pwd_hasher.verify(pwd_hashed, pwd_str)
+    return is_valid, is_valid and _pwd_hasher.check_needs_rehash(pwd_hashed)
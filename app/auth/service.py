@@ -1,4 +1,3 @@
-from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError, InvalidHashError, HashingError
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
@@ -6,18 +5,13 @@ from typing import Optional
 from fastapi import HTTPException, status
 
 from app.config import settings
+from app.auth.token_cache import token_cache
+from app.auth.password_executor import password_executor, PasswordExecutorBusyError
+from app.auth.password_hashing import hash_password, verify_password
 from app.database.core import DbSession
 from app.userapp.entities import DocumentUser
 from app.logger import get_logger
 
-_pwd_hasher = PasswordHasher(
-    time_cost=3,
-    memory_cost=65536,
-    parallelism=2,
-    hash_len=32,
-    salt_len=16,
-)
-
 logger = get_logger(__name__)
 
 class AuthenticationError(Exception):
@@ -29,34 +23,37 @@ class AuthenticationService:
     """Service class for authentication-related operations."""
 
     @staticmethod
-    def hash_pwd(pwd_str: str) -> str:
+    async def hash_pwd(pwd_str: str) -> str:
         """
-        Hash a password using argon2.
+        Hash a password using argon2 on the password hashing executor.
         :param pwd_str: Plain text password
         :return: Hashed password string
         :raises ValueError: If password is empty
         :raises AuthenticationError: If hashing fails
+        :raises PasswordExecutorBusyError: If the hashing queue is full
         """
         if not pwd_str or not pwd_str.strip():
             raise ValueError('Password cannot be empty')
 
         try:
-            return _pwd_hasher.hash(pwd_str)
+            return await password_executor.run(hash_password, pwd_str)
         except HashingError as err:
             logger.error(f'Password hashing failed: {err}')
             raise AuthenticationError(f'Password hashing failed: {err}') from err
 
     @staticmethod
-    def verify_pwd(pwd_hashed: str, pwd_str: str) -> tuple[bool, bool]:
+    async def verify_pwd(pwd_hashed: str, pwd_str: str) -> tuple[bool, bool]:
         """
-        Verify password and check if rehash is needed.
+        Verify password and check if rehash is needed, on the password hashing executor.
         :param pwd_hashed: Hashed password from database
         :param pwd_str: Plain text password
         :return: (is_valid, needs_rehash)
+        :raises PasswordExecutorBusyError: If the hashing queue is full
+        :raises BrokenProcessPool: If a hashing worker died, a server fault and not a failed login
         """
         try:
-            if _pwd_hasher.verify(pwd_hashed, pwd_str):
-                need_rehash = _pwd_hasher.check_needs_rehash(pwd_hashed)
+            is_valid, need_rehash = await password_executor.run(verify_password, pwd_hashed, pwd_str)
+            if is_valid:
                 if need_rehash:
                     logger.info('Password needs rehash')
                 return True, need_rehash
@@ -64,8 +61,6 @@ class AuthenticationService:
             logger.warning(f'Verify mismatch error: {ver_err}')
         except InvalidHashError as invalid_err:
             logger.error(f'Invalid hash error: {invalid_err}')
-        except Exception as err:
-            logger.error(f'Unexpected error: {err}')
 
         return False, False
 
@@ -133,6 +128,7 @@ class AuthenticationService:
     def verify_token(token: str, expected_type: str) -> Optional[dict]:
         """
         Verify a JWT token and return its payload if valid.
+        Verified payloads are cached until the token expires, so the signature is checked once per token.
         :param token:
         :param expected_type:
         :return:
@@ -147,21 +143,26 @@ class AuthenticationService:
             return None
 
         try:
-            payload = jwt.decode(
-                token,
-                settings.secret_key,
-                algorithms=[settings.algorithm]
-            )
+            payload = token_cache.get(token)
 
-            if not payload.get('sub'):
-                logger.warning('Token payload missing subject (sub)')
-                return None
+            if payload is None:
+                payload = jwt.decode(
+                    token,
+                    settings.secret_key,
+                    algorithms=[settings.algorithm]
+                )
+
+                if not payload.get('sub'):
+                    logger.warning('Token payload missing subject (sub)')
+                    return None
+
+                token_cache.put(token, payload)
+                logger.info('Token verified successfully')
 
             if payload.get('type') != expected_type:
                 logger.warning(f'Token type mismatch: expected {expected_type}, got {payload.get("type")}')
                 return None
 
-            logger.info('Token verified successfully')
             return payload
         except JWTError as jwt_err:
             logger.error(f"Token verification failed: {jwt_err}")
@@ -201,7 +202,7 @@ class AuthenticationService:
             return None
 
     @classmethod
-    def refresh_access_token(cls, refresh_token: str, db: DbSession) -> str:
+    async def refresh_access_token(cls, refresh_token: str, db: DbSession) -> str:
         """
         Generate a new access token from a valid refresh token.
         :param refresh_token: Valid refresh token
@@ -214,7 +215,7 @@ class AuthenticationService:
             logger.error('Invalid refresh token')
             raise AuthenticationError('Invalid refresh token')
 
-        user = db.get(DocumentUser, user_id)
+        user = await db.get(DocumentUser, user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
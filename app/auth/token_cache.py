@@ -0,0 +1,49 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+
+
+class TokenCache:
+    """
+    bounded LRU of verified token -> payload. entries are dropped once the token's exp has passed
+    """
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is None:
+                return None
+
+            if payload.get('exp', 0) <= time.time():
+                del self._entries[token]
+                return None
+
+            self._entries.move_to_end(token)
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        if self.maxsize <= 0 or not isinstance(payload.get('exp'), (int, float)):
+            return
+
+        with self._lock:
+            self._entries[token] = payload
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(maxsize=settings.token_cache_size)
@@ -1,4 +1,4 @@
-from typing import Set
+from typing import Set, List, Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
@@ -11,16 +11,35 @@ class Settings(BaseSettings):
     log_dir: Path = Field()
     log_file: str = Field()
     masking_keys: str = Field()
+    log_body_max_bytes: int = Field(default=4096)
+    log_queue_enabled: bool = Field(default=True)
+    log_queue_size: int = Field(default=10000)
+    log_json_serializer: Literal["json", "orjson"] = Field(default="json")
+    # headers | sampled | on_error | full
+    log_payload_mode: Literal["headers", "sampled", "on_error", "full"] = Field(default="full")
+    log_payload_sample_rate: float = Field(default=0.1, ge=0.0, le=1.0)
+    # comma separated path_glob=mode pairs, first match wins
+    log_payload_route_overrides: str = Field(default="/api/files/*/download=headers")
 
     @property
     def masking_keys_set(self) -> Set[str]:
-        return set(s.strip() for s in self.masking_keys.split("") if s.strip())
+        return set(s.strip().lower() for s in self.masking_keys.split(",") if s.strip())
+
+    @property
+    def log_payload_overrides(self) -> List[tuple[str, str]]:
+        pairs = (item.split("=", 1) for item in self.log_payload_route_overrides.split(",") if "=" in item)
+        return [(pattern.strip(), mode.strip().lower()) for pattern, mode in pairs if pattern.strip()]
 
     # Security
     secret_key: str = Field(default="fallback-secret-key")
     algorithm: str = Field(default="HS256")
     access_token_expire_minutes: int = Field(default=15)
     refresh_token_expire_days: int = Field(default=7)
+    token_cache_size: int = Field(default=10000)
+    user_cache_size: int = Field(default=10000)
+    user_cache_ttl_seconds: float = Field(default=30.0)
+    password_hash_workers: int = Field(default=2)
+    password_hash_queue_size: int = Field(default=32)
 
     @property
     def access_token_expire(self) -> timedelta:
@@ -36,17 +55,66 @@ class Settings(BaseSettings):
     db_host: str = Field()
     db_port: int = Field()
     db_name: str = Field()
+    db_pool_size: int = Field(default=5)
+    db_max_overflow: int = Field(default=10)
+    db_pool_timeout: float = Field(default=30.0)
+    db_pool_recycle: int = Field(default=1800)
+    db_pool_pre_ping: bool = Field(default=True)
 
     @property
     def db_url(self) -> str:
         return f"postgresql+psycopg2://{self.db_user}:{self.db_pwd}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @property
+    def async_db_url(self) -> str:
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_pwd}@{self.db_host}:{self.db_port}/{self.db_name}"
+
     # api_limit
     register_limit_per_hour: int = Field()
 
+    # internal apis
+    internal_api_key: str | None = Field(default=None)
+
+    # audit log
+    audit_log_enabled: bool = Field(default=True)
+    # rows per INSERT, 10 bind parameters each stay below asyncpg's 32767 limit
+    audit_log_batch_size: int = Field(default=500, ge=1, le=3276)
+    audit_log_flush_interval_seconds: float = Field(default=2.0)
+    audit_log_max_buffer: int = Field(default=10000)
+    audit_log_retention_days: int = Field(default=30)
+    audit_log_premake_days: int = Field(default=3)
+    audit_log_maintenance_interval_seconds: float = Field(default=3600.0)
+
+    # document batch endpoints
+    document_batch_max_items: int = Field(default=1000)
+
     # file uploads
     upload_dir: Path = Field()
     allowed_file_types: str = Field()
+    upload_chunk_size: int = Field(default=1024 * 1024)
+    upload_max_file_size: int = Field(default=5 * 1024 ** 3)
+    upload_session_ttl_hours: int = Field(default=24)
+    upload_session_cleanup_interval_seconds: float = Field(default=3600.0)
+    upload_session_lease_seconds: float = Field(default=60.0, gt=0)
+    upload_request_max_bytes: int = Field(default=64 * 1024 ** 2, ge=1)
+    upload_batch_max_files: int = Field(default=100)
+    upload_batch_concurrency: int = Field(default=4)
+
+    # storage gc: released blobs, soft-deleted file rows and stale temp files
+    storage_gc_enabled: bool = Field(default=True)
+    storage_gc_dry_run: bool = Field(default=False)
+    storage_gc_interval_seconds: float = Field(default=3600.0)
+    storage_gc_grace_hours: float = Field(default=24.0)
+    storage_gc_temp_max_age_hours: float = Field(default=6.0)
+    storage_gc_batch_size: int = Field(default=100)
+    storage_gc_batch_pause_seconds: float = Field(default=0.5)
+
+    # file downloads
+    download_cache_max_age: int = Field(default=31536000)
+    # direct | x-accel-redirect | x-sendfile
+    download_delivery_mode: Literal["direct", "x-accel-redirect", "x-sendfile"] = Field(default="direct")
+    # internal nginx location aliased to upload_dir, used by x-accel-redirect
+    download_accel_prefix: str = Field(default="/protected-uploads/")
 
     @property
     def allowed_extensions_set(self) -> Set[str]:
@@ -1,25 +1,31 @@
 from fastapi import Depends
-from typing import Annotated
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from typing import Annotated, AsyncGenerator
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import declarative_base
 
 from app.config import settings
+from app.database.metrics import InstrumentedQueuePool
 
 
-engine = create_engine(settings.db_url)
-SessionLocal = sessionmaker(
-    autocommit=False,
+engine = create_async_engine(
+    settings.async_db_url,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping
+)
+SessionLocal = async_sessionmaker(
+    bind=engine,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False
 )
 
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
-DbSession = Annotated[Session, Depends(get_db)]
\ No newline at end of file
+DbSession = Annotated[AsyncSession, Depends(get_db)]
@@ -0,0 +1,101 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue, Empty
+
+# upper bounds (seconds) of the checkout wait-time buckets
+WAIT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolWaitHistogram:
+    """
+    thread-safe histogram of connection checkout wait time
+    """
+    def __init__(self, buckets: tuple[float, ...] = WAIT_BUCKETS):
+        self._buckets = buckets
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts: List[int] = [0] * (len(self._buckets) + 1)
+            self._count = 0
+            self._sum = 0.0
+            self._max = 0.0
+            self._timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        idx = next((i for i, bound in enumerate(self._buckets) if seconds <= bound), len(self._buckets))
+
+        with self._lock:
+            self._counts[idx] += 1
+            self._count += 1
+            self._sum += seconds
+            self._max = max(self._max, seconds)
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self._timeouts += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            count, total, longest, timeouts = self._count, self._sum, self._max, self._timeouts
+
+        buckets: Dict[str, int] = {}
+        cumulative = 0
+        for bound, bucket_count in zip((*self._buckets, None), counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound * 1000:g}ms" if bound is not None else "le_inf"] = cumulative
+
+        return {
+            "count": count,
+            "sum_ms": round(total * 1000, 3),
+            "max_ms": round(longest * 1000, 3),
+            "timeouts": timeouts,
+            "buckets": buckets
+        }
+
+
+checkout_wait_histogram = PoolWaitHistogram()
+
+
+class WaitTimedQueue(AsyncAdaptedQueue):
+    """
+    the pool's idle connection queue, timing each hand-out. QueuePool only blocks on it at the overflow limit,
+    so a blocking get that comes back empty is a checkout timeout. a non-blocking miss is not recorded,
+    the pool opens a new connection instead of waiting
+    """
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        try:
+            entry = super().get(block, timeout)
+        except Empty:
+            if block:
+                checkout_wait_histogram.observe_timeout()
+            raise
+
+        checkout_wait_histogram.observe(time.perf_counter() - start)
+        return entry
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long checkouts wait for a pooled connection; opening new
+    connections and the pre-ping are not part of the wait
+    """
+    _queue_class = WaitTimedQueue
+
+    def dispose(self) -> None:
+        # QueuePool.dispose, draining through get_nowait: closing idle connections is not a checkout
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+                conn.close()
+            except Empty:
+                break
+
+        self._overflow = 0 - self.size()
+        self.logger.info("Pool disposed. %s", self.status())
@@ -0,0 +1,85 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, TypeVar
+
+from sqlalchemy import Select, tuple_, literal
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+T = TypeVar("T")
+
+
+def sort_label(sort_col: InstrumentedAttribute, descending: bool = False) -> str:
+    """
+    the sort a cursor belongs to, e.g. "created_at" or "-title"
+    """
+    return f"-{sort_col.key}" if descending else sort_col.key
+
+
+def encode_cursor(sort: str, sort_value: Any, row_id: int) -> str:
+    """
+    build an opaque cursor pointing after (sort_value, id) in the given sort
+    """
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort, sort_value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, python_type: type = datetime) -> tuple[Any, int]:
+    """
+    :param sort: the sort of the requested page, it has to be the one the cursor was issued for
+    :param python_type: type of the sort column the cursor was built from
+    :raises ValueError: if the cursor is malformed or belongs to another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if cursor_sort != sort:
+            raise ValueError(f"cursor was issued for sort {cursor_sort!r}")
+        if python_type is datetime:
+            return datetime.fromisoformat(sort_value), int(row_id)
+        if not isinstance(sort_value, python_type):
+            raise TypeError(f"expected {python_type.__name__}")
+        return sort_value, int(row_id)
+    except Exception as err:
+        raise ValueError(f"invalid cursor: {cursor}") from err
+
+
+def keyset_paginate(
+        query: Select,
+        sort_col: InstrumentedAttribute,
+        id_col: InstrumentedAttribute,
+        limit: int,
+        cursor: Optional[str] = None,
+        descending: bool = False
+) -> Select:
+    """
+    order by (sort_col, id), ascending or descending, and seek past the cursor. fetches one extra row
+    to detect a next page
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_label(sort_col, descending), sort_col.type.python_type)
+        position = tuple_(literal(sort_value, sort_col.type), literal(row_id, id_col.type))
+        keys = tuple_(sort_col, id_col)
+        query = query.where(keys < position if descending else keys > position)
+
+    if descending:
+        return query.order_by(sort_col.desc(), id_col.desc()).limit(limit + 1)
+    return query.order_by(sort_col, id_col).limit(limit + 1)
+
+
+def split_page(rows: Sequence[Any], limit: int, sort: str = "created_at") -> tuple[Sequence[Any], Optional[str]]:
+    """
+    trim the look-ahead row and build next_cursor from the last row on the page
+    :param sort: the page's sort as given by sort_label
+    """
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(sort, getattr(last, sort.removeprefix("-")), last.id)
@@ -0,0 +1,30 @@
+import hashlib
+from typing import Optional
+
+from starlette.datastructures import QueryParams
+
+# list responses may be kept by the browser but have to be revalidated on every use
+LIST_CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """
+    If-None-Match uses weak comparison, so W/"x" matches "x"
+    """
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def list_etag(user_id: int, version: int, query_params: QueryParams) -> str:
+    """
+    weak etag of a list page: the user's list version plus the query string that selected the page.
+    read the version before the rows, a write in between then only costs one extra full response
+    """
+    query = "&".join(f"{key}={value}" for key, value in sorted(query_params.multi_items()))
+    digest = hashlib.blake2b(query.encode("utf-8"), digest_size=8).hexdigest()
+    return f'W/"{user_id}.{version}.{digest}"'
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status, Query
 from sqlalchemy.exc import SQLAlchemyError
 from typing import Optional
 
 from app.auth.dependencies import CurrentUser, get_current_user
+from app.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.etag import LIST_CACHE_CONTROL, etag_matches, list_etag
 from app.fileapp.model import FileReadResponse, FileListResponse, ApiResponse
 from app.logger import get_logger
 from app.fileapp.services.base_service import FileService
 from app.fileapp.controller.upload_file import router as upload_router
 from app.fileapp.controller.download_file import router as download_router
+from app.fileapp.controller.resumable_upload import router as resumable_upload_router
 from app.fileapp.dependencies import get_file_service
 
 router = APIRouter(
@@ -17,6 +20,7 @@ router = APIRouter(
 )
 router.include_router(upload_router)
 router.include_router(download_router)
+router.include_router(resumable_upload_router)
 
 logger = get_logger(__name__)
 
@@ -25,32 +29,55 @@ logger = get_logger(__name__)
     "/",
     response_model=FileListResponse,
     summary="get all files",
-    description="retrieve all files for current user. optionally filter by document id",
+    description="retrieve a page of files for current user ordered by upload time. optionally filter by document id. "
+                "send the etag back as If-None-Match to get 304 while the list is unchanged",
     responses={
         200: {
             "description": "files retrieval successful",
             "model": FileListResponse
         },
+        304: {"description": "files not modified"},
+        400: {"description": "invalid cursor"},
         500: {"description": "internal server error"}
     }
 )
-def get_all_files(
+async def get_all_files(
+        request: Request,
+        response: Response,
         current_user: CurrentUser,
         document_id: Optional[int] = Query(None, description="filter by document id"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="page size"),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        if_none_match: Optional[str] = Header(None),
         file_service: FileService = Depends(get_file_service)
-) -> FileListResponse:
+) -> FileListResponse | Response:
 
     try:
-        files = file_service.fetch_files(
+        etag = list_etag(current_user.id, await file_service.list_version(current_user.id), request.query_params)
+        headers = {"etag": etag, "cache-control": LIST_CACHE_CONTROL}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+        files, next_cursor = await file_service.fetch_files(
             user_id=current_user.id,
-            document_id=document_id
+            limit=limit,
+            document_id=document_id,
+            cursor=cursor
         )
         message = "files retrival success" if files else "no files to retrieve"
 
         return FileListResponse(
             message=message,
-            data=files or []
+            data=files or [],
+            next_cursor=next_cursor
         )
+    except ValueError as val_err:
+        logger.warning("files retrival failed", error_type="invalid cursor", cursor=cursor)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="invalid cursor"
+        ) from val_err
     except SQLAlchemyError as sql_err:
         logger.error("files retrival failed", error_type="database error", error=sql_err, exc_info=True)
         raise HTTPException(
@@ -79,14 +106,14 @@ def get_all_files(
         500: {"description": "internal server error"}
     }
 )
-def get_file(
+async def get_file(
         file_id: int,
         current_user: CurrentUser,
         file_service: FileService = Depends(get_file_service)
 ) -> FileReadResponse:
 
     try:
-        file = file_service.fetch_file_by_id(
+        file = await file_service.fetch_file_by_id(
             user_id=current_user.id,
             file_id=file_id
         )
@@ -126,14 +153,14 @@ def get_file(
 
     }
 )
-def delete_file(
+async def delete_file(
         file_id: int,
         current_user: CurrentUser,
         file_service: FileService = Depends(get_file_service)
 ) -> ApiResponse:
 
     try:
-        deleted = file_service.delete_file(
+        deleted = await file_service.delete_file(
             user_id=current_user.id,
             file_id=file_id
         )
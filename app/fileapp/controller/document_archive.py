@@ -0,0 +1,70 @@
+from pathlib import Path
+from typing import List
+
+from fastapi import status, APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.dependencies import CurrentUser, get_current_user
+from app.config import settings
+from app.fileapp.controller.download_file import attachment_disposition
+from app.fileapp.dependencies import DependsFileService
+from app.fileapp.exceptions import FileOperationException
+from app.fileapp.model import FileRead
+from app.fileapp.services.archive import ArchiveEntry, unique_names, zip_stream
+from app.logger import get_logger
+
+router = APIRouter(
+    prefix="/api/tasks",
+    tags=["Task APIs"],
+    dependencies=[Depends(get_current_user)]
+)
+
+logger = get_logger(__name__)
+
+
+def _archive_entries(files: List[FileRead]) -> List[ArchiveEntry]:
+    present = []
+    for file in files:
+        if Path(file.file_path).is_file():
+            present.append(file)
+        else:
+            logger.warning("physical file missing, left out of archive", file_id=file.id, path=file.file_path)
+
+    return [
+        ArchiveEntry(name=name, path=Path(file.file_path), size=file.file_size, mime_type=file.mime_type, modified=file.created_at)
+        for name, file in zip(unique_names(f.title for f in present), present)
+    ]
+
+
+@router.get(
+    "/{document_id}/files.zip",
+    response_class=StreamingResponse,
+    summary="download all files of a document",
+    description="zip archive of the document's files, generated while it is sent",
+    responses={
+        200: {"description": "zip archive", "content": {"application/zip": {}}},
+        404: {"description": "document not found"},
+        500: {"description": "internal server error"}
+    }
+)
+async def download_document_files(document_id: int, current_user: CurrentUser, file_service: DependsFileService) -> StreamingResponse:
+    try:
+        files = await file_service.fetch_document_files(user_id=current_user.id, document_id=document_id)
+        entries = await run_in_threadpool(_archive_entries, files)
+    except FileOperationException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.message)
+    except SQLAlchemyError as sql_err:
+        logger.error("document archive failed", error_type="database error", document_id=document_id, error=sql_err, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="database error occurred"
+        )
+
+    logger.info("document archive started", document_id=document_id, files=len(entries))
+    return StreamingResponse(
+        zip_stream(entries, settings.upload_chunk_size),
+        media_type="application/zip",
+        headers={"content-disposition": attachment_disposition(f"document-{document_id}.zip")}
+    )
@@ -1,28 +1,113 @@
-from fastapi import status, APIRouter, HTTPException
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from fastapi import status, APIRouter, HTTPException, Header, Response
 from fastapi.responses import FileResponse
+from starlette.types import Message, Send
 
 from app.auth.dependencies import CurrentUser
+from app.config import settings
+from app.etag import etag_matches
 from app.fileapp.dependencies import DependsFileDownloadService
+from app.fileapp.exceptions import FileOperationException
+from app.fileapp.model import FileRead
 from app.logger import get_logger
 
 router = APIRouter()
 
 logger = get_logger(__name__)
 
+
+class DownloadFileResponse(FileResponse):
+    """
+    FileResponse whose multi-range replies carry the multipart boundary in content-type; starlette
+    writes it to content-range, which clients cannot parse
+    """
+    async def _handle_multiple_ranges(self, send: Send, *args, **kwargs) -> None:
+        async def fixed_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    (b"content-type", value) if name == b"content-range" else (name, value)
+                    for name, value in message["headers"] if name != b"content-type"
+                ]
+            await send(message)
+
+        await super()._handle_multiple_ranges(fixed_send, *args, **kwargs)
+
+
+def file_etag(file: FileRead) -> Optional[str]:
+    """
+    strong etag from the content checksum, files without one keep starlette's mtime/size etag
+    """
+    return f'"{file.checksum}"' if file.checksum else None
+
+
+def attachment_disposition(filename: str) -> str:
+    """
+    same content-disposition FileResponse builds, rfc 5987 encoded for non ascii names
+    """
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def build_download_response(
+        file: FileRead,
+        if_none_match: Optional[str] = None,
+        offload_headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    304 when the client copy is current, otherwise the file; FileResponse serves Range/If-Range
+    (single and multipart/byteranges) against the etag set here. with offload_headers the body is left
+    empty and the proxy sends the bytes, ranges included
+    """
+    etag = file_etag(file)
+    # private: downloads are per user and sit behind auth, shared caches must not keep them
+    headers = {"cache-control": f"private, max-age={settings.download_cache_max_age}, immutable"}
+    if etag:
+        headers["etag"] = etag
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if offload_headers:
+        return Response(
+            media_type=file.mime_type,
+            headers={**headers, **offload_headers, "content-disposition": attachment_disposition(file.title)}
+        )
+
+    return DownloadFileResponse(
+        path=file.file_path,
+        filename=file.title,
+        media_type=file.mime_type,
+        headers=headers
+    )
+
+
 @router.get(
     "/{file_id}/download",
     summary="download a file",
-    description="download the actual file content",
+    description="download the actual file content, supports If-None-Match and Range requests. "
+                "depending on the delivery mode the bytes are sent by the reverse proxy",
     responses={
         200: {"description": "file downloaded successfully"},
+        206: {"description": "partial file content"},
+        304: {"description": "file not modified"},
         404: {"description": "file not found"},
+        416: {"description": "range not satisfiable"},
         500: {"description": "internal server error"}
     }
 )
-async def download_file(file_id: int, current_user: CurrentUser, file_download_service: DependsFileDownloadService) -> FileResponse:
+async def download_file(
+    file_id: int,
+    current_user: CurrentUser,
+    file_download_service: DependsFileDownloadService,
+    if_none_match: Optional[str] = Header(None)
+) -> Response:
 
     try:
-        file = file_download_service.get_file_path(
+        file = await file_download_service.get_file_path(
             user_id=current_user.id,
             file_id=file_id
         )
@@ -34,16 +119,19 @@ async def download_file(file_id: int, current_user: CurrentUser, file_download_s
                 detail="physical file not found in server"
             )
 
-        return FileResponse(
-            path=file.file_path,
-            filename=file.title,
-            media_type=file.mime_type
+        return build_download_response(
+            file,
+            if_none_match,
+            offload_headers=file_download_service.offload_headers(file)
         )
     except HTTPException:
         raise
+    except FileOperationException as e:
+        logger.error("file download failed", file_id=file_id, error=e.message, status_code=e.status_code)
+        raise HTTPException(status_code=e.status_code, detail=e.message)
     except Exception as err:
         logger.error("file download failed", error_type="unknown error", file_id=file_id, error=err, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="failed to download file"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,201 @@
+from fastapi import status, APIRouter, HTTPException, Query, Request
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.auth.dependencies import CurrentUser
+from app.fileapp.exceptions import FileUploadException, UploadOffsetMismatchException
+from app.fileapp.model import (
+    FileRead, FileReadResponse, UploadSessionCreate, UploadSessionRead, UploadSessionResponse, ApiResponse
+)
+from app.fileapp.dependencies import DependsResumableUploadService
+from app.logger import get_logger
+
+router = APIRouter(prefix="/uploads")
+
+logger = get_logger(__name__)
+
+
+def _upload_error(e: FileUploadException) -> HTTPException:
+    logger.error("resumable upload error", error=str(e), status_code=e.status_code)
+
+    if isinstance(e, UploadOffsetMismatchException):
+        return HTTPException(
+            status_code=e.status_code,
+            detail={"message": e.message, "offset": e.offset},
+            headers={"Upload-Offset": str(e.offset)}
+        )
+    return HTTPException(status_code=e.status_code, detail=e.message)
+
+
+def _server_error(err: Exception) -> HTTPException:
+    if isinstance(err, SQLAlchemyError):
+        logger.error("database error", error=err, exc_info=True)
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="database error occurred"
+        )
+
+    logger.error("unexpected error", error=err, exc_info=True)
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail="unexpected error occurred"
+    )
+
+
+@router.post(
+    "",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="start a resumable upload",
+    description="create an upload session, then PUT the file in chunks and complete it",
+    responses={
+        201: {"description": "upload session created", "model": UploadSessionResponse},
+        400: {"description": "invalid file type or parameters"},
+        404: {"description": "document not found"},
+        413: {"description": "file too large"},
+        500: {"description": "internal server error"}
+    }
+)
+async def create_upload_session(
+    payload: UploadSessionCreate,
+    current_user: CurrentUser,
+    resumable_service: DependsResumableUploadService
+) -> UploadSessionResponse:
+    try:
+        session = await resumable_service.create_session(
+            user_id=current_user.id,
+            title=payload.title,
+            total_size=payload.total_size,
+            checksum=payload.checksum.lower() if payload.checksum else None,
+            document_id=payload.document_id
+        )
+        return UploadSessionResponse(
+            message="upload session created",
+            data=UploadSessionRead.model_validate(session)
+        )
+    except FileUploadException as e:
+        raise _upload_error(e)
+    except Exception as err:
+        raise _server_error(err) from err
+
+
+@router.get(
+    "/{session_id}",
+    response_model=UploadSessionResponse,
+    summary="get upload session state",
+    description="returns the offset the next chunk has to start at",
+    responses={
+        200: {"description": "upload session retrieved", "model": UploadSessionResponse},
+        404: {"description": "upload session not found"},
+        500: {"description": "internal server error"}
+    }
+)
+async def get_upload_session(
+    session_id: str,
+    current_user: CurrentUser,
+    resumable_service: DependsResumableUploadService
+) -> UploadSessionResponse:
+    try:
+        session = await resumable_service.get_session(current_user.id, session_id)
+        return UploadSessionResponse(
+            message="upload session retrieved",
+            data=UploadSessionRead.model_validate(session)
+        )
+    except FileUploadException as e:
+        raise _upload_error(e)
+    except Exception as err:
+        raise _server_error(err) from err
+
+
+@router.put(
+    "/{session_id}",
+    response_model=UploadSessionResponse,
+    summary="upload a chunk",
+    description="append the raw request body at offset. on 409 with an offset resume from it, "
+                "otherwise retry once the other request on the session is done",
+    responses={
+        200: {"description": "chunk stored", "model": UploadSessionResponse},
+        404: {"description": "upload session not found"},
+        409: {"description": "offset does not match the stored progress, or the session is in use"},
+        413: {"description": "chunk goes past the declared size or the per request limit"},
+        500: {"description": "internal server error"}
+    }
+)
+async def upload_chunk(
+    session_id: str,
+    request: Request,
+    current_user: CurrentUser,
+    resumable_service: DependsResumableUploadService,
+    offset: int = Query(..., ge=0, description="byte offset of this chunk within the file"),
+) -> UploadSessionResponse:
+    try:
+        session = await resumable_service.write_chunk(
+            user_id=current_user.id,
+            session_id=session_id,
+            offset=offset,
+            chunks=request.stream()
+        )
+        return UploadSessionResponse(
+            message="chunk stored",
+            data=UploadSessionRead.model_validate(session)
+        )
+    except FileUploadException as e:
+        raise _upload_error(e)
+    except Exception as err:
+        raise _server_error(err) from err
+
+
+@router.post(
+    "/{session_id}/complete",
+    response_model=FileReadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="complete a resumable upload",
+    description="verify the uploaded bytes and create the file",
+    responses={
+        201: {"description": "file uploaded successfully", "model": FileReadResponse},
+        400: {"description": "file type or checksum mismatch"},
+        404: {"description": "upload session not found"},
+        409: {"description": "upload incomplete, or the session is in use"},
+        500: {"description": "internal server error"}
+    }
+)
+async def complete_upload_session(
+    session_id: str,
+    current_user: CurrentUser,
+    resumable_service: DependsResumableUploadService
+) -> FileReadResponse:
+    try:
+        new_file = await resumable_service.finalize(current_user.id, session_id)
+        return FileReadResponse(
+            message="file upload successful",
+            data=FileRead.model_validate(new_file)
+        )
+    except FileUploadException as e:
+        raise _upload_error(e)
+    except Exception as err:
+        raise _server_error(err) from err
+
+
+@router.delete(
+    "/{session_id}",
+    response_model=ApiResponse,
+    summary="abort a resumable upload",
+    description="discard the upload session and the bytes received so far",
+    responses={
+        200: {"description": "upload session aborted", "model": ApiResponse},
+        404: {"description": "upload session not found"},
+        409: {"description": "the session is in use"},
+        500: {"description": "internal server error"}
+    }
+)
+async def abort_upload_session(
+    session_id: str,
+    current_user: CurrentUser,
+    resumable_service: DependsResumableUploadService
+) -> ApiResponse:
+    try:
+        await resumable_service.abort(current_user.id, session_id)
+        return ApiResponse(message=f"upload session-{session_id} aborted")
+    except FileUploadException as e:
+        raise _upload_error(e)
+    except Exception as err:
+        raise _server_error(err) from err
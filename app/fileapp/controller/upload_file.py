@@ -1,11 +1,14 @@
-from fastapi import status, UploadFile, File, Form, APIRouter, HTTPException
-from typing import Optional
+from fastapi import status, UploadFile, File, Form, Header, APIRouter, HTTPException
+from typing import List, Optional
 
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.auth.dependencies import CurrentUser
 from app.fileapp.exceptions import FileUploadException
-from app.fileapp.model import FileReadResponse
+from app.fileapp.model import (
+    FileRead, FileReadResponse, FileBatchUploadResponse, UploadPreflightRequest, UploadPreflightResponse, UploadPreflight
+)
+from app.fileapp.services.ingest import parse_checksum_header
 from app.fileapp.dependencies import DependsFileUploadService
 from app.logger import get_logger
 
@@ -30,11 +33,16 @@ logger = get_logger(__name__)
         500: {"description": "internal server error"}
     }
 )
-def upload_file(
+async def upload_file(
     current_user: CurrentUser,
     file_upload_service: DependsFileUploadService,
     file: UploadFile = File(...),
     document_id: Optional[int] = Form(None, description="document id to link file with"),
+    checksum_sha256: Optional[str] = Header(
+        None,
+        alias="X-Checksum-Sha256",
+        description="hex sha-256 of the file; the upload is rejected if the received bytes differ"
+    ),
 ) -> FileReadResponse:
     logger.info(
         "file upload request received",
@@ -50,10 +58,19 @@ def upload_file(
         )
 
     try:
-        file_upload_service.upload_file(
+        expected_checksum = parse_checksum_header(checksum_sha256)
+    except ValueError as val_err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(val_err)
+        ) from val_err
+
+    try:
+        await file_upload_service.upload_file(
             file=file,
             user_id=current_user.id,
-            document_id=document_id
+            document_id=document_id,
+            expected_checksum=expected_checksum
         )
         return FileReadResponse(message="file upload successful")
 
@@ -74,4 +91,130 @@ def upload_file(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="unexpected error occurred"
-        )
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/upload/preflight",
+    response_model=UploadPreflightResponse,
+    summary="check for an existing upload by checksum",
+    description="link an already uploaded file by its sha-256 without sending the body. "
+                "when upload_required is true the file has to be sent to /upload",
+    responses={
+        200: {
+            "description": "preflight evaluated",
+            "model": UploadPreflightResponse
+        },
+        400: {"description": "invalid file type or parameters"},
+        404: {"description": "document not found"},
+        500: {"description": "internal server error"}
+    }
+)
+async def upload_preflight(
+    payload: UploadPreflightRequest,
+    current_user: CurrentUser,
+    file_upload_service: DependsFileUploadService
+) -> UploadPreflightResponse:
+    try:
+        new_file = await file_upload_service.link_existing_upload(
+            file_name=payload.title,
+            checksum=payload.checksum.lower(),
+            user_id=current_user.id,
+            document_id=payload.document_id
+        )
+
+        if new_file is None:
+            return UploadPreflightResponse(
+                message="file not uploaded before, send the file body",
+                data=UploadPreflight(upload_required=True)
+            )
+
+        return UploadPreflightResponse(
+            message="file linked from existing upload",
+            data=UploadPreflight(upload_required=False, file_id=new_file.id)
+        )
+
+    except FileUploadException as e:
+        logger.error("upload preflight error", error=str(e), status_code=e.status_code)
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message
+        )
+    except SQLAlchemyError as sql_err:
+        logger.error("database error", error=sql_err, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="database error occurred"
+        )
+    except Exception as err:
+        logger.error("unexpected error", error=err, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="unexpected error occurred"
+        )
+
+
+@router.post(
+    "/upload/batch",
+    response_model=FileBatchUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="upload several files",
+    description="upload many files in one request. either all of them are stored or none is",
+    responses={
+        201: {
+            "description": "files uploaded successfully",
+            "model": FileBatchUploadResponse
+        },
+        400: {"description": "invalid file or parameters"},
+        404: {"description": "document not found"},
+        500: {"description": "internal server error"}
+    }
+)
+async def upload_files(
+    current_user: CurrentUser,
+    file_upload_service: DependsFileUploadService,
+    files: List[UploadFile] = File(...),
+    document_id: Optional[int] = Form(None, description="document id to link the files with"),
+) -> FileBatchUploadResponse:
+    logger.info(
+        "batch upload request received",
+        files=len(files),
+        user_id=current_user.id,
+        document_id=document_id
+    )
+
+    if any(not file.filename for file in files):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="no filename provided"
+        )
+
+    try:
+        new_files = await file_upload_service.upload_files(
+            files=files,
+            user_id=current_user.id,
+            document_id=document_id
+        )
+        return FileBatchUploadResponse(
+            message=f"{len(new_files)} files uploaded",
+            data=[FileRead.model_validate(new_file) for new_file in new_files]
+        )
+
+    except FileUploadException as e:
+        logger.error("batch upload error", error=e.message, status_code=e.status_code)
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message
+        )
+    except SQLAlchemyError as sql_err:
+        logger.error("database error", error=sql_err, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="database error occurred"
+        )
+    except Exception as err:
+        logger.error("unexpected error", error=err, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="unexpected error occurred"
+        )
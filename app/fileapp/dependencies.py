@@ -5,6 +5,7 @@ from app.database.core import DbSession
 from app.fileapp.services.base_service import FileService
 from app.fileapp.services.download_service import FileDownloadService
 from app.fileapp.services.upload_service import FileUploadService
+from app.fileapp.services.resumable_service import ResumableUploadService
 
 
 def get_file_service(db: DbSession) -> FileService:
@@ -16,7 +17,11 @@ def get_file_upload_service(db: DbSession) -> FileUploadService:
 def get_file_download_service(db: DbSession) -> FileDownloadService:
     return FileDownloadService(db=db)
 
+def get_resumable_upload_service(db: DbSession) -> ResumableUploadService:
+    return ResumableUploadService(db=db)
+
 
 DependsFileService = Annotated[FileService, Depends(get_file_service)]
 DependsFileUploadService = Annotated[FileUploadService, Depends(get_file_upload_service)]
-DependsFileDownloadService = Annotated[FileDownloadService, Depends(get_file_download_service)]
\ No newline at end of file
+DependsFileDownloadService = Annotated[FileDownloadService, Depends(get_file_download_service)]
+DependsResumableUploadService = Annotated[ResumableUploadService, Depends(get_resumable_upload_service)]
@@ -1,17 +1,23 @@
-from sqlalchemy import Integer, String, Boolean, DateTime, func, ForeignKey
+from sqlalchemy import Integer, BigInteger, String, Boolean, DateTime, func, ForeignKey, Index, text
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 
 from app.database.core import Base
+from app.fileapp.storage import resolve_path
 
 
 class DocumentCollectionFile(Base):
     __tablename__ = "document_files"
+    __table_args__ = (
+        Index("ix_document_files_user_id_is_active_created_at_id", "user_id", "is_active", "created_at", "id"),
+        Index("ix_document_files_document_id_created_at_id", "document_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(100), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
-    file_path: Mapped[str] = mapped_column(String(255), nullable=False)
-    file_size: Mapped[int] = mapped_column(Integer, nullable=False)
+    # legacy flat-layout path, NULL once the file lives at its checksum derived location
+    stored_path: Mapped[str | None] = mapped_column("file_path", String(255), nullable=True)
+    file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
     extension: Mapped[str] = mapped_column(String(10), nullable=False)
     checksum: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
@@ -23,5 +29,55 @@ class DocumentCollectionFile(Base):
     owner = relationship('DocumentUser', back_populates='files')
     document = relationship("DocumentCollection", back_populates="files")
 
+    @property
+    def file_path(self) -> str:
+        return str(resolve_path(self.checksum, self.extension, self.stored_path))
+
+    def __repr__(self):
+        return f"<DocumentCollectionFile(id={self.id}, is_active={self.is_active}, document_id={self.document_id}, user_id={self.user_id})>"
+
+
+class UploadSession(Base):
+    """
+    resumable upload in progress, bytes so far live in a part file named after the session id
+    """
+    __tablename__ = "upload_sessions"
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    title: Mapped[str] = mapped_column(String(100), nullable=False)
+    extension: Mapped[str] = mapped_column(String(10), nullable=False)
+    total_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    received_bytes: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    checksum: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # the request currently writing or finalizing the session, free again once leased_until has passed
+    lease_token: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    leased_until: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False, index=True)
+    document_id: Mapped[int | None] = mapped_column(Integer, ForeignKey("document_collection.id", ondelete="SET NULL"), nullable=True)
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey('document_users.id', ondelete="CASCADE"), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<UploadSession(id={self.id}, received_bytes={self.received_bytes}, total_size={self.total_size}, user_id={self.user_id})>"
+
+
+class FileBlob(Base):
+    """
+    one row per stored content, ref_count is the number of active document_files rows using it.
+    it changes in the same transaction as those rows, a blob at 0 may be reclaimed
+    """
+    __tablename__ = "file_blobs"
+    __table_args__ = (
+        # storage gc only ever looks at released blobs
+        Index("ix_file_blobs_released_updated_at", "updated_at", postgresql_where=text("ref_count = 0")),
+    )
+
+    checksum: Mapped[str] = mapped_column(String(64), primary_key=True)
+    extension: Mapped[str] = mapped_column(String(10), nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    ref_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
     def __repr__(self):
-        return f"<DocumentCollectionFile(id={self.id}, is_active={self.is_active}, document_id={self.document_id}, user_id={self.user_id})>"
\ No newline at end of file
+        return f"<FileBlob(checksum={self.checksum[:8]}, ref_count={self.ref_count})>"
@@ -52,4 +52,40 @@ class FileProcessingException(FileUploadException):
     file processing failed
     """
     def __init__(self, message: str):
-        super().__init__(message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        super().__init__(message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class ChecksumMismatchException(FileUploadException):
+    """
+    uploaded bytes do not match the checksum the client declared
+    """
+    def __init__(self, message: str):
+        super().__init__(message)
+
+class UploadSessionNotFoundException(FileUploadException):
+    """
+    resumable upload session does not exist or belongs to someone else
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=status.HTTP_404_NOT_FOUND)
+
+class UploadOffsetMismatchException(FileUploadException):
+    """
+    chunk offset does not continue the session, the client should resume from offset
+    """
+    def __init__(self, message: str, offset: int):
+        self.offset: int = offset
+        super().__init__(message, status_code=status.HTTP_409_CONFLICT)
+
+class UploadSessionBusyException(FileUploadException):
+    """
+    another request holds the session's lease, the client should retry once it is done
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=status.HTTP_409_CONFLICT)
+
+class UploadTooLargeException(FileUploadException):
+    """
+    upload exceeds the declared or allowed size
+    """
+    def __init__(self, message: str):
+        super().__init__(message, status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
@@ -0,0 +1,155 @@
+"""
+move files from the flat upload_dir layout into the sharded one, safe to run while the API serves traffic:
+
+    python -m app.fileapp.migrate_storage --batch-size 500 [--dry-run]
+
+each file is hard linked into place, the rows sharing it are switched to the derived path in one commit and only
+then is the old name removed, so readers always find the bytes under one of the two paths. re-running is a no-op
+for migrated rows and picks up anything that was linked to a flat path in the meantime
+"""
+import argparse
+import asyncio
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Set
+
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database.core import SessionLocal, engine
+from app.fileapp.entities import DocumentCollectionFile
+# related mappers have to be registered when running outside the app
+from app.userapp.entities import DocumentUser  # noqa: F401
+from app.taskapp.entities import DocumentCollection  # noqa: F401
+from app.fileapp.services.blob_service import BlobService
+from app.fileapp.services.ingest import hash_stream
+from app.fileapp.storage import prepare_content_path
+from app.logger import configure_logger, get_logger
+from app.userapp.list_versions import ListVersionService
+
+logger = get_logger(__name__)
+
+
+def _hash_file(path: Path) -> str:
+    with open(path, "rb") as source:
+        return hash_stream(source, settings.upload_chunk_size)
+
+
+def _link_into_place(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        # no hard links on this filesystem, copy next to the target and rename into place
+        partial = target.with_name(f"{target.name}.partial")
+        shutil.copy2(source, partial)
+        os.replace(partial, target)
+
+
+async def migrate_storage(db: AsyncSession, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    stats = {"migrated_files": 0, "updated_rows": 0, "missing": 0}
+    last_id = 0
+    seen_in_dry_run = set()
+    blobs = BlobService(db)
+
+    while True:
+        rows = (await db.scalars(
+            select(DocumentCollectionFile)
+            .where(DocumentCollectionFile.stored_path.is_not(None), DocumentCollectionFile.id > last_id)
+            .order_by(DocumentCollectionFile.id)
+            .limit(batch_size)
+        )).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        moved: List[Path] = []
+        changed_owners: Set[int] = set()
+        for row in rows:
+            if row.stored_path is None:
+                # switched together with an earlier row sharing the same file
+                continue
+
+            source = Path(row.stored_path)
+            if not await run_in_threadpool(source.exists):
+                logger.warning("file to migrate is missing", file_id=row.id, path=row.stored_path)
+                stats["missing"] += 1
+                continue
+
+            if dry_run:
+                if row.stored_path not in seen_in_dry_run:
+                    seen_in_dry_run.add(row.stored_path)
+                    stats["migrated_files"] += 1
+                continue
+
+            stats["migrated_files"] += 1
+
+            checksum = row.checksum or await run_in_threadpool(_hash_file, source)
+            target = await run_in_threadpool(prepare_content_path, checksum, row.extension)
+            if target != source:
+                await run_in_threadpool(_link_into_place, source, target)
+                moved.append(source)
+
+            if row.checksum is None:
+                # content was never tracked, its active rows become the blob's references
+                active_rows = await db.scalar(
+                    select(func.count())
+                    .select_from(DocumentCollectionFile)
+                    .where(DocumentCollectionFile.stored_path == row.stored_path, DocumentCollectionFile.is_active.is_(True))
+                )
+                if active_rows:
+                    await blobs.acquire(checksum, row.extension, row.file_size, count=active_rows)
+
+            owners = (await db.scalars(
+                update(DocumentCollectionFile)
+                .where(DocumentCollectionFile.stored_path == row.stored_path)
+                .values(stored_path=None, checksum=func.coalesce(DocumentCollectionFile.checksum, checksum))
+                .returning(DocumentCollectionFile.user_id)
+                .execution_options(synchronize_session="fetch")
+            )).all()
+            stats["updated_rows"] += len(owners)
+            changed_owners.update(owners)
+
+        if dry_run:
+            continue
+
+        # file_path in the owners' file lists changed
+        await ListVersionService(db).bump(*changed_owners, files=True)
+        await db.commit()
+
+        for source in moved:
+            # a concurrent dedup may have copied the flat path after this batch read it
+            still_used = await db.scalar(select(exists().where(DocumentCollectionFile.stored_path == str(source))))
+            if not still_used:
+                await run_in_threadpool(source.unlink, True)
+
+        logger.info("storage migration batch done", last_id=last_id, **stats)
+
+    return stats
+
+
+async def run(batch_size: int, dry_run: bool) -> None:
+    try:
+        async with SessionLocal() as db:
+            stats = await migrate_storage(db, batch_size, dry_run)
+        logger.info("storage migration finished", dry_run=dry_run, **stats)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="move uploaded files into the sharded storage layout")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be moved")
+    args = parser.parse_args()
+
+    configure_logger()
+    asyncio.run(run(args.batch_size, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -26,7 +26,7 @@ class FileRead(FileBase):
     extension: str
     checksum: Optional[str]
     created_at: datetime
-    updated_at: datetime
+    updated_at: Optional[datetime]
     document_id: Optional[int]
     user_id: Optional[int]
 
@@ -35,6 +35,43 @@ class FileRead(FileBase):
 class FileReadResponse(ApiResponse):
     data: Optional[FileRead] = None
 
+class UploadPreflightRequest(BaseModel):
+    title: str = Field(..., min_length=1, max_length=100, description="file name, including extension")
+    checksum: str = Field(..., pattern=r"^[0-9a-fA-F]{64}$", description="hex encoded sha-256 of the file")
+    document_id: Optional[int] = Field(None, description="document id to link file with")
+
+class UploadPreflight(BaseModel):
+    upload_required: bool = Field(..., description="true when the file body still has to be uploaded")
+    file_id: Optional[int] = Field(None, description="id of the file created from the existing upload")
+
+class UploadPreflightResponse(ApiResponse):
+    data: UploadPreflight
+
+class UploadSessionCreate(BaseModel):
+    title: str = Field(..., min_length=1, max_length=100, description="file name, including extension")
+    total_size: int = Field(..., gt=0, description="size of the whole file in bytes")
+    checksum: Optional[str] = Field(None, pattern=r"^[0-9a-fA-F]{64}$", description="hex sha-256 of the whole file, verified on completion")
+    document_id: Optional[int] = Field(None, description="document id to link file with")
+
+class UploadSessionRead(BaseModel):
+    id: str
+    title: str
+    total_size: int
+    received_bytes: int = Field(..., description="offset the next chunk has to start at")
+    checksum: Optional[str]
+    document_id: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class UploadSessionResponse(ApiResponse):
+    data: UploadSessionRead
+
+class FileBatchUploadResponse(ApiResponse):
+    data: list[FileRead]
+
 class FileListResponse(BaseModel):
     message: str
-    data: list[FileRead]
\ No newline at end of file
+    data: list[FileRead]
+    next_cursor: Optional[str] = Field(None, description="cursor for the next page, null on the last page")
\ No newline at end of file
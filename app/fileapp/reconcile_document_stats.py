@@ -0,0 +1,40 @@
+"""
+repair drifted file_count/total_bytes on document_collection, meant for cron or after manual data fixes:
+
+    python -m app.fileapp.reconcile_document_stats [--dry-run]
+
+counters are recomputed from the active document_files rows in one statement, documents that already agree
+are left untouched
+"""
+import argparse
+import asyncio
+
+from app.database.core import SessionLocal, engine
+# related mappers have to be registered when running outside the app
+from app.userapp.entities import DocumentUser  # noqa: F401
+from app.fileapp.services.document_stats import DocumentStatsService
+from app.logger import configure_logger, get_logger
+
+logger = get_logger(__name__)
+
+
+async def run(dry_run: bool) -> None:
+    try:
+        async with SessionLocal() as db:
+            repaired = await DocumentStatsService(db).reconcile(dry_run)
+        logger.info("document stats reconciliation finished", dry_run=dry_run, repaired=repaired)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="recompute document file counts and sizes from their files")
+    parser.add_argument("--dry-run", action="store_true", help="only count documents with drifted counters")
+    args = parser.parse_args()
+
+    configure_logger()
+    asyncio.run(run(args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import zipfile
+from datetime import datetime
+from pathlib import Path, PurePath
+from typing import Iterable, Iterator, List, NamedTuple, Set
+
+# already compressed content gains nothing from deflate, it is stored as is
+STORED_MIME_PREFIXES = ("image/", "video/", "audio/")
+STORED_MIME_TYPES = {
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/x-7z-compressed",
+    "application/x-rar-compressed",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+ZIP_EPOCH = datetime(1980, 1, 1)
+
+
+class ArchiveEntry(NamedTuple):
+    name: str
+    path: Path
+    size: int
+    mime_type: str
+    modified: datetime
+
+
+class _ZipSink:
+    """
+    write-only, unseekable target for ZipFile; zipfile falls back to data descriptors for it
+    and whatever was written since the last drain is handed out as one chunk
+    """
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def compress_type(mime_type: str) -> int:
+    if mime_type in STORED_MIME_TYPES or mime_type.startswith(STORED_MIME_PREFIXES):
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def unique_names(titles: Iterable[str]) -> List[str]:
+    """
+    flat archive names, repeated titles become "name (2).ext"
+    """
+    names: List[str] = []
+    seen: Set[str] = set()
+    for title in titles:
+        name = PurePath(title.replace("\\", "/")).name or "file"
+        candidate, counter = name, 1
+        while candidate.lower() in seen:
+            counter += 1
+            candidate = f"{PurePath(name).stem} ({counter}){PurePath(name).suffix}"
+        seen.add(candidate.lower())
+        names.append(candidate)
+    return names
+
+
+def zip_stream(entries: Iterable[ArchiveEntry], chunk_size: int) -> Iterator[bytes]:
+    """
+    generate a zip archive on the fly: one file is read chunk_size bytes at a time and every compressed
+    piece is yielded straight away, so memory stays constant and nothing is written to disk
+    """
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for entry in entries:
+            info = zipfile.ZipInfo(entry.name, date_time=max(entry.modified.replace(tzinfo=None), ZIP_EPOCH).timetuple()[:6])
+            info.compress_type = compress_type(entry.mime_type)
+            # lets zipfile decide on zip64 headers up front
+            info.file_size = entry.size
+
+            with open(entry.path, "rb") as source, archive.open(info, mode="w") as target:
+                while chunk := source.read(chunk_size):
+                    target.write(chunk)
+                    if data := sink.drain():
+                        yield data
+
+            if data := sink.drain():
+                yield data
+
+    if data := sink.drain():
+        yield data
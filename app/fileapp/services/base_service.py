@@ -1,12 +1,16 @@
-from sqlalchemy import and_
+from sqlalchemy import select, update
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-import os
 from fastapi import status
 
+from app.database.pagination import keyset_paginate, split_page
 from app.logger import get_logger
+from app.userapp.list_versions import ListVersionService
+from app.taskapp.entities import DocumentCollection
 from app.fileapp.entities import DocumentCollectionFile
+from app.fileapp.services.blob_service import BlobService
+from app.fileapp.services.document_stats import DocumentStatsService
 from app.fileapp.model import FileRead
 from app.fileapp.exceptions import FileNotFoundException, FileOperationException
 
@@ -14,16 +18,24 @@ logger = get_logger(__name__)
 
 
 class FileService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
+        self.blobs = BlobService(db)
+        self.document_stats = DocumentStatsService(db)
+        self.list_versions = ListVersionService(db)
 
-    def _get_file_instance(self, user_id: int, file_id: int) -> DocumentCollectionFile:
+    async def list_version(self, user_id: int) -> int:
+        return (await self.list_versions.get(user_id)).files
+
+    async def _get_file_instance(self, user_id: int, file_id: int) -> DocumentCollectionFile:
         try:
-            file = self.db.query(DocumentCollectionFile).filter_by(
-                id=file_id,
-                user_id=user_id,
-                is_active=True
-            ).first()
+            file = await self.db.scalar(
+                select(DocumentCollectionFile).filter_by(
+                    id=file_id,
+                    user_id=user_id,
+                    is_active=True
+                )
+            )
         except (SQLAlchemyError, OperationalError) as db_err:
             logger.error("file retrival failed", file_id=file_id, error=db_err, exc_info=True)
             raise FileOperationException(
@@ -36,9 +48,15 @@ class FileService:
                 raise FileNotFoundException(f"file-{file_id} not found")
             return file
 
-    def fetch_files(self, user_id: int, document_id: Optional[int] = None) -> List[FileRead]:
+    async def fetch_files(
+            self,
+            user_id: int,
+            limit: int,
+            document_id: Optional[int] = None,
+            cursor: Optional[str] = None
+    ) -> tuple[List[FileRead], Optional[str]]:
         try:
-            query = self.db.query(DocumentCollectionFile).filter_by(
+            query = select(DocumentCollectionFile).filter_by(
                 user_id=user_id,
                 is_active=True
             )
@@ -46,15 +64,44 @@ class FileService:
             if document_id is not None:
                 query = query.filter_by(document_id=document_id)
 
-            files = query.all()
-            return [FileRead.model_validate(f) for f in files]
+            query = keyset_paginate(
+                query,
+                DocumentCollectionFile.created_at,
+                DocumentCollectionFile.id,
+                limit=limit,
+                cursor=cursor
+            )
+            files, next_cursor = split_page((await self.db.scalars(query)).all(), limit)
+            return [FileRead.model_validate(f) for f in files], next_cursor
         except SQLAlchemyError as sql_err:
             logger.error("file retrival failed", error_type="database error", error=sql_err, exc_info=True)
             raise
 
-    def fetch_file_by_id(self, user_id: int, file_id: int) -> FileRead:
+    async def fetch_document_files(self, user_id: int, document_id: int) -> List[FileRead]:
+        """
+        every active file of a document the user owns, oldest first
+        """
+        try:
+            owned = await self.db.scalar(
+                select(DocumentCollection.id).filter_by(id=document_id, user_id=user_id)
+            )
+            if owned is None:
+                logger.warning("document not found", document_id=document_id)
+                raise FileNotFoundException(f"document-{document_id} not found")
+
+            files = await self.db.scalars(
+                select(DocumentCollectionFile)
+                .filter_by(document_id=document_id, is_active=True)
+                .order_by(DocumentCollectionFile.created_at, DocumentCollectionFile.id)
+            )
+            return [FileRead.model_validate(f) for f in files]
+        except SQLAlchemyError as sql_err:
+            logger.error("document files retrival failed", error_type="database error", document_id=document_id, error=sql_err, exc_info=True)
+            raise
+
+    async def fetch_file_by_id(self, user_id: int, file_id: int) -> FileRead:
         try:
-            file = self._get_file_instance(user_id, file_id)
+            file = await self._get_file_instance(user_id, file_id)
 
             return FileRead.model_validate(file)
         except FileNotFoundException:
@@ -63,50 +110,45 @@ class FileService:
             logger.error("file retrival failed", error_type="database error", file_id=file_id, error=sql_err, exc_info=True)
             raise sql_err
 
-    def delete_file(self, user_id: int, file_id: int) -> bool:
+    async def delete_file(self, user_id: int, file_id: int) -> bool:
         """
-        soft delete a file.
-        if no reference then delete from server
+        soft delete a file and release its blob reference.
+        unreferenced content is deleted from server by the storage gc
         """
 
         try:
-            file = self._get_file_instance(user_id, file_id)
+            file = (await self.db.execute(
+                update(DocumentCollectionFile)
+                .where(
+                    DocumentCollectionFile.id == file_id,
+                    DocumentCollectionFile.user_id == user_id,
+                    DocumentCollectionFile.is_active.is_(True)
+                )
+                .values(is_active=False)
+                .returning(DocumentCollectionFile.checksum, DocumentCollectionFile.document_id, DocumentCollectionFile.file_size)
+                .execution_options(synchronize_session=False)
+            )).one_or_none()
 
             if not file:
+                await self.db.rollback()
                 logger.warning("file not found for deletion", file_id=file_id)
                 raise FileNotFoundException(f"file-{file_id} not found")
 
-            file.is_active = False
-            self.db.commit()
+            remaining_refs = await self.blobs.release(file.checksum) if file.checksum else None
+            if file.document_id is not None:
+                await self.document_stats.adjust({file.document_id: (-1, -file.file_size)})
+            await self.list_versions.bump(user_id, files=True, documents=file.document_id is not None)
+            await self.db.commit()
 
             logger.info("file soft deletion successful", file_id=file_id)
 
-            other_active_refs = (
-                self.db.query(DocumentCollectionFile)
-                .filter(
-                    and_(
-                        DocumentCollectionFile.checksum == file.checksum,
-                        DocumentCollectionFile.is_active.is_(True),
-                        DocumentCollectionFile.id != file_id
-                    )
-                )
-                .count()
-            )
-
-            if other_active_refs == 0:
-                try:
-                    if os.path.exists(file.file_path):
-                        os.remove(file.file_path)
-                        logger.info("physical file deleted", path=file.file_path)
-                except OSError as os_err:
-                    logger.error("physical file deletion failed", path=file.file_path, error=os_err, error_type="os error", exc_info=True)
-            else:
-                logger.info("physical file preserved", active_refs=other_active_refs)
+            # bytes of released content are removed by the storage gc after its grace period
+            logger.info("physical file preserved", active_refs=remaining_refs)
 
             return True
         except FileNotFoundException:
             raise
         except SQLAlchemyError as sql_err:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error("file deletion failed", error_type="database error", file_id=file_id, error=sql_err, exc_info=True)
             raise sql_err
\ No newline at end of file
@@ -0,0 +1,114 @@
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, func, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.fileapp.entities import FileBlob
+from app.fileapp.storage import content_path
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BlobRef(NamedTuple):
+    ref_count: int
+    extension: str
+
+
+class BlobService:
+    """
+    reference counts for stored content. acquire/release run inside the caller's transaction so the count
+    always agrees with the committed document_files rows; nothing here commits except reclaim, which the
+    storage gc calls for released blobs
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def __insert(self):
+        if self.db.get_bind().dialect.name == "postgresql":
+            return postgresql_insert(FileBlob)
+        return sqlite_insert(FileBlob)
+
+    async def acquire(self, checksum: str, extension: str, size: int, count: int = 1) -> BlobRef:
+        """
+        add count references, creating the blob when missing. a ref_count equal to count means the blob
+        was new or already released, so the caller has to put the bytes in place
+        """
+        stmt = self.__insert().values(checksum=checksum, extension=extension, size=size, ref_count=count)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FileBlob.checksum],
+            set_={"ref_count": FileBlob.ref_count + count, "updated_at": func.now()}
+        ).returning(FileBlob.ref_count, FileBlob.extension)
+
+        row = (await self.db.execute(stmt)).one()
+        return BlobRef(ref_count=row.ref_count, extension=row.extension)
+
+    async def acquire_many(self, blobs: Dict[str, Tuple[str, int, int]]) -> Dict[str, BlobRef]:
+        """
+        acquire for many blobs in one statement. rows are written (and locked) in checksum order, so concurrent
+        batches sharing content wait on each other instead of deadlocking
+        :param blobs: checksum -> (extension, size, count)
+        """
+        stmt = self.__insert().values([
+            {"checksum": checksum, "extension": extension, "size": size, "ref_count": count}
+            for checksum, (extension, size, count) in sorted(blobs.items())
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FileBlob.checksum],
+            set_={"ref_count": FileBlob.ref_count + stmt.excluded.ref_count, "updated_at": func.now()}
+        ).returning(FileBlob.checksum, FileBlob.ref_count, FileBlob.extension)
+
+        rows = (await self.db.execute(stmt)).all()
+        return {row.checksum: BlobRef(ref_count=row.ref_count, extension=row.extension) for row in rows}
+
+    async def release(self, checksum: str) -> Optional[int]:
+        """
+        drop one reference
+        :return: the remaining count, None when the content is not tracked
+        """
+        return await self.db.scalar(
+            update(FileBlob)
+            .where(FileBlob.checksum == checksum, FileBlob.ref_count > 0)
+            .values(ref_count=FileBlob.ref_count - 1, updated_at=func.now())
+            .returning(FileBlob.ref_count)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def reclaim(self, checksum: str, legacy_paths: Iterable[str] = ()) -> Optional[int]:
+        """
+        delete an unreferenced blob and its bytes. the row is removed first and the file unlinked before the
+        commit, so a concurrent acquire waits on the row and then re-creates it with fresh bytes
+        :return: bytes freed, None when the blob is referenced again (or gone) and nothing was removed
+        :raises OSError: when the file cannot be removed, the blob row is kept for a retry
+        """
+        try:
+            row = (await self.db.execute(
+                delete(FileBlob)
+                .where(FileBlob.checksum == checksum, FileBlob.ref_count == 0)
+                .returning(FileBlob.extension, FileBlob.size)
+                .execution_options(synchronize_session=False)
+            )).one_or_none()
+            if row is None:
+                await self.db.rollback()
+                return None
+
+            paths = {content_path(checksum, row.extension), *(Path(path) for path in legacy_paths)}
+            for path in paths:
+                await run_in_threadpool(path.unlink, True)
+
+            await self.db.commit()
+            logger.info("physical file deleted", checksum=checksum[:8], size=row.size)
+            return row.size
+        except OSError as os_err:
+            await self.db.rollback()
+            logger.error("physical file deletion failed", checksum=checksum[:8], error=os_err, error_type="os error", exc_info=True)
+            raise
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("blob reclaim failed", checksum=checksum[:8], error=sql_err, error_type="database error", exc_info=True)
+            raise
@@ -0,0 +1,68 @@
+from typing import Dict, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.taskapp.entities import DocumentCollection
+from app.fileapp.entities import DocumentCollectionFile
+from app.logger import get_logger
+from app.userapp.list_versions import ListVersionService
+
+logger = get_logger(__name__)
+
+
+class DocumentStatsService:
+    """
+    denormalized file_count/total_bytes on document_collection. adjust runs inside the caller's transaction,
+    next to the document_files change it accounts for; reconcile recomputes the counters from the active rows
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def adjust(self, deltas: Dict[int, Tuple[int, int]]) -> None:
+        """
+        :param deltas: document_id -> (file delta, byte delta)
+        """
+        for document_id, (files, size) in deltas.items():
+            if not files and not size:
+                continue
+            await self.db.execute(
+                update(DocumentCollection)
+                .where(DocumentCollection.id == document_id)
+                .values(
+                    file_count=DocumentCollection.file_count + files,
+                    total_bytes=DocumentCollection.total_bytes + size,
+                    # counters are derived, they do not count as an edit of the document
+                    updated_at=DocumentCollection.updated_at
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    async def reconcile(self, dry_run: bool = False) -> int:
+        """
+        rewrite the counters of every document whose values drifted from its active files
+        :return: number of documents that were (or with dry_run would be) repaired
+        """
+        active = (
+            DocumentCollectionFile.document_id == DocumentCollection.id,
+            DocumentCollectionFile.is_active.is_(True)
+        )
+        actual_count = select(func.count(DocumentCollectionFile.id)).where(*active).scalar_subquery()
+        actual_bytes = select(func.coalesce(func.sum(DocumentCollectionFile.file_size), 0)).where(*active).scalar_subquery()
+        drifted = or_(DocumentCollection.file_count != actual_count, DocumentCollection.total_bytes != actual_bytes)
+
+        if dry_run:
+            return await self.db.scalar(select(func.count()).select_from(DocumentCollection).where(drifted))
+
+        owners = (await self.db.scalars(
+            update(DocumentCollection)
+            .where(drifted)
+            .values(file_count=actual_count, total_bytes=actual_bytes, updated_at=DocumentCollection.updated_at)
+            .returning(DocumentCollection.user_id)
+            .execution_options(synchronize_session=False)
+        )).all()
+        await ListVersionService(self.db).bump(*owners, documents=True)
+        await self.db.commit()
+
+        logger.info("document stats reconciled", repaired=len(owners))
+        return len(owners)
@@ -1,6 +1,11 @@
 import os
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+
 from fastapi import status
 
+from app.config import settings
 from app.fileapp.model import FileRead
 from app.fileapp.services.base_service import FileService
 from app.logger import get_logger
@@ -10,9 +15,9 @@ logger = get_logger(__name__)
 
 
 class FileDownloadService(FileService):
-    def get_file_path(self, user_id: int, file_id: int) -> FileRead:
+    async def get_file_path(self, user_id: int, file_id: int) -> FileRead:
         try:
-            file = self._get_file_instance(user_id, file_id)
+            file = await self._get_file_instance(user_id, file_id)
 
             if not os.path.exists(file.file_path):
                 logger.error("Physical file missing", file_id=file_id, path=file.file_path)
@@ -27,3 +32,25 @@ class FileDownloadService(FileService):
                 message=f"error retrieving file path for file-{file_id}",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             ) from e
+
+    @staticmethod
+    def offload_headers(file: FileRead) -> Optional[Dict[str, str]]:
+        """
+        headers that hand an authorized download to the reverse proxy, None when python should stream it.
+        x-accel-redirect points at the file under download_accel_prefix, x-sendfile at its absolute path
+        """
+        mode = settings.download_delivery_mode
+        if mode == "direct":
+            return None
+
+        file_path = Path(file.file_path).resolve()
+        upload_dir = settings.upload_dir.resolve()
+        if not file_path.is_relative_to(upload_dir):
+            logger.warning("file outside upload dir, serving directly", file_id=file.id, path=file.file_path)
+            return None
+
+        if mode == "x-sendfile":
+            return {"x-sendfile": str(file_path)}
+
+        prefix = settings.download_accel_prefix.rstrip("/")
+        return {"x-accel-redirect": f"{prefix}/{quote(file_path.relative_to(upload_dir).as_posix())}"}
@@ -0,0 +1,101 @@
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+import magic
+
+from app.fileapp.exceptions import InvalidFileTypeException
+
+# libmagic only needs the head of a file to identify it
+SNIFF_BYTES = 8192
+
+SHA256_HEX_PATTERN = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+class IngestResult:
+    """
+    outcome of a single streaming pass: where the bytes landed and what they were
+    """
+    def __init__(self, temp_path: Path, checksum: str, size: int, mime_type: str):
+        self.temp_path = temp_path
+        self.checksum = checksum
+        self.size = size
+        self.mime_type = mime_type
+
+
+def ingest_stream(
+        source: BinaryIO,
+        directory: Path,
+        chunk_size: int,
+        accept_mime: Optional[Callable[[str], bool]] = None
+) -> IngestResult:
+    """
+    copy source into a temp file in directory, hashing, counting and sniffing the mime type on the way.
+    every byte is read once and written once; the mime type is sniffed from the first SNIFF_BYTES in memory
+    and accept_mime can reject the stream before the rest of it is written
+    :raises InvalidFileTypeException: when accept_mime rejects the sniffed type
+    """
+    temp_path = directory / f"temp_{os.urandom(8).hex()}"
+    sha256_hash = hashlib.sha256()
+    size = 0
+    head = bytearray()
+    mime_type = None
+
+    try:
+        with open(temp_path, "wb") as buffer:
+            while chunk := source.read(chunk_size):
+                if mime_type is None:
+                    head += chunk[:SNIFF_BYTES - len(head)]
+                    if len(head) >= SNIFF_BYTES:
+                        mime_type = _sniff(bytes(head), accept_mime)
+
+                sha256_hash.update(chunk)
+                buffer.write(chunk)
+                size += len(chunk)
+
+        if mime_type is None:
+            mime_type = _sniff(bytes(head), accept_mime)
+
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    return IngestResult(temp_path, sha256_hash.hexdigest(), size, mime_type)
+
+
+def _sniff(head: bytes, accept_mime: Optional[Callable[[str], bool]]) -> str:
+    mime_type = magic.from_buffer(head, mime=True)
+    if accept_mime is not None and not accept_mime(mime_type):
+        raise InvalidFileTypeException("file type mismatch or not allowed")
+    return mime_type
+
+
+def commit_file(temp_path: Path, final_path: Path) -> None:
+    """
+    atomically move an ingested temp file into place, temp and final share a filesystem
+    """
+    os.replace(temp_path, final_path)
+
+
+def hash_stream(source: BinaryIO, chunk_size: int) -> str:
+    """
+    sha-256 of source without writing it anywhere
+    """
+    sha256_hash = hashlib.sha256()
+    while chunk := source.read(chunk_size):
+        sha256_hash.update(chunk)
+    return sha256_hash.hexdigest()
+
+
+def parse_checksum_header(value: Optional[str]) -> Optional[str]:
+    """
+    client declared sha-256 from X-Checksum-Sha256, normalised to lowercase hex
+    :raises ValueError: when the header is present but not a hex sha-256
+    """
+    if value is None:
+        return None
+    if not SHA256_HEX_PATTERN.match(value.strip()):
+        raise ValueError("X-Checksum-Sha256 must be a hex encoded sha-256")
+    return value.strip().lower()
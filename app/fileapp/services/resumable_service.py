@@ -0,0 +1,435 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, Optional, Tuple
+
+import magic
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database.core import SessionLocal
+from app.logger import get_logger
+from app.taskapp.entities import DocumentCollection
+from app.fileapp.entities import DocumentCollectionFile, UploadSession
+from app.fileapp.storage import session_dir
+from app.fileapp.services.ingest import IngestResult, SNIFF_BYTES
+from app.fileapp.services.upload_service import FileUploadService
+from app.fileapp.exceptions import (
+    ChecksumMismatchException, DocumentNotFoundException, InvalidFileTypeException, UploadSessionBusyException,
+    UploadSessionNotFoundException, UploadOffsetMismatchException, UploadTooLargeException
+)
+
+logger = get_logger(__name__)
+
+# finalize failures retrying cannot fix; anything else keeps the session so the client can complete again
+PERMANENT_FINALIZE_ERRORS = (ChecksumMismatchException, DocumentNotFoundException, InvalidFileTypeException)
+
+
+class SessionHasher:
+    """
+    running sha-256 over a session's part file, usable while offset equals the session's received_bytes
+    """
+    def __init__(self):
+        self.offset = 0
+        self.sha256_hash = hashlib.sha256()
+
+    def update(self, data: bytes) -> None:
+        self.sha256_hash.update(data)
+        self.offset += len(data)
+
+
+# per process state; another worker (or a restart) rebuilds the hash from the part file once
+_session_hashers: Dict[str, SessionHasher] = {}
+
+
+class ResumableUploadService:
+    """
+    create session -> PUT chunks at offsets -> finalize. bytes go to <upload_dir>/sessions/<id>.part and
+    the committed offset to upload_sessions, finalizing hands the part file to FileUploadService
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.session_dir = session_dir()
+
+    def part_path(self, session_id: str) -> Path:
+        return self.session_dir / f"{session_id}.part"
+
+    async def create_session(
+            self,
+            user_id: int,
+            title: str,
+            total_size: int,
+            checksum: Optional[str] = None,
+            document_id: Optional[int] = None
+    ) -> UploadSession:
+        extension = Path(title).suffix.lower()
+        if extension not in settings.allowed_extensions_set:
+            logger.warning("File type not allowed", filename=title)
+            raise InvalidFileTypeException("file type mismatch or not allowed")
+
+        if total_size > settings.upload_max_file_size:
+            raise UploadTooLargeException(f"file exceeds the {settings.upload_max_file_size} byte limit")
+
+        if document_id is not None and await self.db.get(DocumentCollection, document_id) is None:
+            raise DocumentNotFoundException(f"document_collection-{document_id} does not exist")
+
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            title=title,
+            extension=extension,
+            total_size=total_size,
+            received_bytes=0,
+            checksum=checksum,
+            document_id=document_id,
+            user_id=user_id
+        )
+
+        try:
+            self.db.add(session)
+            await self.db.commit()
+            await self.db.refresh(session)
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("upload session creation failed", error_type="database error", error=sql_err, exc_info=True)
+            raise
+
+        await run_in_threadpool(self.part_path(session.id).touch)
+        _session_hashers[session.id] = SessionHasher()
+
+        logger.info("upload session created", session_id=session.id, total_size=total_size)
+        return session
+
+    async def get_session(self, user_id: int, session_id: str) -> UploadSession:
+        session = await self.db.scalar(select(UploadSession).filter_by(id=session_id, user_id=user_id))
+        if session is None:
+            raise UploadSessionNotFoundException(f"upload session-{session_id} not found")
+        return session
+
+    async def write_chunk(
+            self,
+            user_id: int,
+            session_id: str,
+            offset: int,
+            chunks: AsyncIterator[bytes]
+    ) -> UploadSession:
+        """
+        append a streamed chunk at offset. bytes flushed before a failure (e.g. a dropped connection)
+        are kept, so the client can resume from the returned/advertised offset. the session is claimed with
+        a committed lease first, so no transaction or row lock is held while the body streams
+        :raises UploadOffsetMismatchException: when offset is not the session's received_bytes
+        :raises UploadSessionBusyException: when another request holds the session's lease
+        """
+        session, lease_token = await self.__claim(user_id, session_id)
+        received_bytes = session.received_bytes
+        if offset != received_bytes:
+            await self.__release(session_id, lease_token)
+            raise UploadOffsetMismatchException(
+                f"upload session-{session_id} continues at offset {received_bytes}",
+                offset=received_bytes
+            )
+
+        hasher = await self.__get_hasher(session)
+        part_file = await run_in_threadpool(self.__open_part, self.part_path(session_id), offset)
+        buffer = bytearray()
+        renewed_at = time.monotonic()
+
+        try:
+            async for data in chunks:
+                end = hasher.offset + len(buffer) + len(data)
+                if end > session.total_size:
+                    raise UploadTooLargeException(f"upload exceeds the declared size of {session.total_size} bytes")
+                if end - offset > settings.upload_request_max_bytes:
+                    raise UploadTooLargeException(
+                        f"a single chunk request may carry at most {settings.upload_request_max_bytes} bytes"
+                    )
+
+                if time.monotonic() - renewed_at > settings.upload_session_lease_seconds / 2:
+                    await self.__renew(session_id, lease_token)
+                    renewed_at = time.monotonic()
+
+                buffer += data
+                if len(buffer) >= settings.upload_chunk_size:
+                    await run_in_threadpool(self.__append, part_file, hasher, bytes(buffer))
+                    buffer.clear()
+
+            if buffer:
+                await run_in_threadpool(self.__append, part_file, hasher, bytes(buffer))
+        finally:
+            await run_in_threadpool(part_file.close)
+            session = await self.__save_progress(session_id, lease_token, hasher.offset)
+
+        return session
+
+    async def finalize(self, user_id: int, session_id: str) -> DocumentCollectionFile:
+        """
+        verify the session is complete and turn the part file into a file record
+        """
+        session, lease_token = await self.__claim(user_id, session_id)
+        received_bytes = session.received_bytes
+        if received_bytes != session.total_size:
+            await self.__release(session_id, lease_token)
+            raise UploadOffsetMismatchException(
+                f"upload session-{session_id} is incomplete",
+                offset=received_bytes
+            )
+
+        hasher = await self.__get_hasher(session)
+        part_path = self.part_path(session_id)
+        head = await run_in_threadpool(self.__read_head, part_path)
+
+        ingested = IngestResult(
+            temp_path=part_path,
+            checksum=hasher.sha256_hash.hexdigest(),
+            size=session.total_size,
+            mime_type=magic.from_buffer(head, mime=True)
+        )
+
+        try:
+            new_file = await FileUploadService(db=self.db).finalize_ingested(
+                ingested,
+                file_name=session.title,
+                user_id=user_id,
+                document_id=session.document_id,
+                expected_checksum=session.checksum,
+                owns_source=False
+            )
+        except PERMANENT_FINALIZE_ERRORS:
+            await self.__drop(session_id)
+            raise
+        except Exception:
+            # transient (e.g. database) failure: keep the session and its part file for a retry
+            await self.db.rollback()
+            await self.__release(session_id, lease_token)
+            raise
+
+        # the part file was moved into place, or removed as a duplicate
+        await self.__drop(session_id)
+        return new_file
+
+    async def abort(self, user_id: int, session_id: str) -> None:
+        # claimed like a write, so a chunk still streaming or a finalize in progress is not pulled away
+        await self.__claim(user_id, session_id)
+        await self.__drop(session_id)
+
+    async def cleanup_expired(self, ttl: timedelta) -> int:
+        """
+        remove sessions untouched for ttl together with their part files, and part files without a session
+        """
+        cutoff = datetime.now(timezone.utc) - ttl
+        expired = (await self.db.scalars(
+            select(UploadSession).where(UploadSession.updated_at < cutoff)
+        )).all()
+
+        for session_id in [session.id for session in expired]:
+            await self.__drop(session_id)
+
+        known_ids = set((await self.db.scalars(select(UploadSession.id))).all())
+        strays = await run_in_threadpool(self.__remove_stray_parts, known_ids, cutoff.timestamp())
+
+        if expired or strays:
+            logger.info("upload sessions cleaned up", expired_sessions=len(expired), stray_parts=strays)
+        return len(expired)
+
+    async def __claim(self, user_id: int, session_id: str) -> Tuple[UploadSession, str]:
+        """
+        take the session's lease in its own short transaction; only the holder writes the part file
+        :returns: the refreshed session and the lease token
+        """
+        lease_token = uuid.uuid4().hex
+        now = datetime.now(timezone.utc)
+        try:
+            session = await self.db.scalar(
+                update(UploadSession)
+                .where(
+                    UploadSession.id == session_id,
+                    UploadSession.user_id == user_id,
+                    or_(UploadSession.leased_until.is_(None), UploadSession.leased_until < now)
+                )
+                .values(lease_token=lease_token, leased_until=now + self.__lease_duration())
+                .returning(UploadSession)
+                # the returned row refreshes the loaded session, no in-python evaluation of the criteria
+                .execution_options(populate_existing=True, synchronize_session=False)
+            )
+            await self.db.commit()
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("upload session claim failed", session_id=session_id, error=sql_err, exc_info=True)
+            raise
+
+        if session is None:
+            try:
+                await self.get_session(user_id, session_id)
+            finally:
+                await self.db.commit()
+            raise UploadSessionBusyException(f"upload session-{session_id} is in use by another request")
+        return session, lease_token
+
+    async def __renew(self, session_id: str, lease_token: str) -> None:
+        try:
+            result = await self.db.execute(
+                update(UploadSession)
+                .where(UploadSession.id == session_id, UploadSession.lease_token == lease_token)
+                .values(leased_until=datetime.now(timezone.utc) + self.__lease_duration())
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("upload session lease renewal failed", session_id=session_id, error=sql_err, exc_info=True)
+            raise
+
+        if result.rowcount == 0:
+            raise UploadSessionBusyException(f"upload session-{session_id} was taken over by another request")
+
+    async def __release(self, session_id: str, lease_token: str) -> None:
+        try:
+            await self.db.execute(
+                update(UploadSession)
+                .where(UploadSession.id == session_id, UploadSession.lease_token == lease_token)
+                .values(lease_token=None, leased_until=None)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+        except SQLAlchemyError as sql_err:
+            # not raised over the original error, the lease runs out on its own
+            await self.db.rollback()
+            logger.error("upload session release failed", session_id=session_id, error=sql_err, exc_info=True)
+
+    async def __save_progress(self, session_id: str, lease_token: str, received_bytes: int) -> UploadSession:
+        """
+        store the offset and release the lease in one statement, only while the lease is still ours
+        """
+        try:
+            session = await self.db.scalar(
+                update(UploadSession)
+                .where(UploadSession.id == session_id, UploadSession.lease_token == lease_token)
+                .values(received_bytes=received_bytes, lease_token=None, leased_until=None)
+                .returning(UploadSession)
+                .execution_options(populate_existing=True, synchronize_session=False)
+            )
+            await self.db.commit()
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            # the part file may now be ahead of the stored offset, it is truncated on the next write
+            _session_hashers.pop(session_id, None)
+            logger.error("upload progress save failed", session_id=session_id, error=sql_err, exc_info=True)
+            raise
+
+        if session is None:
+            # the lease ran out (or the session was removed), the stored offset of whoever took over wins
+            _session_hashers.pop(session_id, None)
+            raise UploadSessionBusyException(f"upload session-{session_id} was taken over by another request")
+        return session
+
+    async def __get_hasher(self, session: UploadSession) -> SessionHasher:
+        hasher = _session_hashers.get(session.id)
+        if hasher is None or hasher.offset != session.received_bytes:
+            hasher = await run_in_threadpool(self.__rebuild_hasher, self.part_path(session.id), session.received_bytes)
+            _session_hashers[session.id] = hasher
+        return hasher
+
+    async def __drop(self, session_id: str) -> None:
+        try:
+            # by id: after a failed finalize the session instance is expired by the rollback
+            await self.db.execute(delete(UploadSession).where(UploadSession.id == session_id))
+            await self.db.commit()
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("upload session removal failed", session_id=session_id, error=sql_err, exc_info=True)
+            raise
+        finally:
+            _session_hashers.pop(session_id, None)
+
+        await run_in_threadpool(self.part_path(session_id).unlink, True)
+
+    @staticmethod
+    def __lease_duration() -> timedelta:
+        return timedelta(seconds=settings.upload_session_lease_seconds)
+
+    @staticmethod
+    def __open_part(part_path: Path, offset: int) -> BinaryIO:
+        part_file = open(part_path, "r+b") if part_path.exists() else open(part_path, "w+b")
+        # drop bytes written past the last committed offset (crash or failed save)
+        part_file.truncate(offset)
+        part_file.seek(offset)
+        return part_file
+
+    @staticmethod
+    def __append(part_file: BinaryIO, hasher: SessionHasher, data: bytes) -> None:
+        part_file.write(data)
+        part_file.flush()
+        hasher.update(data)
+
+    @staticmethod
+    def __rebuild_hasher(part_path: Path, received_bytes: int) -> SessionHasher:
+        hasher = SessionHasher()
+        if received_bytes == 0:
+            return hasher
+
+        with open(part_path, "rb") as part_file:
+            while hasher.offset < received_bytes:
+                data = part_file.read(min(settings.upload_chunk_size, received_bytes - hasher.offset))
+                if not data:
+                    break
+                hasher.update(data)
+        return hasher
+
+    @staticmethod
+    def __read_head(part_path: Path) -> bytes:
+        with open(part_path, "rb") as part_file:
+            return part_file.read(SNIFF_BYTES)
+
+    def __remove_stray_parts(self, known_ids: set, cutoff_timestamp: float) -> int:
+        removed = 0
+        for part_path in self.session_dir.glob("*.part"):
+            if part_path.stem not in known_ids and part_path.stat().st_mtime < cutoff_timestamp:
+                part_path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+class UploadSessionJanitor:
+    """
+    background task that periodically removes abandoned upload sessions
+    """
+    def __init__(self, interval: float, ttl: timedelta):
+        self.interval = interval
+        self.ttl = ttl
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run(), name="upload-session-janitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self) -> int:
+        async with SessionLocal() as db:
+            return await ResumableUploadService(db=db).cleanup_expired(self.ttl)
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except (SQLAlchemyError, OSError) as e:
+                logger.error("upload session cleanup failed", error_type=type(e).__name__, error=str(e))
+            await asyncio.sleep(self.interval)
+
+
+upload_session_janitor = UploadSessionJanitor(
+    interval=settings.upload_session_cleanup_interval_seconds,
+    ttl=timedelta(hours=settings.upload_session_ttl_hours)
+)
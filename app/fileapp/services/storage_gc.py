@@ -0,0 +1,254 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database.core import SessionLocal
+from app.fileapp.entities import DocumentCollectionFile, FileBlob
+from app.fileapp.services.blob_service import BlobService
+from app.fileapp.storage import temp_dir
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESULT_KEYS = ("blobs", "blob_bytes", "rows", "legacy_files", "legacy_bytes", "temp_files", "temp_bytes", "errors")
+
+
+class StorageGarbageCollector:
+    """
+    background task reclaiming storage in rate limited batches: blobs with no references past the grace
+    period, soft-deleted file rows past it, and temp files left behind by crashed uploads.
+    with dry_run nothing is changed, the result only counts what would be removed
+    """
+    def __init__(
+            self,
+            interval: float,
+            grace: timedelta,
+            temp_max_age: timedelta,
+            batch_size: int,
+            batch_pause: float,
+            dry_run: bool = False
+    ):
+        self.interval = interval
+        self.grace = grace
+        self.temp_max_age = temp_max_age
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause
+        self.dry_run = dry_run
+
+        self.runs = 0
+        self.totals: Dict[str, int] = dict.fromkeys(RESULT_KEYS, 0)
+        self.last_run_at: Optional[datetime] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_result: Optional[Dict[str, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run(), name="storage-gc")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "dry_run": self.dry_run,
+            "runs": self.runs,
+            "last_run_at": self.last_run_at,
+            "last_duration_ms": self.last_duration_ms,
+            "last_result": self.last_result,
+            "totals": dict(self.totals),
+        }
+
+    async def run_once(self) -> Dict[str, int]:
+        async with SessionLocal() as db:
+            return await self.collect(db)
+
+    async def collect(self, db: AsyncSession, now: Optional[datetime] = None) -> Dict[str, int]:
+        now = now or datetime.now(timezone.utc)
+        started = time.perf_counter()
+        result = dict.fromkeys(RESULT_KEYS, 0)
+
+        await self.__collect_blobs(db, now - self.grace, result)
+        await self.__purge_rows(db, now - self.grace, result)
+        await self.__remove_temp_files((now - self.temp_max_age).timestamp(), result)
+
+        self.runs += 1
+        self.last_run_at = now
+        self.last_duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        self.last_result = result
+        if not self.dry_run:
+            for key, value in result.items():
+                self.totals[key] += value
+
+        logger.info("storage gc finished", dry_run=self.dry_run, duration_ms=self.last_duration_ms, **result)
+        return result
+
+    async def __pause(self) -> None:
+        if self.batch_pause > 0:
+            await asyncio.sleep(self.batch_pause)
+
+    async def __collect_blobs(self, db: AsyncSession, cutoff: datetime, result: Dict[str, int]) -> None:
+        blobs = BlobService(db)
+        last_checksum = ""
+
+        while True:
+            batch = (await db.execute(
+                select(FileBlob.checksum, FileBlob.size)
+                .where(FileBlob.ref_count == 0, FileBlob.updated_at < cutoff, FileBlob.checksum > last_checksum)
+                .order_by(FileBlob.checksum)
+                .limit(self.batch_size)
+            )).all()
+            if not batch:
+                return
+            last_checksum = batch[-1].checksum
+
+            for checksum, size in batch:
+                if self.dry_run:
+                    result["blobs"] += 1
+                    result["blob_bytes"] += size
+                    continue
+
+                legacy_paths = (await db.scalars(
+                    select(DocumentCollectionFile.stored_path)
+                    .where(DocumentCollectionFile.checksum == checksum, DocumentCollectionFile.stored_path.is_not(None))
+                    .distinct()
+                )).all()
+                try:
+                    freed = await blobs.reclaim(checksum, legacy_paths)
+                except (SQLAlchemyError, OSError):
+                    result["errors"] += 1
+                    continue
+
+                if freed is not None:
+                    result["blobs"] += 1
+                    result["blob_bytes"] += freed
+
+            await self.__pause()
+
+    async def __purge_rows(self, db: AsyncSession, cutoff: datetime, result: Dict[str, int]) -> None:
+        """
+        hard delete soft-deleted rows; rows without a checksum predate blobs and take their file along
+        once nothing else points at it
+        """
+        expired = (
+            DocumentCollectionFile.is_active.is_(False),
+            func.coalesce(DocumentCollectionFile.updated_at, DocumentCollectionFile.created_at) < cutoff
+        )
+
+        if self.dry_run:
+            result["rows"] += await db.scalar(select(func.count()).select_from(DocumentCollectionFile).where(*expired))
+            return
+
+        while True:
+            batch = (await db.execute(
+                select(DocumentCollectionFile.id, DocumentCollectionFile.checksum, DocumentCollectionFile.stored_path)
+                .where(*expired)
+                .order_by(DocumentCollectionFile.id)
+                .limit(self.batch_size)
+            )).all()
+            if not batch:
+                return
+
+            try:
+                await db.execute(
+                    delete(DocumentCollectionFile)
+                    .where(DocumentCollectionFile.id.in_([row.id for row in batch]))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+            except SQLAlchemyError as sql_err:
+                await db.rollback()
+                logger.error("storage gc row purge failed", error=sql_err, error_type="database error", exc_info=True)
+                result["errors"] += 1
+                return
+            result["rows"] += len(batch)
+
+            for stored_path in {row.stored_path for row in batch if row.checksum is None and row.stored_path}:
+                still_used = await db.scalar(select(exists().where(DocumentCollectionFile.stored_path == stored_path)))
+                if still_used:
+                    continue
+                try:
+                    size = await run_in_threadpool(_remove_file, Path(stored_path))
+                except OSError as os_err:
+                    logger.error("legacy file deletion failed", path=stored_path, error=os_err, error_type="os error")
+                    result["errors"] += 1
+                    continue
+                result["legacy_files"] += 1
+                result["legacy_bytes"] += size
+
+            await self.__pause()
+
+    async def __remove_temp_files(self, cutoff_timestamp: float, result: Dict[str, int]) -> None:
+        stale = await run_in_threadpool(_stale_temp_files, cutoff_timestamp)
+
+        for start in range(0, len(stale), self.batch_size):
+            for path, size in stale[start:start + self.batch_size]:
+                if not self.dry_run:
+                    try:
+                        await run_in_threadpool(_remove_file, path)
+                    except OSError as os_err:
+                        logger.error("temp file deletion failed", path=str(path), error=os_err, error_type="os error")
+                        result["errors"] += 1
+                        continue
+                result["temp_files"] += 1
+                result["temp_bytes"] += size
+
+            await self.__pause()
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except (SQLAlchemyError, OSError) as e:
+                logger.error("storage gc failed", error_type=type(e).__name__, error=str(e))
+            await asyncio.sleep(self.interval)
+
+
+def _remove_file(path: Path) -> int:
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return 0
+    path.unlink(missing_ok=True)
+    return size
+
+
+def _stale_temp_files(cutoff_timestamp: float) -> List[Tuple[Path, int]]:
+    """
+    ingest temp files, including temp_* ones from before the tmp dir existed; resumable part files are
+    left to the upload session janitor
+    """
+    candidates = [*temp_dir().iterdir(), *settings.upload_dir.glob("temp_*")]
+    stale = []
+    for path in candidates:
+        try:
+            stat_result = path.stat()
+        except FileNotFoundError:
+            continue
+        if path.is_file() and stat_result.st_mtime < cutoff_timestamp:
+            stale.append((path, stat_result.st_size))
+    return stale
+
+
+storage_gc = StorageGarbageCollector(
+    interval=settings.storage_gc_interval_seconds,
+    grace=timedelta(hours=settings.storage_gc_grace_hours),
+    temp_max_age=timedelta(hours=settings.storage_gc_temp_max_age_hours),
+    batch_size=settings.storage_gc_batch_size,
+    batch_pause=settings.storage_gc_batch_pause_seconds,
+    dry_run=settings.storage_gc_dry_run
+)
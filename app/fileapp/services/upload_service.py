@@ -1,28 +1,34 @@
 from pathlib import Path
 from fastapi import UploadFile
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-import hashlib
-import shutil
-from typing import Optional, Set
-import os
-import magic
+from starlette.concurrency import run_in_threadpool
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import asyncio
 import mimetypes
 
 from app.config import settings
 from app.logger import get_logger
+from app.userapp.list_versions import ListVersionService
 from app.taskapp.entities import DocumentCollection
 from app.fileapp.entities import DocumentCollectionFile
-from app.fileapp.exceptions import DocumentNotFoundException, InvalidFileTypeException, FileProcessingException, FileUploadException
+from app.fileapp.storage import prepare_content_path, temp_dir
+from app.fileapp.services.blob_service import BlobService
+from app.fileapp.services.document_stats import DocumentStatsService
+from app.fileapp.services.ingest import IngestResult, ingest_stream, commit_file, hash_stream
+from app.fileapp.exceptions import DocumentNotFoundException, InvalidFileTypeException, FileProcessingException, FileUploadException, ChecksumMismatchException
 
 logger = get_logger(__name__)
 
 
 class FileUploadService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
-        self.upload_dir = settings.upload_dir
-        self.upload_dir.mkdir(exist_ok=True)
+        self.blobs = BlobService(db)
+        self.document_stats = DocumentStatsService(db)
+        self.list_versions = ListVersionService(db)
+        self.temp_dir = temp_dir()
 
         self.allowed_extensions: Set[str] = settings.allowed_extensions_set
 
@@ -34,21 +40,11 @@ class FileUploadService:
 
         self.allowed_mime_types = set(self.extension_to_mime.values())
 
-    def __check_document_collection_exist(self, document_id: int) -> bool:
-        return self.db.get(DocumentCollection, document_id) is not None
+    async def __check_document_collection_exist(self, document_id: int) -> bool:
+        return await self.db.get(DocumentCollection, document_id) is not None
 
-    def __save_temp_file(self, file: UploadFile) -> Path:
-        temp_filename = f"temp_{os.urandom(8).hex()}_{file.filename}"
-        temp_path = self.upload_dir / temp_filename
-
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        return temp_path
-
-    def __validate_file_type(self, temp_path: Path, file_name: str) -> bool:
+    def __is_allowed_extension(self, file_name: str) -> bool:
         extension = Path(file_name).suffix.lower()
-        real_mime_type = magic.from_file(str(temp_path), mime=True)
 
         if extension not in self.allowed_extensions:
             logger.warning(
@@ -56,100 +52,393 @@ class FileUploadService:
                 filename=file_name
             )
             return False
+        return True
 
-        expected_mime = self.extension_to_mime.get(extension)
-        if real_mime_type != expected_mime:
-            logger.warning(
-                'File rejected. File type does not match extension',
-                filename=file_name,
-                expected_type=expected_mime,
-                detected_type=real_mime_type
-            )
-            return False
+    def __mime_matcher(self, file_name: str) -> Callable[[str], bool]:
+        expected_mime = self.extension_to_mime.get(Path(file_name).suffix.lower())
 
-        return True
+        def accept_mime(real_mime_type: str) -> bool:
+            if real_mime_type != expected_mime:
+                logger.warning(
+                    'File rejected. File type does not match extension',
+                    filename=file_name,
+                    expected_type=expected_mime,
+                    detected_type=real_mime_type
+                )
+                return False
+            return True
+
+        return accept_mime
+
+    async def __find_owned_duplicate(self, checksum: str, user_id: int, extension: str) -> Optional[DocumentCollectionFile]:
+        """
+        existing active upload of the same bytes by the same user; only the owner may skip sending the body,
+        otherwise knowing a hash would be enough to claim someone else's file
+        """
+        return await self.db.scalar(
+            select(DocumentCollectionFile)
+            .filter_by(checksum=checksum, user_id=user_id, extension=extension, is_active=True)
+            .limit(1)
+        )
+
+    async def __create_file_record(
+            self,
+            title: str,
+            file_size: int,
+            mime_type: str,
+            extension: str,
+            checksum: str,
+            user_id: int,
+            document_id: Optional[int],
+            stored_path: Optional[str] = None
+    ) -> DocumentCollectionFile:
+        new_file = DocumentCollectionFile(
+            title=title,
+            stored_path=stored_path,
+            file_size=file_size,
+            mime_type=mime_type,
+            extension=extension,
+            checksum=checksum,
+            user_id=user_id,
+            document_id=document_id
+        )
+        self.db.add(new_file)
+        if document_id is not None:
+            await self.document_stats.adjust({document_id: (1, file_size)})
+        await self.list_versions.bump(user_id, files=True, documents=document_id is not None)
+        await self.db.commit()
+        await self.db.refresh(new_file)
 
-    def __calculate_checksum(self, file_path: str) -> str:
-        sha256_hash = hashlib.sha256()
+        logger.info("file record creation successful", file_id=new_file.id)
+        return new_file
 
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda : f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+    async def __link_duplicate(
+            self,
+            existing_file: DocumentCollectionFile,
+            title: str,
+            user_id: int,
+            document_id: Optional[int]
+    ) -> Optional[DocumentCollectionFile]:
+        """
+        reference existing_file's bytes without receiving them
+        :return: None when those bytes were released meanwhile and have to be uploaded again
+        """
+        blob = await self.blobs.acquire(existing_file.checksum, existing_file.extension, existing_file.file_size)
+        if blob.ref_count == 1:
+            logger.info("dedup source released concurrently", checksum=existing_file.checksum[:8])
+            await self.db.rollback()
+            return None
 
-    def upload_file(self, file: UploadFile, user_id: int, document_id: Optional[int] = None):
-        temp_path = None
+        logger.info(
+            "file-deduplicated",
+            checksum=existing_file.checksum[:8],
+            existing_file_id=existing_file.id
+        )
+        return await self.__create_file_record(
+            title=title,
+            file_size=existing_file.file_size,
+            mime_type=existing_file.mime_type,
+            extension=existing_file.extension,
+            checksum=existing_file.checksum,
+            user_id=user_id,
+            document_id=document_id,
+            # shares the original's bytes, which may still sit in the flat layout
+            stored_path=existing_file.stored_path
+        )
 
+    async def __validate_target(self, file_name: str, document_id: Optional[int]) -> None:
         if document_id is not None:
-            document_exists: bool = self.__check_document_collection_exist(document_id)
+            document_exists: bool = await self.__check_document_collection_exist(document_id)
             if not document_exists:
                 raise DocumentNotFoundException(f"document_collection-{document_id} does not exist")
 
+        if not self.__is_allowed_extension(file_name):
+            raise InvalidFileTypeException("file type mismatch or not allowed")
+
+    async def link_existing_upload(
+            self,
+            file_name: str,
+            checksum: str,
+            user_id: int,
+            document_id: Optional[int] = None
+    ) -> Optional[DocumentCollectionFile]:
+        """
+        preflight: create the file reference from a client declared checksum without receiving the body
+        :return: the new file record, or None when the bytes have to be uploaded
+        """
+        await self.__validate_target(file_name, document_id)
+
         try:
-            temp_path = self.__save_temp_file(file)
+            existing_file = await self.__find_owned_duplicate(checksum, user_id, Path(file_name).suffix.lower())
+            if existing_file is None:
+                logger.info("upload preflight miss", checksum=checksum[:8])
+                return None
 
-            if not self.__validate_file_type(temp_path, file.filename):
-                raise InvalidFileTypeException("file type mismatch or not allowed")
+            return await self.__link_duplicate(existing_file, file_name, user_id, document_id)
 
-            checksum = self.__calculate_checksum(str(temp_path))
-            file_size = os.path.getsize(temp_path)
-            extension = Path(file.filename).suffix.lower()
-            mime_type = file.content_type
-            file_title = file.filename
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("upload preflight failed", error_type="database error", error=sql_err, exc_info=True)
+            raise
+
+    async def upload_file(
+            self,
+            file: UploadFile,
+            user_id: int,
+            document_id: Optional[int] = None,
+            expected_checksum: Optional[str] = None
+    ) -> DocumentCollectionFile:
+        """
+        :param expected_checksum: client declared sha-256, the received bytes must match it
+        :raises ChecksumMismatchException: when they do not
+        """
+        await self.__validate_target(file.filename, document_id)
+
+        try:
+            if expected_checksum is not None:
+                # declared duplicate of the caller's own file: verify by hashing only, nothing is written
+                existing_file = await self.__find_owned_duplicate(expected_checksum, user_id, Path(file.filename).suffix.lower())
+                if existing_file is not None:
+                    checksum = await run_in_threadpool(hash_stream, file.file, settings.upload_chunk_size)
+                    self.__verify_checksum(expected_checksum, checksum)
+                    linked = await self.__link_duplicate(existing_file, file.filename, user_id, document_id)
+                    if linked is not None:
+                        return linked
+                    await run_in_threadpool(file.file.seek, 0)
 
-            existing_file = (
-                self.db.query(DocumentCollectionFile)
-                .filter_by(checksum=checksum)
-                .first()
+            ingested = await run_in_threadpool(
+                ingest_stream,
+                file.file,
+                self.temp_dir,
+                settings.upload_chunk_size,
+                self.__mime_matcher(file.filename)
             )
 
-            if existing_file:
-                logger.info(
-                    "file-deduplicated",
-                    checksum=checksum[:8],
-                    existing_file_id=existing_file.id
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("file upload failed", error_type="database error", error=sql_err, exc_info=True)
+            raise
+        except FileUploadException:
+            raise
+        except Exception as e:
+            logger.error("file upload failed", error_type="unexpected error", error=e, exc_info=True)
+            raise FileProcessingException(f"unexpected error during file upload: {str(e)}") from e
+
+        return await self.__store_ingested(ingested, file.filename, user_id, document_id, expected_checksum)
+
+    async def upload_files(
+            self,
+            files: List[UploadFile],
+            user_id: int,
+            document_id: Optional[int] = None
+    ) -> List[DocumentCollectionFile]:
+        """
+        all-or-nothing bulk upload: one document check, files hashed concurrently on the thread pool,
+        one blob upsert covering every checksum (the dedup lookup) and all rows in a single transaction
+        """
+        if len(files) > settings.upload_batch_max_files:
+            raise FileUploadException(f"at most {settings.upload_batch_max_files} files per batch")
+
+        await self.__validate_target(files[0].filename, document_id)
+        for file in files[1:]:
+            if not self.__is_allowed_extension(file.filename):
+                raise InvalidFileTypeException(f"{file.filename}: file type mismatch or not allowed")
+
+        ingested = await self.__ingest_many(files)
+        placed: List[Path] = []
+
+        try:
+            wanted: Dict[str, Tuple[str, int, int]] = {}
+            for file, result in zip(files, ingested):
+                extension, _, count = wanted.get(result.checksum, (Path(file.filename).suffix.lower(), result.size, 0))
+                wanted[result.checksum] = (extension, result.size, count + 1)
+
+            blobs = await self.blobs.acquire_many(wanted)
+
+            new_files = []
+            for file, result in zip(files, ingested):
+                blob = blobs[result.checksum]
+                final_path = await run_in_threadpool(prepare_content_path, result.checksum, blob.extension)
+
+                # first sight of this content in the batch and nobody else holds it: its bytes go into place
+                needs_bytes = blob.ref_count == wanted[result.checksum][2] or not await run_in_threadpool(final_path.exists)
+                if needs_bytes and final_path not in placed:
+                    await run_in_threadpool(commit_file, result.temp_path, final_path)
+                    placed.append(final_path)
+                else:
+                    await run_in_threadpool(result.temp_path.unlink, True)
+
+                new_files.append(DocumentCollectionFile(
+                    title=file.filename,
+                    file_size=result.size,
+                    mime_type=result.mime_type,
+                    extension=blob.extension,
+                    checksum=result.checksum,
+                    user_id=user_id,
+                    document_id=document_id
+                ))
+
+            self.db.add_all(new_files)
+            if document_id is not None:
+                await self.document_stats.adjust({document_id: (len(new_files), sum(result.size for result in ingested))})
+            await self.list_versions.bump(user_id, files=True, documents=document_id is not None)
+            await self.db.commit()
+
+            logger.info("batch upload successful", files=len(new_files), new_blobs=len(placed))
+            return new_files
+
+        except BaseException as e:
+            # placed bytes belong to blobs this transaction created, drop them while the rows are still locked
+            for path in placed:
+                path.unlink(missing_ok=True)
+            for result in ingested:
+                result.temp_path.unlink(missing_ok=True)
+            await self.db.rollback()
+
+            if isinstance(e, (SQLAlchemyError, FileUploadException)) or not isinstance(e, Exception):
+                logger.error("batch upload failed", error_type=type(e).__name__, error=str(e))
+                raise
+            logger.error("batch upload failed", error_type="unexpected error", error=e, exc_info=True)
+            raise FileProcessingException(f"unexpected error during file upload: {str(e)}") from e
+
+    async def __ingest_many(self, files: List[UploadFile]) -> List[IngestResult]:
+        """
+        ingest files in parallel, at most upload_batch_concurrency at a time; hashing releases the gil
+        """
+        semaphore = asyncio.Semaphore(settings.upload_batch_concurrency)
+
+        async def ingest(file: UploadFile) -> IngestResult:
+            async with semaphore:
+                return await run_in_threadpool(
+                    ingest_stream,
+                    file.file,
+                    self.temp_dir,
+                    settings.upload_chunk_size,
+                    self.__mime_matcher(file.filename)
                 )
-                os.remove(temp_path)
-                temp_path = None
-                final_path=existing_file.file_path
-            else:
-                final_filename = f"{checksum}{extension}"
-                final_path = str(self.upload_dir/final_filename)
-                shutil.move(str(temp_path), final_path)
-                temp_path = None
-                logger.info("new file saved", path=final_path)
-
-            new_file = DocumentCollectionFile(
-                title=file_title,
-                file_path=final_path,
-                file_size=file_size,
-                mime_type=mime_type,
-                extension=extension,
+
+        results = await asyncio.gather(*(ingest(file) for file in files), return_exceptions=True)
+
+        failed = [(file, result) for file, result in zip(files, results) if isinstance(result, BaseException)]
+        if not failed:
+            return results
+
+        for result in results:
+            if isinstance(result, IngestResult):
+                result.temp_path.unlink(missing_ok=True)
+
+        file, error = failed[0]
+        if isinstance(error, FileUploadException):
+            error.message = f"{file.filename}: {error.message}"
+            raise error
+        logger.error("batch upload failed", error_type="unexpected error", filename=file.filename, error=error, exc_info=error)
+        raise FileProcessingException(f"unexpected error during file upload: {str(error)}") from error
+
+    async def finalize_ingested(
+            self,
+            ingested: IngestResult,
+            file_name: str,
+            user_id: int,
+            document_id: Optional[int] = None,
+            expected_checksum: Optional[str] = None,
+            owns_source: bool = True
+    ) -> DocumentCollectionFile:
+        """
+        turn bytes that were ingested elsewhere (e.g. a resumable upload) into a file record.
+        the sniffed mime type is validated here. ingested.temp_path is consumed on success; on failure it is
+        removed only with owns_source, otherwise it stays with its owner for a retry
+        """
+        try:
+            await self.__validate_target(file_name, document_id)
+            if not self.__mime_matcher(file_name)(ingested.mime_type):
+                raise InvalidFileTypeException("file type mismatch or not allowed")
+        except FileUploadException:
+            if owns_source:
+                ingested.temp_path.unlink(missing_ok=True)
+            raise
+
+        return await self.__store_ingested(ingested, file_name, user_id, document_id, expected_checksum, owns_source)
+
+    async def __store_ingested(
+            self,
+            ingested: IngestResult,
+            file_name: str,
+            user_id: int,
+            document_id: Optional[int],
+            expected_checksum: Optional[str],
+            owns_source: bool = True
+    ) -> DocumentCollectionFile:
+        """
+        take a blob reference, move the temp file into place unless the bytes are already stored,
+        then create the record; all in one transaction
+        :param owns_source: whether a failure may delete temp_path
+        """
+        temp_path = ingested.temp_path
+        checksum = ingested.checksum
+        extension = Path(file_name).suffix.lower()
+        placed: Optional[Path] = None
+        created_blob = False
+
+        try:
+            if expected_checksum is not None:
+                self.__verify_checksum(expected_checksum, checksum)
+
+            blob = await self.blobs.acquire(checksum, extension, ingested.size)
+            created_blob = blob.ref_count == 1
+            final_path = await run_in_threadpool(prepare_content_path, checksum, blob.extension)
+
+            if created_blob or not await run_in_threadpool(final_path.exists):
+                await run_in_threadpool(commit_file, temp_path, final_path)
+                placed = final_path
+                logger.info("new file saved", path=str(final_path))
+
+            new_file = await self.__create_file_record(
+                title=file_name,
+                file_size=ingested.size,
+                mime_type=ingested.mime_type,
+                extension=blob.extension,
                 checksum=checksum,
                 user_id=user_id,
                 document_id=document_id
             )
-            self.db.add(new_file)
-            self.db.commit()
-            self.db.refresh(new_file)
-
-            logger.info("file record creation successful", file_id=new_file.id)
+            if placed is None:
+                # the bytes were already stored, the source is only dropped once the record exists
+                await run_in_threadpool(temp_path.unlink, True)
+                logger.info("file-deduplicated", checksum=checksum[:8], ref_count=blob.ref_count)
+            return new_file
 
         except SQLAlchemyError as sql_err:
-            self.db.rollback()
-            if temp_path and os.path.exists(temp_path):
-                os.remove(temp_path)
+            # before the rollback: the blob row is still locked, nobody else can have picked up the placed bytes
+            await self.__discard(temp_path, placed, created_blob, owns_source)
+            await self.db.rollback()
             logger.error("file upload failed", error_type="database error", error=sql_err, exc_info=True)
             raise
         except FileUploadException:
-            if temp_path and os.path.exists(temp_path):
-                os.remove(temp_path)
+            await self.__discard(temp_path, placed, created_blob, owns_source)
+            await self.db.rollback()
             raise
         except Exception as e:
-            if temp_path and os.path.exists(temp_path):
-                os.remove(temp_path)
+            await self.__discard(temp_path, placed, created_blob, owns_source)
+            await self.db.rollback()
             logger.error("file upload failed", error_type="unexpected error", error=e, exc_info=True)
             raise FileProcessingException(f"unexpected error during file upload: {str(e)}") from e
 
+    @staticmethod
+    async def __discard(temp_path: Path, placed: Optional[Path], created_blob: bool, owns_source: bool) -> None:
+        """
+        undo the filesystem side of a failed store. bytes placed for a blob this transaction created would be
+        orphaned by the rollback, like in upload_files. a source owned by someone else (a resumable upload's
+        part file) gets its bytes back instead so the owner can retry
+        """
+        if owns_source:
+            await run_in_threadpool(temp_path.unlink, True)
+            if placed is not None and created_blob:
+                await run_in_threadpool(placed.unlink, True)
+        elif placed is not None:
+            await run_in_threadpool(commit_file, placed, temp_path)
 
-# TODO: save mime_type from magic?
\ No newline at end of file
+    @staticmethod
+    def __verify_checksum(expected_checksum: str, checksum: str) -> None:
+        if checksum != expected_checksum:
+            logger.warning("upload checksum mismatch", expected=expected_checksum[:8], actual=checksum[:8])
+            raise ChecksumMismatchException("uploaded file does not match X-Checksum-Sha256")
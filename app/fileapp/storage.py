@@ -0,0 +1,57 @@
+"""
+content addressed storage layout under settings.upload_dir:
+
+    <upload_dir>/ab/cd/abcd...<ext>   committed files, sharded by the first checksum characters
+    <upload_dir>/tmp/                 in-flight ingest temp files, same filesystem so commits are a rename
+    <upload_dir>/sessions/            resumable upload part files
+
+the database keeps only checksum + extension, the path is derived here
+"""
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+TEMP_DIR_NAME = "tmp"
+SESSION_DIR_NAME = "sessions"
+
+
+def relative_path(checksum: str, extension: str) -> Path:
+    shards = [checksum[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_DEPTH)]
+    return Path(*shards, f"{checksum}{extension}")
+
+
+def content_path(checksum: str, extension: str) -> Path:
+    return settings.upload_dir / relative_path(checksum, extension)
+
+
+def resolve_path(checksum: Optional[str], extension: str, stored_path: Optional[str] = None) -> Path:
+    """
+    rows still carrying a stored path (flat layout, not migrated yet) keep using it
+    """
+    if stored_path or not checksum:
+        return Path(stored_path or "")
+    return content_path(checksum, extension)
+
+
+def temp_dir() -> Path:
+    path = settings.upload_dir / TEMP_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def session_dir() -> Path:
+    path = settings.upload_dir / SESSION_DIR_NAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def prepare_content_path(checksum: str, extension: str) -> Path:
+    """
+    final path for a checksum with its shard directories created
+    """
+    path = content_path(checksum, extension)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
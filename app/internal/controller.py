@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends
+
+from app.config import settings
+from app.database.core import engine
+from app.database.metrics import checkout_wait_histogram
+from app.internal.dependencies import verify_internal_key
+from app.fileapp.services.storage_gc import storage_gc
+from app.internal.model import (
+    PoolStatsResponse, PoolStats, PoolWaitStats, LogQueueStatsResponse, LogQueueStats, StorageGCStatsResponse, StorageGCStats
+)
+from app.logger import get_log_queue_stats
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal APIs"],
+    include_in_schema=False,
+    dependencies=[Depends(verify_internal_key)]
+)
+
+
+@router.get(
+    "/db/pool",
+    response_model=PoolStatsResponse,
+    summary="database pool statistics",
+    description="live connection pool usage and checkout wait histogram for this worker"
+)
+async def get_pool_stats() -> PoolStatsResponse:
+    pool = engine.pool
+
+    return PoolStatsResponse(
+        message="pool stats retrieved",
+        data=PoolStats(
+            pool_size=pool.size(),
+            max_overflow=settings.db_max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            wait=PoolWaitStats(**checkout_wait_histogram.snapshot())
+        )
+    )
+
+
+@router.get(
+    "/logging/queue",
+    response_model=LogQueueStatsResponse,
+    summary="log queue statistics",
+    description="background log writer queue depth and dropped record count for this worker"
+)
+async def get_log_queue() -> LogQueueStatsResponse:
+    return LogQueueStatsResponse(
+        message="log queue stats retrieved",
+        data=LogQueueStats(**get_log_queue_stats())
+    )
+
+
+@router.get(
+    "/storage/gc",
+    response_model=StorageGCStatsResponse,
+    summary="storage gc statistics",
+    description="runs, last result and bytes reclaimed by the storage garbage collector in this worker"
+)
+async def get_storage_gc() -> StorageGCStatsResponse:
+    return StorageGCStatsResponse(
+        message="storage gc stats retrieved",
+        data=StorageGCStats(**storage_gc.stats())
+    )
@@ -0,0 +1,23 @@
+import secrets
+from fastapi import Header, HTTPException, status
+from typing import Optional
+
+from app.config import settings
+from app.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def verify_internal_key(x_internal_key: Optional[str] = Header(None)) -> None:
+    """
+    guard internal endpoints with INTERNAL_API_KEY. endpoints are hidden when no key is configured
+    """
+    if not settings.internal_api_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    if not x_internal_key or not secrets.compare_digest(x_internal_key, settings.internal_api_key):
+        logger.warning("internal api access denied")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="invalid internal api key"
+        )
@@ -0,0 +1,50 @@
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+from app.taskapp.document_model import ApiResponse
+
+
+class PoolWaitStats(BaseModel):
+    count: int = Field(..., description="Checkouts served from the pool (not by opening a new connection)")
+    sum_ms: float = Field(..., description="Total time spent waiting for pooled connections")
+    max_ms: float = Field(..., description="Longest observed checkout wait")
+    timeouts: int = Field(..., description="Checkouts that hit pool_timeout, not part of the histogram")
+    buckets: Dict[str, int] = Field(..., description="Cumulative checkout wait histogram")
+
+
+class PoolStats(BaseModel):
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    wait: PoolWaitStats
+
+
+class PoolStatsResponse(ApiResponse):
+    data: PoolStats
+
+
+class LogQueueStats(BaseModel):
+    enabled: bool = Field(..., description="Whether log records are written by the background listener")
+    queued: int = Field(..., description="Records waiting to be written")
+    capacity: int = Field(..., description="Maximum queued records before dropping")
+    dropped: int = Field(..., description="Records dropped because the queue was full")
+
+
+class LogQueueStatsResponse(ApiResponse):
+    data: LogQueueStats
+
+
+class StorageGCStats(BaseModel):
+    dry_run: bool = Field(..., description="Whether the collector only counts what it would remove")
+    runs: int = Field(..., description="Completed collection runs in this worker")
+    last_run_at: Optional[datetime] = Field(None, description="Start of the last run")
+    last_duration_ms: Optional[float] = Field(None, description="Duration of the last run")
+    last_result: Optional[Dict[str, int]] = Field(None, description="Items and bytes found by the last run")
+    totals: Dict[str, int] = Field(..., description="Items and bytes reclaimed since startup")
+
+
+class StorageGCStatsResponse(ApiResponse):
+    data: StorageGCStats
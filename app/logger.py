@@ -1,7 +1,11 @@
 import os
+import atexit
 import logging
+import threading
 import structlog
-from logging.handlers import TimedRotatingFileHandler
+from queue import Queue, Full
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 import inspect
 
 from app.config import settings
@@ -10,29 +14,90 @@ from app.config import settings
 # ensure log directory exists
 os.makedirs(settings.log_dir, exist_ok=True)
 
+
+# ------------- QUEUE HANDLER -------------
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler over a bounded queue that drops and counts records instead of blocking when full
+    """
+    def __init__(self, queue: Queue):
+        super().__init__(queue)
+        self._drop_lock = threading.Lock()
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            with self._drop_lock:
+                self.dropped += 1
+
+
+_queue_handler: Optional[DroppingQueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
+
+
+def _orjson_dumps(obj: Any, default: Any = None, **_: Any) -> str:
+    import orjson
+
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _json_renderer() -> structlog.processors.JSONRenderer:
+    if settings.log_json_serializer == "orjson":
+        return structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    return structlog.processors.JSONRenderer()
+
+
+def _build_handlers() -> list[logging.Handler]:
+    return [
+        logging.StreamHandler(),
+        TimedRotatingFileHandler(
+            filename=f"{settings.log_dir}/{settings.log_file}",
+            when="midnight",
+            interval=1,
+            backupCount=7,
+            encoding='utf-8',
+            utc=False
+        )
+    ]
+
+
 # ------------- LOGGER CONFIGURATION FUNCTION -------------
 def configure_logger():
     """
-    configure structlog with standard logging handlers (console + file)
+    configure structlog with standard logging handlers (console + file).
+    with log_queue_enabled the handlers run on a QueueListener thread and request code only enqueues.
+    safe to call repeatedly, the handlers (and the log file) are only opened once
     """
+    global _queue_handler, _queue_listener
+
     log_level_name = settings.log_level.upper()
     log_level = getattr(logging, log_level_name, logging.INFO)
 
+    if settings.log_queue_enabled:
+        if _queue_listener is None:
+            handlers = _build_handlers()
+            formatter = logging.Formatter("%(message)s")
+            for handler in handlers:
+                handler.setFormatter(formatter)
+
+            _queue_handler = DroppingQueueHandler(Queue(maxsize=settings.log_queue_size))
+            _queue_listener = QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+            _queue_listener.start()
+            atexit.register(shutdown_logger)
+        handlers = [_queue_handler]
+    elif not logging.getLogger().handlers:
+        handlers = _build_handlers()
+    else:
+        # basicConfig ignores handlers once the root logger has some, do not open a file just to drop it
+        handlers = []
+
     # standard logging setup
     logging.basicConfig(
         level=log_level,
         format="%(message)s",
-        handlers=[
-            logging.StreamHandler(),
-            TimedRotatingFileHandler(
-                filename=f"{settings.log_dir}/{settings.log_file}",
-                when="midnight",
-                interval=1,
-                backupCount=7,
-                encoding='utf-8',
-                utc=False
-            )
-        ]
+        handlers=handlers
     )
 
     # structlog setup
@@ -46,13 +111,37 @@ def configure_logger():
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            _json_renderer()
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
-        cache_logger_on_first_use=False
+        cache_logger_on_first_use=True
     )
 
+
+def shutdown_logger():
+    """
+    flush queued records and stop the background writer thread
+    """
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def get_log_queue_stats() -> Dict[str, Any]:
+    if _queue_handler is None:
+        return {"enabled": False, "queued": 0, "capacity": 0, "dropped": 0}
+
+    return {
+        "enabled": _queue_listener is not None,
+        "queued": _queue_handler.queue.qsize(),
+        "capacity": _queue_handler.queue.maxsize,
+        "dropped": _queue_handler.dropped
+    }
+
+
 # ------------- LOGGER CREATION FUNCTION -------------
 def get_logger(name: str = None):
     """
@@ -62,4 +151,4 @@ def get_logger(name: str = None):
         frame = inspect.currentframe().f_back
         name = frame.f_globals.get('__name__', 'app')
 
-    return structlog.get_logger(name)
\ No newline at end of file
+    return structlog.get_logger(name)
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
@@ -9,20 +10,49 @@ from app.userapp.routers import router as user_api_router
 from app.userapp.view import router as user_view_router
 from app.taskapp.task_views import router as task_view_router
 from app.fileapp.controller.base_controller import router as file_api_router
+from app.fileapp.controller.document_archive import router as document_archive_router
+from app.internal.controller import router as internal_api_router
+from app.config import settings
 from app.database.core import engine, Base
+from app.auth.password_executor import password_executor
+from app.audit.writer import audit_log_writer
+from app.fileapp.services.resumable_service import upload_session_janitor
+from app.fileapp.services.storage_gc import storage_gc
 from app.validation_handler import ValidationErrorHandler
 from app.logger import configure_logger
 
 
 configure_logger()
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    if settings.audit_log_enabled:
+        await audit_log_writer.start()
+    upload_session_janitor.start()
+    if settings.storage_gc_enabled:
+        storage_gc.start()
+
+    yield
+
+    await storage_gc.stop()
+    await upload_session_janitor.stop()
+    await audit_log_writer.stop()
+    password_executor.shutdown()
+    await engine.dispose()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title='Task Management App',
         description='A taskapp management App with JWT',
         version='1.0.0',
         docs_url='/docs',
-        redoc_url='/redoc'
+        redoc_url='/redoc',
+        lifespan=lifespan
     )
 
     app.add_middleware(LoggingContextMiddleware)
@@ -37,17 +67,14 @@ def create_app() -> FastAPI:
 app = create_app()
 app.mount('/static', StaticFiles(directory='static'), name='static')
 
-Base.metadata.create_all(bind=engine)
-
 app.include_router(auth_api_router)
 app.include_router(user_api_router)
 app.include_router(user_view_router)
 app.include_router(task_api_router)
 app.include_router(task_view_router)
 app.include_router(file_api_router)
+app.include_router(document_archive_router)
+app.include_router(internal_api_router)
 
-# TODO: log request response to table
 # TODO: crontab to remind users for missed task
-# TODO: add pagination for get list APIs
-# TODO: add file count for doc_collection
 # TODO: update test to register class-wise and cleanup instead of test-wise | rewrite whole test
\ No newline at end of file
@@ -1,30 +1,103 @@
 import json
-from typing import Optional, Any, Union
+import random
+import time
+from fnmatch import fnmatchcase
+from typing import Optional, Any, Union, List
 import structlog.contextvars
 from fastapi import Request
-from starlette.concurrency import iterate_in_threadpool
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response, StreamingResponse
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
 from app.config import settings
 from app.auth.service import AuthenticationService
+from app.audit.writer import audit_log_writer
 from app.logger import get_logger
 
 logger = get_logger(__name__)
 
+# bodies with these content types are streamed through untouched and never captured
+UNLOGGED_REQUEST_TYPES = ("multipart/", "application/octet-stream")
+LOGGED_RESPONSE_TYPES = ("application/json", "text/")
 
-class LoggingContextMiddleware(BaseHTTPMiddleware):
+PAYLOAD_LOG_MODES = ("headers", "sampled", "on_error", "full")
+
+
+class BodyTee:
+    """
+    keeps at most max_bytes of a body as it streams past, the rest is only counted
+    """
+    def __init__(self, max_bytes: int, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.enabled = enabled and max_bytes > 0
+        self.truncated = False
+        self.total_bytes = 0
+        self._chunks: List[bytes] = []
+        self._size = 0
+
+    def feed(self, data: bytes) -> None:
+        if not self.enabled or not data:
+            return
+
+        self.total_bytes += len(data)
+
+        room = self.max_bytes - self._size
+        if len(data) > room:
+            self.truncated = True
+        if room <= 0:
+            return
+
+        chunk = data[:room]
+        self._chunks.append(chunk)
+        self._size += len(chunk)
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self._chunks)
+
+
+class LoggingContextMiddleware:
     """
-    Middleware to set logging context vars for entire request lifecycle
-    and log request/response payloads.
+    Pure ASGI middleware to set logging context vars for entire request lifecycle
+    and log request/response payloads. Bodies are teed, never buffered: at most
+    log_body_max_bytes of each is kept, and uploads/downloads are passed through as-is.
+
+    Payload logging follows log_payload_mode, overridable per route:
+    headers - never capture bodies
+    sampled - capture bodies for log_payload_sample_rate of requests
+    on_error - capture bodies, but only decode and log them for 4xx/5xx or exceptions
+    full - always log bodies
+
+    Every request is also handed to the audit log writer, with whatever payloads the mode captured.
     """
 
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.masking_keys = settings.masking_keys
+    def __init__(
+            self,
+            app: ASGIApp,
+            max_body_bytes: Optional[int] = None,
+            payload_mode: Optional[str] = None,
+            sample_rate: Optional[float] = None,
+            route_overrides: Optional[List[tuple[str, str]]] = None
+    ):
+        self.app = app
+        self.masking_keys = settings.masking_keys_set
+        self.max_body_bytes = settings.log_body_max_bytes if max_body_bytes is None else max_body_bytes
+        self.payload_mode = payload_mode or settings.log_payload_mode
+        self.sample_rate = settings.log_payload_sample_rate if sample_rate is None else sample_rate
+        self.route_overrides = settings.log_payload_overrides if route_overrides is None else route_overrides
+        self.audit_enabled = settings.audit_log_enabled
+
+        for mode in (self.payload_mode, *(mode for _, mode in self.route_overrides)):
+            if mode not in PAYLOAD_LOG_MODES:
+                raise ValueError(f"unknown payload log mode: {mode}")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Request over the raw scope, request.state writes land in scope["state"] shared with the endpoint
+        request = Request(scope)
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         structlog.contextvars.clear_contextvars()
 
         structlog.contextvars.bind_contextvars(
@@ -33,121 +106,156 @@ class LoggingContextMiddleware(BaseHTTPMiddleware):
             query_params=dict(request.query_params) if request.query_params else None
         )
 
-        await self.__bind_user_context(request)
-        await self.__bind_ip_context(request)
-
-        sanitized_req_headers = self.__sanitize(dict(request.headers))
-        request_body = await self.__get_request_body(request)
-        sanitized_request = self.__sanitize(request_body)
+        started = time.perf_counter()
+        self.__bind_user_context(request)
+        ip = self.__bind_ip_context(request)
 
         logger.info(
             "Request started",
-            payload=sanitized_request,
-            headers=sanitized_req_headers,
+            headers=self.__sanitize(dict(request.headers)),
         )
 
+        mode = self.__resolve_mode(request.url.path)
+        capture = mode != "headers"
+
+        request_tee = BodyTee(self.max_body_bytes, enabled=capture and self.__is_loggable_request(request.headers))
+        response_tee = BodyTee(self.max_body_bytes, enabled=False)
+        response_start: dict = {}
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                request_tee.feed(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_tee
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                response_start.update(status_code=message["status"], headers=headers)
+                response_tee = BodyTee(self.max_body_bytes, enabled=capture and self.__is_loggable_response(headers))
+            elif message["type"] == "http.response.body":
+                response_tee.feed(message.get("body", b""))
+            await send(message)
+
+        payloads = {}
+        status_code = None
         try:
-            response = await call_next(request)
-            sanitized_res_headers = self.__sanitize(dict(response.headers))
-
-            if isinstance(response, StreamingResponse) and not isinstance(response, Response):
-                logger.info(
-                    "Request finished (streaming response)",
-                    status_code=response.status_code,
-                    headers=sanitized_res_headers
-                )
-                return response
+            await self.app(scope, receive_wrapper, send_wrapper)
 
-            response_body = await self.__get_response(response)
-            sanitized_response = self.__sanitize(response_body)
+            status_code = response_start.get("status_code")
+            if capture and (mode != "on_error" or (status_code or 500) >= 400):
+                payloads = self.__payload_fields(request_tee, response_tee)
 
             logger.info(
                 "Request finished",
-                payload=sanitized_response,
-                status_code=response.status_code,
-                headers=sanitized_res_headers,
+                **payloads,
+                status_code=status_code,
+                headers=self.__sanitize(dict(response_start.get("headers", {}))),
             )
 
-            return response
-
         except Exception as e:
+            status_code = response_start.get("status_code", 500)
+            payloads = self.__payload_fields(request_tee, response_tee) if capture else {}
             logger.error(
                 "Request failed with exception",
+                **payloads,
                 exception=str(e),
                 exc_info=True,
             )
             raise
         finally:
+            if self.audit_enabled:
+                audit_log_writer.record(
+                    method=request.method,
+                    path=request.url.path,
+                    status_code=status_code,
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    user_id=scope.get("state", {}).get("token_user_id"),
+                    ip=ip,
+                    # sanitized json or a size placeholder, never raw body text
+                    request_payload=payloads.get("request_payload"),
+                    response_payload=payloads.get("payload"),
+                )
             structlog.contextvars.clear_contextvars()
 
+    def __resolve_mode(self, path: str) -> str:
+        mode = next((mode for pattern, mode in self.route_overrides if fnmatchcase(path, pattern)), self.payload_mode)
+        if mode == "sampled":
+            return "full" if random.random() < self.sample_rate else "headers"
+        return mode
+
+    def __payload_fields(self, request_tee: BodyTee, response_tee: BodyTee) -> dict:
+        return {
+            "request_payload": self.__sanitize(self.__decode_body(request_tee)),
+            "payload": self.__sanitize(self.__decode_body(response_tee)),
+            "truncated": request_tee.truncated or response_tee.truncated,
+        }
+
     @staticmethod
-    async def __bind_user_context(request: Request) -> None:
+    def __bind_user_context(request: Request) -> None:
         auth = request.headers.get("Authorization")
         if auth and auth.lower().startswith("bearer "):
             token = auth.split(" ", 1)[1]
             try:
                 user_id = AuthenticationService.get_user_from_token(token, token_type="access")
                 if user_id:
+                    # shared with get_current_user so the token is not verified twice
+                    request.state.access_token = token
+                    request.state.token_user_id = user_id
                     structlog.contextvars.bind_contextvars(user_id=user_id)
             except Exception:
                 logger.error("Error extracting user from token", exc_info=True)
 
     @staticmethod
-    async def __bind_ip_context(request: Request) -> None:
+    def __bind_ip_context(request: Request) -> Optional[str]:
         client_host = request.client.host if request.client else None
         forwarded_for = request.headers.get("x-forwarded-for")
+        ip = forwarded_for.split(",")[0].strip() if forwarded_for else client_host
 
-        structlog.contextvars.bind_contextvars(
-            ip=forwarded_for.split(",")[0].strip() if forwarded_for else client_host
-        )
+        structlog.contextvars.bind_contextvars(ip=ip)
+        return ip
 
     @staticmethod
-    async def __get_request_body(request: Request) -> Optional[Any]:
-        """Safely extract and parse request body"""
-        try:
-            body = await request.body()
-            if not body:
-                return None
+    def __is_loggable_request(headers: Headers) -> bool:
+        content_type = headers.get("content-type", "").lower()
+        return not content_type.startswith(UNLOGGED_REQUEST_TYPES)
 
-            text = body.decode("utf-8")
-            try:
-                return json.loads(text)
-            except json.JSONDecodeError:
-                return text
+    @staticmethod
+    def __is_loggable_response(headers: Headers) -> bool:
+        # attachments (FileResponse downloads) are never captured, whatever their type
+        if "content-disposition" in headers:
+            return False
+        return headers.get("content-type", "").lower().startswith(LOGGED_RESPONSE_TYPES)
 
-        except Exception as e:
-            logger.warning("Failed to read request body", error=str(e))
+    @staticmethod
+    def __decode_body(tee: BodyTee) -> Optional[Union[dict, list, str, int, float, bool]]:
+        """
+        parsed json, which __sanitize can mask. truncated or non-json bodies (form posts, text) are never
+        returned as text, masked keys could hide anywhere in them; only their size is kept
+        """
+        if not tee.body:
             return None
 
-    async def __get_response(self, response: Response) -> Optional[Union[str, dict]]:
+        omitted = {"omitted": True, "bytes": tee.total_bytes}
+        if tee.truncated:
+            return omitted
         try:
-            body = b"".join([chunk async for chunk in response.body_iterator])
-            decoded = self.__decode_body(body)
-
-            response.body_iterator = iterate_in_threadpool(iter([body]))
-            return decoded
-        except Exception as e:
-            logger.warning("Failed to read response body", error=str(e))
-            return None
+            return json.loads(tee.body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return omitted
 
-    def __decode_body(self, body: bytes) -> Optional[Union[str, dict]]:
-        if not body:
-            return None
-        try:
-            text = body.decode("utf-8")
-            try:
-                return json.loads(text)
-            except json.JSONDecodeError:
-                return text
-        except Exception:
-            return None
+    def __is_masked(self, key: str) -> bool:
+        # substring match so access_token / refresh_token are covered by "token"
+        key = key.lower()
+        return any(masking_key in key for masking_key in self.masking_keys)
 
     def __sanitize(self, data: Any) -> Any:
         if hasattr(data, "items"):
             return {
-                k: ("***" if k.lower() in self.masking_keys else self.__sanitize(v))
+                k: ("***" if self.__is_masked(k) else self.__sanitize(v))
                 for k, v in data.items()
             }
         elif isinstance(data, list):
             return [self.__sanitize(item) for item in data]
-        return data
\ No newline at end of file
+        return data
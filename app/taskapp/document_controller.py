@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status, Query
 from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime
+from typing import Literal, Optional
 
 from app.auth.dependencies import CurrentUser, get_current_user
+from app.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.etag import LIST_CACHE_CONTROL, etag_matches, list_etag
 from app.taskapp.dependencies import DependsDocumentService
-from app.taskapp.document_model import DocumentCreate, DocumentListResponse, DocumentResponse, DocumentUpdate, ApiResponse
+from app.taskapp.document_model import (
+    DocumentCreate, DocumentListResponse, DocumentResponse, DocumentUpdate, ApiResponse,
+    DocumentBatchCreate, DocumentBatchUpdate, DocumentBatchDelete, DocumentBatchResult, DocumentBatchResponse
+)
 from app.logger import get_logger
 
 router = APIRouter(
@@ -18,25 +25,62 @@ logger = get_logger(__name__)
     "/",
     response_model=DocumentListResponse,
     summary="Get all documents",
-    description="Retrieve all documents from the database",
+    description="Retrieve a page of documents, optionally searched and filtered by creation time. Pass next_cursor back "
+                "as cursor, with the same q, filters and sort, for the next page. Send the ETag back as If-None-Match "
+                "to get 304 while the list is unchanged",
     responses={
         200: {
             "description": "Documents retrieved successfully",
             "model": DocumentListResponse
         },
+        304: {"description": "Documents not modified"},
+        400: {"description": "Invalid cursor"},
         500: {"description": "Internal server error"}
     }
 )
-def get_all_tasks(current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentListResponse:
+async def get_all_tasks(
+        request: Request,
+        response: Response,
+        current_user: CurrentUser,
+        document_service: DependsDocumentService,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="page size"),
+        cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+        q: Optional[str] = Query(None, min_length=1, max_length=100, description="words or a fragment of title or description"),
+        created_after: Optional[datetime] = Query(None, description="only documents created at or after this time"),
+        created_before: Optional[datetime] = Query(None, description="only documents created before this time"),
+        sort: Literal["created_at", "-created_at", "title", "-title"] = Query("created_at", description="sort key, - for descending"),
+        if_none_match: Optional[str] = Header(None)
+) -> DocumentListResponse | Response:
     try:
-        tasks = document_service.fetch_documents(user_id=current_user.id)
+        etag = list_etag(current_user.id, await document_service.list_version(current_user.id), request.query_params)
+        headers = {"etag": etag, "cache-control": LIST_CACHE_CONTROL}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+        tasks, next_cursor = await document_service.fetch_documents(
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            q=q,
+            created_after=created_after,
+            created_before=created_before,
+            sort=sort
+        )
 
         message = "Collections retrieved successfully" if tasks else f"No collection found for {current_user.name}"
 
         return DocumentListResponse(
             message=message,
-            data=tasks or []
+            data=tasks or [],
+            next_cursor=next_cursor
         )
+    except ValueError as e:
+        logger.warning("document retrival failed", error_type="invalid cursor", cursor=cursor)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        ) from e
     except SQLAlchemyError as e:
         logger.error("document retrival failed", error_type="database error", error=e, exc_info=True)
         raise HTTPException(
@@ -65,9 +109,9 @@ def get_all_tasks(current_user: CurrentUser, document_service: DependsDocumentSe
         500: {'description': 'Internal server error'}
     }
 )
-def get_task(document_id: int, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentResponse:
+async def get_task(document_id: int, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentResponse:
     try:
-        task = document_service.fetch_documents_by_id(document_id=document_id, user_id=current_user.id)
+        task = await document_service.fetch_documents_by_id(document_id=document_id, user_id=current_user.id)
 
         if not task:
             logger.warning('task not found', document_id=document_id)
@@ -110,9 +154,9 @@ def get_task(document_id: int, current_user: CurrentUser, document_service: Depe
         500: {'description': 'Internal server error'}
     }
 )
-def create_task(payload: DocumentCreate, current_user: CurrentUser, document_service: DependsDocumentService) -> ApiResponse:
+async def create_task(payload: DocumentCreate, current_user: CurrentUser, document_service: DependsDocumentService) -> ApiResponse:
     try:
-        task_id = document_service.create_document(current_user.id, payload)
+        task_id = await document_service.create_document(current_user.id, payload)
         return DocumentResponse(
             message=f'DocumentCollection-{task_id} created successfully'
         )
@@ -144,9 +188,9 @@ def create_task(payload: DocumentCreate, current_user: CurrentUser, document_ser
         500: {'description': 'Internal server error'}
     }
 )
-def update_task(document_id: int, payload: DocumentUpdate, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentResponse:
+async def update_task(document_id: int, payload: DocumentUpdate, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentResponse:
     try:
-        updated_task = document_service.update_document(user_id=current_user.id, document_id=document_id, doc_col_data=payload)
+        updated_task = await document_service.update_document(user_id=current_user.id, document_id=document_id, doc_col_data=payload)
 
         if not updated_task:
             raise HTTPException(
@@ -154,7 +198,10 @@ def update_task(document_id: int, payload: DocumentUpdate, current_user: Current
                 detail=f'Document with ID {document_id} not found'
             )
 
-        return DocumentResponse(message=f'DocumentCollection-{document_id} updated successfully')
+        return DocumentResponse(
+            message=f'DocumentCollection-{document_id} updated successfully',
+            data=updated_task
+        )
     except HTTPException:
         raise
     except SQLAlchemyError as err:
@@ -181,9 +228,9 @@ def update_task(document_id: int, payload: DocumentUpdate, current_user: Current
         500: {'description': 'Internal server error'}
     }
 )
-def delete_task(document_id: int, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentResponse:
+async def delete_task(document_id: int, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentResponse:
     try:
-        deleted = document_service.delete_collection(current_user.id, document_id)
+        deleted = await document_service.delete_collection(current_user.id, document_id)
 
         if not deleted:
             raise HTTPException(
@@ -208,3 +255,119 @@ def delete_task(document_id: int, current_user: CurrentUser, document_service: D
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail='An unexpected error occurred'
         ) from err
+
+
+@router.post(
+    '/batch',
+    response_model=DocumentBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary='Create documents in bulk',
+    description='Create every document in one transaction; results follow the order of items',
+    responses={
+        201: {
+            'description': 'Documents created',
+            'model': DocumentBatchResponse
+        },
+        422: {'description': 'Empty or oversized batch'},
+        500: {'description': 'Internal server error'}
+    }
+)
+async def create_tasks(payload: DocumentBatchCreate, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentBatchResponse:
+    try:
+        documents = await document_service.create_documents(current_user.id, payload.items)
+
+        return DocumentBatchResponse(
+            message=f'{len(documents)} collections created successfully',
+            data=[DocumentBatchResult(id=document.id, status='created', data=document) for document in documents]
+        )
+    except SQLAlchemyError as err:
+        logger.error("document_collection batch creation failed", error=err, error_type="database error", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='Database error while creating collections'
+        ) from err
+    except Exception as err:
+        logger.error("document_collection batch creation failed", error=err, error_type="unexpected error", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='An unexpected error occurred'
+        ) from err
+
+
+@router.patch(
+    '/batch',
+    response_model=DocumentBatchResponse,
+    summary='Update documents in bulk',
+    description='Apply every update in one transaction; ids that are not found are reported per item',
+    responses={
+        200: {
+            'description': 'Documents updated',
+            'model': DocumentBatchResponse
+        },
+        422: {'description': 'Empty or oversized batch'},
+        500: {'description': 'Internal server error'}
+    }
+)
+async def update_tasks(payload: DocumentBatchUpdate, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentBatchResponse:
+    try:
+        updated = await document_service.update_documents(current_user.id, payload.items)
+
+        return DocumentBatchResponse(
+            message=f'{len(updated)} collections updated successfully',
+            data=[
+                DocumentBatchResult(id=item.id, status='updated', data=updated[item.id])
+                if item.id in updated else DocumentBatchResult(id=item.id, status='not_found')
+                for item in payload.items
+            ]
+        )
+    except SQLAlchemyError as err:
+        logger.error("document_collection batch update failed", error=err, error_type="database error", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='Database error while updating collections'
+        ) from err
+    except Exception as err:
+        logger.error("document_collection batch update failed", error=err, error_type="unexpected error", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='An unexpected error occurred'
+        ) from err
+
+
+@router.post(
+    '/batch/delete',
+    response_model=DocumentBatchResponse,
+    summary='Delete documents in bulk',
+    description='Delete every listed document in one statement; ids that are not found are reported per item',
+    responses={
+        200: {
+            'description': 'Documents deleted',
+            'model': DocumentBatchResponse
+        },
+        422: {'description': 'Empty or oversized batch'},
+        500: {'description': 'Internal server error'}
+    }
+)
+async def delete_tasks(payload: DocumentBatchDelete, current_user: CurrentUser, document_service: DependsDocumentService) -> DocumentBatchResponse:
+    try:
+        deleted = await document_service.delete_documents(current_user.id, payload.ids)
+
+        return DocumentBatchResponse(
+            message=f'{len(deleted)} collections deleted successfully',
+            data=[
+                DocumentBatchResult(id=document_id, status='deleted' if document_id in deleted else 'not_found')
+                for document_id in payload.ids
+            ]
+        )
+    except SQLAlchemyError as err:
+        logger.error("document_collection batch deletion failed", error=err, error_type="database error", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='Database error while deleting collections'
+        ) from err
+    except Exception as err:
+        logger.error("document_collection batch deletion failed", error=err, error_type="unexpected error", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail='An unexpected error occurred'
+        ) from err
@@ -1,7 +1,9 @@
 from datetime import datetime, date
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
+from app.config import settings
+
 
 class DocumentBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=100, description="Collection title")
@@ -21,10 +23,35 @@ class DocumentRead(DocumentBase):
     id: int = Field(..., gt=0, description="Collection ID")
     created_at: datetime = Field(..., description="Collection creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Collection last update timestamp")
+    file_count: int = Field(0, description="Number of files in the collection")
+    total_bytes: int = Field(0, description="Combined size of the collection's files in bytes")
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class DocumentBatchUpdateItem(DocumentUpdate):
+    id: int = Field(..., gt=0, description="Collection ID")
+
+
+class DocumentBatchCreate(BaseModel):
+    items: List[DocumentCreate] = Field(..., min_length=1, max_length=settings.document_batch_max_items)
+
+
+class DocumentBatchUpdate(BaseModel):
+    items: List[DocumentBatchUpdateItem] = Field(..., min_length=1, max_length=settings.document_batch_max_items)
+
+
+class DocumentBatchDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.document_batch_max_items)
+
+
+class DocumentBatchResult(BaseModel):
+    """Outcome of one batch item, in request order."""
+    id: int = Field(..., description="Collection ID")
+    status: Literal["created", "updated", "deleted", "not_found"] = Field(..., description="Item outcome")
+    data: Optional[DocumentRead] = None
+
+
 class ApiResponse(BaseModel):
     """API response wrapper."""
     message: str = Field(..., description="Response message")
@@ -36,8 +63,14 @@ class ApiResponse(BaseModel):
 class DocumentListResponse(ApiResponse):
     """Response schema for taskapp list endpoints."""
     data: Optional[List[DocumentRead]] = None
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
 
 
 class DocumentResponse(ApiResponse):
     """Response schema for single taskapp endpoints."""
-    data: Optional[DocumentRead] = None
\ No newline at end of file
+    data: Optional[DocumentRead] = None
+
+
+class DocumentBatchResponse(ApiResponse):
+    """Response schema for taskapp batch endpoints."""
+    data: List[DocumentBatchResult] = Field(default_factory=list)
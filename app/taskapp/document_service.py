@@ -1,32 +1,119 @@
+from sqlalchemy import delete, func, insert, literal_column, or_, select, update
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
 
+from app.database.pagination import keyset_paginate, split_page
 from app.logger import get_logger
 from app.taskapp.entities import DocumentCollection
-from app.taskapp.document_model import DocumentRead, DocumentCreate, DocumentUpdate
+from app.userapp.list_versions import ListVersionService
+from app.taskapp.document_model import DocumentRead, DocumentCreate, DocumentUpdate, DocumentBatchUpdateItem
 
 logger = get_logger(__name__)
 
+# ?sort= values, a leading "-" sorts descending
+SORT_COLUMNS = {"created_at": DocumentCollection.created_at, "title": DocumentCollection.title}
+
+# text search configuration of ix_document_collection_search; the index only serves queries whose
+# expression renders exactly like search_vector()
+SEARCH_CONFIG = "simple"
+
+
+def search_vector():
+    """
+    to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+    """
+    empty = literal_column("''")
+    text = (
+        func.coalesce(DocumentCollection.title, empty)
+        .op("||")(literal_column("' '"))
+        .op("||")(func.coalesce(DocumentCollection.description, empty))
+    )
+    return func.to_tsvector(literal_column(f"'{SEARCH_CONFIG}'"), text)
+
+
+def like_pattern(q: str) -> str:
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
 
 class DocumentService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
+        self.list_versions = ListVersionService(db)
+
+    async def list_version(self, user_id: int) -> int:
+        return (await self.list_versions.get(user_id)).documents
 
-    def _get_document_instance(self, user_id: int, collection_id: int) -> DocumentCollection | None:
-        return (
-            self.db.query(DocumentCollection)
+    async def _get_document_instance(self, user_id: int, collection_id: int) -> DocumentCollection | None:
+        return await self.db.scalar(
+            select(DocumentCollection)
             .filter_by(id=collection_id, user_id=user_id)
-            .first()
         )
 
-    def fetch_documents(self, user_id: int) -> List[DocumentRead]:
+    def _search_clause(self, q: str):
+        """
+        postgres: full-text match (GIN over search_vector) or substring match (pg_trgm GIN on title and
+        description), so both whole words in any order and fragments are found through an index.
+        other dialects only get the substring match
+        """
+        pattern = like_pattern(q)
+        substring = or_(
+            DocumentCollection.title.ilike(pattern, escape="\\"),
+            DocumentCollection.description.ilike(pattern, escape="\\")
+        )
+        if self.db.get_bind().dialect.name != "postgresql":
+            return substring
+
+        full_text = search_vector().op("@@")(func.websearch_to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), q))
+        return or_(full_text, substring)
+
+    async def fetch_documents(
+            self,
+            user_id: int,
+            limit: int,
+            cursor: Optional[str] = None,
+            q: Optional[str] = None,
+            created_after: Optional[datetime] = None,
+            created_before: Optional[datetime] = None,
+            sort: str = "created_at"
+    ) -> tuple[List[DocumentRead], Optional[str]]:
+        """
+        :param created_after: inclusive lower bound on created_at
+        :param created_before: exclusive upper bound on created_at
+        :param sort: a SORT_COLUMNS key, "-" prefixed for descending; cursors are only valid for the sort
+        and filters they were issued with
+        """
         try:
-            documents = self.db.query(DocumentCollection).filter_by(
-                user_id=user_id
-            ).all()
+            sort_key = sort.removeprefix("-")
+            sort_col = SORT_COLUMNS[sort_key]
+
+            query = select(DocumentCollection).filter_by(user_id=user_id)
+            if q and q.strip():
+                query = query.where(self._search_clause(q.strip()))
+            if created_after is not None:
+                query = query.where(DocumentCollection.created_at >= as_utc(created_after))
+            if created_before is not None:
+                query = query.where(DocumentCollection.created_at < as_utc(created_before))
+
+            query = keyset_paginate(
+                query,
+                sort_col,
+                DocumentCollection.id,
+                limit=limit,
+                cursor=cursor,
+                descending=sort.startswith("-")
+            )
+            documents, next_cursor = split_page((await self.db.scalars(query)).all(), limit, sort)
 
-            return [DocumentRead.model_validate(document) for document in documents]
+            return [DocumentRead.model_validate(document) for document in documents], next_cursor
+        except ValueError:
+            raise
         except SQLAlchemyError as sql_err:
             logger.error("task retrival failed", error_type="database error", error=sql_err, exc_info=True)
             raise sql_err
@@ -34,9 +121,9 @@ class DocumentService:
             logger.error("task retrival failed", error_type="unexpected error", error=e, exc_info=True)
             raise SQLAlchemyError(f"Unexpected database error: {str(e)}") from e
 
-    def fetch_documents_by_id(self, user_id: int, document_id: int) -> DocumentRead | None:
+    async def fetch_documents_by_id(self, user_id: int, document_id: int) -> DocumentRead | None:
         try:
-            document = self._get_document_instance(user_id, document_id)
+            document = await self._get_document_instance(user_id, document_id)
 
             if not document:
                 logger.warning("task not found", document_id=document_id)
@@ -50,59 +137,159 @@ class DocumentService:
             logger.error("document retrival failed", type="unexpected error", document_id=document_id, error=e, exc_info=True)
             raise SQLAlchemyError(f"Unexpected database error: {str(e)}") from e
 
-    def create_document(self, user_id: int, doc_col_data: DocumentCreate) -> int:
+    async def create_document(self, user_id: int, doc_col_data: DocumentCreate) -> int:
         try:
             new_doc_col = DocumentCollection(**doc_col_data.model_dump(), user_id=user_id)
             self.db.add(new_doc_col)
-            self.db.commit()
-            self.db.refresh(new_doc_col)
+            await self.list_versions.bump(user_id, documents=True)
+            await self.db.commit()
+            await self.db.refresh(new_doc_col)
 
             return new_doc_col.id
         except SQLAlchemyError as sql_err:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error("document collection creation failed", type="database error", error=sql_err, exc_info=True)
             raise SQLAlchemyError(f"Database error while creating task: {sql_err}") from sql_err
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error("document collection creation failed", type="unexpected error", error=e, exc_info=True)
             raise SQLAlchemyError(f"Unexpected database error: {str(e)}") from e
 
-    def update_document(self, user_id: int, document_id: int, doc_col_data: DocumentUpdate) -> int | None:
+    async def update_document(self, user_id: int, document_id: int, doc_col_data: DocumentUpdate) -> DocumentRead | None:
+        """
+        single UPDATE ... RETURNING, the fresh row comes back with the write
+        """
         try:
-            document = self._get_document_instance(user_id, document_id)
+            values = doc_col_data.model_dump(exclude_unset=True)
+            if not values:
+                return await self.fetch_documents_by_id(user_id, document_id)
+
+            document = await self.db.scalar(
+                update(DocumentCollection)
+                .where(DocumentCollection.id == document_id, DocumentCollection.user_id == user_id)
+                .values(**values)
+                .returning(DocumentCollection)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
 
             if not document:
+                await self.db.rollback()
                 logger.warning("document not found for update", document_id=document_id)
                 return None
 
-            for key, value in doc_col_data.model_dump(exclude_unset=True).items():
-                setattr(document, key, value)
-
-            self.db.commit()
-            self.db.refresh(document)
-
-            return document.id
+            updated = DocumentRead.model_validate(document)
+            await self.list_versions.bump(user_id, documents=True)
+            await self.db.commit()
+            return updated
         except SQLAlchemyError as sql_err:
+            await self.db.rollback()
             logger.error("document update failed", type=sql_err, error=sql_err, document_id=document_id, exc_info=True)
             raise sql_err
         except Exception as e:
             logger.error("document update failed", type="unexpected error", error=e, document_id=document_id, exc_info=True)
             raise SQLAlchemyError(f"Unexpected database error: {str(e)}") from e
 
-    def delete_collection(self, user_id: int, collection_id: int) -> bool:
+    async def delete_collection(self, user_id: int, collection_id: int) -> bool:
         try:
-            collection = self._get_document_instance(user_id, collection_id)
+            deleted_id = await self.db.scalar(
+                delete(DocumentCollection)
+                .where(DocumentCollection.id == collection_id, DocumentCollection.user_id == user_id)
+                .returning(DocumentCollection.id)
+                .execution_options(synchronize_session=False)
+            )
 
-            if not collection:
+            if deleted_id is None:
+                await self.db.rollback()
                 logger.warning("collection deletion failed", error="collection not found", document_id=collection_id)
                 return False
 
-            self.db.delete(collection)
-            self.db.commit()
+            # the document's files lose their document_id
+            await self.list_versions.bump(user_id, documents=True, files=True)
+            await self.db.commit()
             return True
         except SQLAlchemyError as sql_err:
+            await self.db.rollback()
             logger.error("collection deletion failed", type="database error", document_id=collection_id, error=sql_err, exc_info=True)
             raise sql_err
         except Exception as e:
             logger.error("collection deletion failed", type="unexpected error", document_id=collection_id, error=e, exc_info=True)
-            raise SQLAlchemyError(f"Unexpected database error: {str(e)}") from e
\ No newline at end of file
+            raise SQLAlchemyError(f"Unexpected database error: {str(e)}") from e
+
+    async def create_documents(self, user_id: int, items: List[DocumentCreate]) -> List[DocumentRead]:
+        """
+        one multi-row INSERT ... RETURNING, results come back in item order
+        """
+        try:
+            documents = await self.db.scalars(
+                insert(DocumentCollection).returning(DocumentCollection, sort_by_parameter_order=True),
+                [{**item.model_dump(), "user_id": user_id} for item in items]
+            )
+            created = [DocumentRead.model_validate(document) for document in documents]
+            await self.list_versions.bump(user_id, documents=True)
+            await self.db.commit()
+
+            logger.info("document batch created", count=len(created))
+            return created
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("document batch creation failed", type="database error", error=sql_err, exc_info=True)
+            raise sql_err
+
+    async def update_documents(self, user_id: int, items: List[DocumentBatchUpdateItem]) -> Dict[int, DocumentRead]:
+        """
+        lock the caller's documents among the item ids, apply every change as one executemany UPDATE
+        by primary key and read the fresh rows back, all in one transaction
+        :return: id -> updated document; ids missing from it were not found
+        """
+        try:
+            owned: Set[int] = set((await self.db.scalars(
+                select(DocumentCollection.id)
+                .where(DocumentCollection.id.in_({item.id for item in items}), DocumentCollection.user_id == user_id)
+                .with_for_update()
+            )).all())
+
+            changes = [
+                {"id": item.id, **item.model_dump(exclude_unset=True, exclude={"id"})}
+                for item in items if item.id in owned
+            ]
+            changes = [change for change in changes if len(change) > 1]
+            if changes:
+                await self.db.execute(update(DocumentCollection), changes)
+
+            documents = await self.db.scalars(
+                select(DocumentCollection)
+                .where(DocumentCollection.id.in_(owned))
+                .execution_options(populate_existing=True)
+            )
+            updated = {document.id: DocumentRead.model_validate(document) for document in documents}
+            await self.list_versions.bump(user_id, documents=bool(changes))
+            await self.db.commit()
+
+            logger.info("document batch updated", count=len(changes), not_found=sum(item.id not in owned for item in items))
+            return updated
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("document batch update failed", type="database error", error=sql_err, exc_info=True)
+            raise sql_err
+
+    async def delete_documents(self, user_id: int, ids: List[int]) -> Set[int]:
+        """
+        one DELETE ... RETURNING id
+        :return: ids that were deleted
+        """
+        try:
+            deleted = set((await self.db.scalars(
+                delete(DocumentCollection)
+                .where(DocumentCollection.id.in_(set(ids)), DocumentCollection.user_id == user_id)
+                .returning(DocumentCollection.id)
+                .execution_options(synchronize_session=False)
+            )).all())
+            await self.list_versions.bump(user_id, documents=bool(deleted), files=bool(deleted))
+            await self.db.commit()
+
+            logger.info("document batch deleted", count=len(deleted))
+            return deleted
+        except SQLAlchemyError as sql_err:
+            await self.db.rollback()
+            logger.error("document batch deletion failed", type="database error", error=sql_err, exc_info=True)
+            raise sql_err
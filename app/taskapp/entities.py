@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, DateTime, func, Text, ForeignKey
+from sqlalchemy import BigInteger, Integer, String, DateTime, func, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 
 from app.database.core import Base
@@ -6,6 +6,11 @@ from app.database.core import Base
 
 class DocumentCollection(Base):
     __tablename__ = 'document_collection'
+    __table_args__ = (
+        Index('ix_document_collection_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('ix_document_collection_user_id_title_id', 'user_id', 'title', 'id'),
+        # postgres only search indexes (full-text and pg_trgm GIN) live in migration f3a8d5b1c246
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -13,6 +18,9 @@ class DocumentCollection(Base):
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey('document_users.id', ondelete="SET NULL"), nullable=True)
+    # maintained with the active document_files rows, see DocumentStatsService
+    file_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    total_bytes: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
 
     owner = relationship('DocumentUser', back_populates='documents')
     files = relationship("DocumentCollectionFile", back_populates="document", passive_deletes=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, DateTime, func
+from sqlalchemy import BigInteger, Integer, String, DateTime, func
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from datetime import datetime
 
@@ -14,6 +14,9 @@ class DocumentUser(Base):
     hashed_pwd: Mapped[str] = mapped_column(String(250), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), onupdate=func.now(),  nullable=True)
+    # bumped by every write to the user's document / file lists, see ListVersionService
+    documents_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
+    files_version: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0", nullable=False)
 
     documents = relationship('DocumentCollection', back_populates='owner')
     files = relationship('DocumentCollectionFile', back_populates="owner")
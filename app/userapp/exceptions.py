@@ -52,4 +52,12 @@ class AuthenticationException(UserOperationException):
     Authentication process failed
     """
     def __init__(self, message: str = "Authentication failed"):
-        super().__init__(message, status_code=status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        super().__init__(message, status_code=status.HTTP_401_UNAUTHORIZED)
+
+
+class ServiceBusyException(UserOperationException):
+    """
+    Password hashing capacity exhausted, client should retry later
+    """
+    def __init__(self, message: str = "Service busy, please retry shortly"):
+        super().__init__(message, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
@@ -0,0 +1,45 @@
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.userapp.entities import DocumentUser
+
+
+class ListVersions(NamedTuple):
+    documents: int
+    files: int
+
+
+class ListVersionService:
+    """
+    per-user change markers for the document and file lists. bump runs in the writer's transaction, as its
+    last statement so the user row is locked last, and the version moves exactly when the change commits
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def bump(self, *user_ids: Optional[int], documents: bool = False, files: bool = False) -> None:
+        values = {}
+        if documents:
+            values["documents_version"] = DocumentUser.documents_version + 1
+        if files:
+            values["files_version"] = DocumentUser.files_version + 1
+
+        user_ids = {user_id for user_id in user_ids if user_id is not None}
+        if not values or not user_ids:
+            return
+
+        await self.db.execute(
+            update(DocumentUser)
+            .where(DocumentUser.id.in_(user_ids))
+            # markers are bookkeeping, not a change of the user
+            .values(**values, updated_at=DocumentUser.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def get(self, user_id: int) -> ListVersions:
+        row = (await self.db.execute(
+            select(DocumentUser.documents_version, DocumentUser.files_version).where(DocumentUser.id == user_id)
+        )).one_or_none()
+        return ListVersions(*row) if row else ListVersions(0, 0)
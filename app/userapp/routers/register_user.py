@@ -28,9 +28,9 @@ logger = get_logger(__name__)
     }
 )
 @limiter.limit(f"{settings.register_limit_per_hour}/hour")
-def register_user(request: Request, payload: UserRegister, user_service: DependsUserService) -> ApiResponse:
+async def register_user(request: Request, payload: UserRegister, user_service: DependsUserService) -> ApiResponse:
     try:
-        user = user_service.create_registered_user(payload)
+        user = await user_service.create_registered_user(payload)
         return ApiResponse(
             message=f'User-{user.id} created successfully',
         )
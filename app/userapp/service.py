@@ -1,13 +1,18 @@
+from concurrent.futures.process import BrokenProcessPool
+
 from pydantic import EmailStr
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.userapp.entities import DocumentUser
 from app.auth.service import AuthenticationService
+from app.auth.password_executor import PasswordExecutorBusyError
+from app.auth.user_cache import user_cache
 from app.logger import get_logger
 from app.userapp.model import UserRegister
 from app.userapp.exceptions import DatabaseOperationException, UserDuplicateException, UserCreationException, \
-    InvalidCredentialsException, UserNotFoundException
+    InvalidCredentialsException, UserNotFoundException, ServiceBusyException
 
 logger = get_logger(__name__)
 
@@ -16,32 +21,45 @@ class UserService:
     """
     service class for user operations
     """
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def __fetch_user_by_email(self, email: EmailStr) -> DocumentUser | None:
+    async def __fetch_user_by_email(self, email: EmailStr) -> DocumentUser | None:
         try:
-            user = self.db.query(DocumentUser).filter_by(email=email).first()
+            user = await self.db.scalar(select(DocumentUser).filter_by(email=email))
         except (SQLAlchemyError, OperationalError) as db_err:
             logger.error("user retrieval failed", email=email, error=db_err, exc_info=True)
             raise DatabaseOperationException(f"Failed to fetch user: {db_err}")
         else:
             return user
 
+    async def __hash_pwd(self, password: str) -> str:
+        try:
+            return await AuthenticationService.hash_pwd(password)
+        except (PasswordExecutorBusyError, BrokenProcessPool) as busy_err:
+            # a broken pool is replaced on the next call, a retry goes through
+            raise ServiceBusyException() from busy_err
+
+    async def __verify_pwd(self, hashed_pwd: str, password: str) -> tuple[bool, bool]:
+        try:
+            return await AuthenticationService.verify_pwd(hashed_pwd, password)
+        except (PasswordExecutorBusyError, BrokenProcessPool) as busy_err:
+            raise ServiceBusyException() from busy_err
+
     def __get_login_data(self, user_id: int) -> tuple[str, str]:
         return AuthenticationService.generate_access_token(user_id), AuthenticationService.generate_refresh_token(user_id)
 
-    def create_registered_user(self, user_data: UserRegister) -> DocumentUser:
+    async def create_registered_user(self, user_data: UserRegister) -> DocumentUser:
         """
         Create a new user in the database
         """
-        existing_user = self.__fetch_user_by_email(user_data.email)
+        existing_user = await self.__fetch_user_by_email(user_data.email)
 
         if existing_user:
             logger.warning("user already exists", email=user_data.email)
             raise UserDuplicateException(f'user with email-{user_data.email} already exists')
 
-        hashed_pwd = AuthenticationService.hash_pwd(user_data.password)
+        hashed_pwd = await self.__hash_pwd(user_data.password)
 
         try:
             new_user = DocumentUser(
@@ -51,35 +69,46 @@ class UserService:
             )
 
             self.db.add(new_user)
-            self.db.commit()
-            self.db.refresh(new_user)
+            await self.db.commit()
+            await self.db.refresh(new_user)
 
             logger.info('user creation successful', user_id=new_user.id)
             return new_user
         except (OperationalError, SQLAlchemyError) as db_err:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error("user creation failed", error=db_err, exc_info=True)
             raise UserCreationException(f"Database error during user creation: {str(db_err)}") from db_err
 
-    def login_user(self, email: EmailStr, password: str) -> tuple[str, str]:
-        user: DocumentUser = self.__fetch_user_by_email(email)
+    async def login_user(self, email: EmailStr, password: str) -> tuple[str, str]:
+        user: DocumentUser = await self.__fetch_user_by_email(email)
 
         if not user:
             logger.warning("user not registered", email=email)
             raise UserNotFoundException(f"user-{email} not registered")
 
-        is_valid, needs_rehash = AuthenticationService.verify_pwd(
-            user.hashed_pwd,
-            password
-        )
+        is_valid, needs_rehash = await self.__verify_pwd(user.hashed_pwd, password)
         if not is_valid:
             logger.warning(f'Invalid login attempt for user {email}')
             raise InvalidCredentialsException("invalid credentials")
 
         if needs_rehash:
-            logger.info(f"Rehashing password for user {user.id}")
-            user.hashed_pwd = AuthenticationService.hash_pwd(password)
-            self.db.commit()
-            self.db.refresh(user)
+            await self.__rehash_pwd(user, password)
 
-        return self.__get_login_data(user.id)
\ No newline at end of file
+        return self.__get_login_data(user.id)
+
+    async def __rehash_pwd(self, user: DocumentUser, password: str) -> None:
+        """
+        upgrade the stored hash; the password is already verified, so no capacity for it only postpones
+        the rehash to a later login
+        """
+        try:
+            new_hash = await self.__hash_pwd(password)
+        except ServiceBusyException:
+            logger.warning("password rehash skipped, hashing busy", user_id=user.id)
+            return
+
+        logger.info(f"Rehashing password for user {user.id}")
+        user.hashed_pwd = new_hash
+        await self.db.commit()
+        await self.db.refresh(user)
+        user_cache.invalidate(user.id)
\ No newline at end of file
@@ -3,32 +3,61 @@ document.addEventListener('DOMContentLoaded', () => {
     const taskList = document.getElementById('task-list');
     const searchInput = document.getElementById('search-input');
     const statusFilter = document.getElementById('status-filter');
+    const loadMoreButton = document.getElementById('load-more');
 
-    let allTasks = []; // store task for filter
+    const PAGE_SIZE = 50;
+
+    let loadedTasks = []; // pages loaded so far for the current search, status is filtered here
+    let nextCursor = null; // null once the last page is loaded
+    let searchTimer = null;
+    let latestFetch = 0; // only the newest search may render
 
     class TaskManager {
-        async fetchTasks() {
+        // one page per call: a new search starts over, loadMore continues from next_cursor
+        async fetchTasks(append = false) {
+            const fetchId = ++latestFetch;
             UIUtils.showLoading();
+            loadMoreButton.disabled = true;
 
             try {
-                const response = await apiClient.get('/tasks');
+                const params = new URLSearchParams({limit: String(PAGE_SIZE)});
+                const searchText = searchInput.value.trim().slice(0, 100);
+                if (searchText) params.set('q', searchText);
+                if (append && nextCursor) params.set('cursor', nextCursor);
+
+                const response = await apiClient.get(`/tasks/?${params}`);
                 const data = await apiClient.handleResponse(response);
 
-                allTasks = data.data || [];
+                if (fetchId !== latestFetch) return;
+
+                loadedTasks = append ? loadedTasks.concat(data.data || []) : (data.data || []);
+                nextCursor = data.next_cursor;
                 this.hideAllFeedback();
-                this.renderTasks(allTasks);
+                this.applyFilters();
             } catch (err) {
+                if (fetchId !== latestFetch) return;
+
                 this.showError('Error loading tasks. Please try again later.');
-                UIUtils.hideElement('task-table');
-                UIUtils.hideElement('empty-state');
+                if (!append) {
+                    UIUtils.hideElement('task-table');
+                    UIUtils.hideElement('empty-state');
+                }
                 console.error('Fetch tasks error: ', err);
             } finally {
-                UIUtils.hideLoading();
+                if (fetchId === latestFetch) {
+                    UIUtils.hideLoading();
+                    loadMoreButton.disabled = false;
+                }
             }
         }
 
+        loadMore() {
+            if (nextCursor) this.fetchTasks(true);
+        }
+
         renderTasks(tasks) {
             taskList.innerHTML = "";
+            loadMoreButton.classList.toggle('d-none', !nextCursor);
 
             if (!tasks.length) {
                 taskTable.classList.add('d-none');
@@ -133,7 +162,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 const response = await apiClient.delete(`/tasks/${taskId}`);
                 await apiClient.handleResponse(response);
 
-                allTasks = allTasks.filter( task => task.id != taskId)
+                loadedTasks = loadedTasks.filter( task => task.id != taskId)
                 this.applyFilters();
             } catch (error) {
                 console.error('Delete error:', error);
@@ -144,14 +173,12 @@ document.addEventListener('DOMContentLoaded', () => {
             }
         }
 
+        // the list API has no completion state to filter on, status applies to the loaded pages
         applyFilters() {
-            const searchText = searchInput.value.toLowerCase();
             const statusValue = statusFilter.value;
 
-            const filtered = allTasks.filter(task => {
-                const matchesText = task.title.toLowerCase().includes(searchText) || (task.description && task.description.toLowerCase().includes(searchText));
-                const matchesStatus = statusValue === "" || (statusValue === 'pending' && !task.is_complete) || (statusValue === 'completed' && task.is_complete);
-                return matchesText && matchesStatus;
+            const filtered = loadedTasks.filter(task => {
+                return statusValue === "" || (statusValue === 'pending' && !task.is_complete) || (statusValue === 'completed' && task.is_complete);
             });
             this.renderTasks(filtered);
         }
@@ -179,8 +206,13 @@ document.addEventListener('DOMContentLoaded', () => {
     const taskManager = new TaskManager();
 
     // set up event listeners
-    searchInput.addEventListener('input', () => taskManager.applyFilters());
+    // search runs on the server, wait for a pause in typing before asking
+    searchInput.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => taskManager.fetchTasks(), 300);
+    });
     statusFilter.addEventListener('change', () => taskManager.applyFilters())
+    loadMoreButton.addEventListener('click', () => taskManager.loadMore());
 
     taskManager.fetchTasks();
 });
\ No newline at end of file
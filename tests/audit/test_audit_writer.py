@@ -0,0 +1,145 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import select, func, delete, insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.audit.entities import RequestAuditLog
+from app.audit.partitions import ensure_partitions, partition_name
+from app.audit.writer import MAX_BATCH_ROWS, AuditLogWriter
+
+
+def make_writer(db_engine, **overrides) -> AuditLogWriter:
+    options = dict(
+        batch_size=2,
+        flush_interval=60.0,
+        max_buffer=10,
+        retention_days=30,
+        premake_days=1,
+        maintenance_interval=3600.0
+    )
+    options.update(overrides)
+    return AuditLogWriter(db_engine, **options)
+
+
+@pytest.fixture
+async def clean_audit_table(db_engine):
+    async with db_engine.begin() as conn:
+        await conn.execute(delete(RequestAuditLog))
+    yield
+    async with db_engine.begin() as conn:
+        await conn.execute(delete(RequestAuditLog))
+
+
+async def count_rows(db_engine) -> int:
+    async with db_engine.connect() as conn:
+        return await conn.scalar(select(func.count()).select_from(RequestAuditLog))
+
+
+@pytest.mark.unit
+class TestAuditLogWriterBuffer:
+    def test_drops_when_buffer_full(self, db_engine):
+        writer = make_writer(db_engine, max_buffer=3)
+
+        for _ in range(5):
+            writer.record(method='GET', path='/api/tasks/', status_code=200, duration_ms=1.0)
+
+        assert writer.pending == 3
+        assert writer.dropped == 2
+
+    def test_batch_size_stays_below_parameter_limit(self, db_engine):
+        writer = make_writer(db_engine, batch_size=10000)
+
+        assert writer.batch_size == MAX_BATCH_ROWS
+        assert writer.batch_size * len(RequestAuditLog.__table__.columns) <= 32767
+
+
+class UnreachableEngine:
+    def begin(self):
+        raise OperationalError('INSERT INTO request_audit_log', {}, ConnectionError('connection refused'))
+
+
+@pytest.mark.unit
+class TestAuditLogWriterRequeue:
+    async def test_transient_failure_requeues_batch(self):
+        writer = make_writer(UnreachableEngine())
+        for i in range(3):
+            writer.record(method='GET', path=f'/api/files/{i}', status_code=200, duration_ms=1.0)
+
+        assert await writer.flush() is False
+
+        assert writer.pending == 3
+        assert [entry['path'] for entry in writer._buffer] == ['/api/files/0', '/api/files/1', '/api/files/2']
+        assert writer.failed == 0
+
+    async def test_requeue_bounded_by_max_buffer(self):
+        writer = make_writer(UnreachableEngine(), max_buffer=3)
+        for i in range(3):
+            writer.record(method='GET', path=f'/api/files/{i}', status_code=200, duration_ms=1.0)
+
+        await writer.flush()
+        # the freed slot was taken while the batch was in flight
+        writer.record(method='GET', path='/api/files/3', status_code=200, duration_ms=1.0)
+        await writer.flush()
+
+        assert writer.pending == 3
+        assert writer.dropped == 1
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures('clean_audit_table')
+class TestAuditLogWriterFlush:
+    async def test_flush_writes_one_batch(self, db_engine):
+        writer = make_writer(db_engine)
+        for i in range(3):
+            writer.record(method='POST', path=f'/api/tasks/{i}', status_code=201, duration_ms=2.5,
+                          user_id=7, request_payload={'title': 't'})
+
+        assert await writer.flush() is True
+
+        assert writer.written == 2
+        assert writer.pending == 1
+        assert await count_rows(db_engine) == 2
+
+    async def test_stop_drains_buffer(self, db_engine):
+        writer = make_writer(db_engine)
+        await writer.start()
+        for i in range(5):
+            writer.record(method='GET', path='/api/files/', status_code=200, duration_ms=1.0)
+
+        await writer.stop()
+
+        assert writer.pending == 0
+        assert await count_rows(db_engine) == 5
+
+    async def test_failed_batch_is_counted(self, db_engine):
+        writer = make_writer(db_engine)
+        writer.record(method='GET', path='/api/files/', status_code=200, duration_ms=1.0)
+        writer._buffer[0]['method'] = None
+
+        assert await writer.flush() is False
+        assert writer.failed == 1
+        assert writer.pending == 0
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures('clean_audit_table')
+class TestAuditLogPartitions:
+    async def test_rows_wait_in_default_partition(self, db_engine):
+        if db_engine.dialect.name != 'postgresql':
+            pytest.skip('partitions need postgres')
+
+        day = date(2099, 1, 1)
+        row = dict(created_at=datetime(2099, 1, 1, 12, tzinfo=timezone.utc), method='GET', path='/', duration_ms=1.0)
+        try:
+            async with db_engine.begin() as conn:
+                await conn.execute(insert(RequestAuditLog).values(row))
+                assert await conn.scalar(text('SELECT count(*) FROM request_audit_log_default')) == 1
+
+                assert await ensure_partitions(conn, day, 0) == [partition_name(day)]
+
+                assert await conn.scalar(text('SELECT count(*) FROM request_audit_log_default')) == 0
+                assert await conn.scalar(text(f'SELECT count(*) FROM {partition_name(day)}')) == 1
+        finally:
+            async with db_engine.begin() as conn:
+                await conn.execute(text(f'DROP TABLE IF EXISTS {partition_name(day)}'))
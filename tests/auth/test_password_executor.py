@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from argon2.exceptions import VerifyMismatchError
+
+from app.auth.password_executor import PasswordHashingExecutor, PasswordExecutorBusyError
+from app.auth.password_hashing import hash_password, verify_password
+from app.auth.service import AuthenticationService
+
+
+@pytest.mark.unit
+class TestPasswordHashing:
+    def test_hash_and_verify(self):
+        hashed = hash_password('Str0ng!Pass')
+
+        assert verify_password(hashed, 'Str0ng!Pass') == (True, False)
+        with pytest.raises(VerifyMismatchError):
+            verify_password(hashed, 'wrong')
+
+
+@pytest.mark.unit
+class TestPasswordHashingExecutor:
+    async def test_thread_fallback_runs_job(self):
+        executor = PasswordHashingExecutor(max_workers=0, max_pending=2)
+
+        assert await executor.run(pow, 2, 5) == 32
+        assert executor.pending == 0
+
+    async def test_rejects_when_queue_full(self):
+        executor = PasswordHashingExecutor(max_workers=0, max_pending=1)
+        release = asyncio.Event()
+
+        async def blocked():
+            executor._pending += 1
+            await release.wait()
+            executor._pending -= 1
+
+        holder = asyncio.create_task(blocked())
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordExecutorBusyError):
+            await executor.run(pow, 2, 5)
+
+        release.set()
+        await holder
+        assert await executor.run(pow, 2, 5) == 32
+
+
+@pytest.mark.unit
+class TestVerifyPwd:
+    @pytest.fixture
+    def thread_executor(self, mocker):
+        return mocker.patch('app.auth.service.password_executor', PasswordHashingExecutor(max_workers=0, max_pending=2))
+
+    async def test_wrong_password(self, thread_executor):
+        assert await AuthenticationService.verify_pwd(hash_password('Str0ng!Pass'), 'wrong') == (False, False)
+
+    async def test_malformed_hash(self, thread_executor):
+        assert await AuthenticationService.verify_pwd('not-an-argon2-hash', 'Str0ng!Pass') == (False, False)
+
+    async def test_broken_pool_is_not_a_failed_login(self, mocker):
+        mocker.patch('app.auth.service.password_executor.run', side_effect=BrokenProcessPool())
+
+        with pytest.raises(BrokenProcessPool):
+            await AuthenticationService.verify_pwd(hash_password('Str0ng!Pass'), 'Str0ng!Pass')
@@ -0,0 +1,58 @@
+import time
+import pytest
+
+from app.auth import service as auth_service
+from app.auth.service import AuthenticationService
+from app.auth.token_cache import TokenCache, token_cache
+
+
+@pytest.mark.unit
+class TestTokenCache:
+    def test_get_returns_cached_payload(self):
+        cache = TokenCache(maxsize=2)
+        payload = {'sub': '1', 'exp': time.time() + 60}
+        cache.put('token', payload)
+
+        assert cache.get('token') is payload
+
+    def test_expired_entry_is_evicted(self):
+        cache = TokenCache(maxsize=2)
+        cache.put('token', {'sub': '1', 'exp': time.time() - 1})
+
+        assert cache.get('token') is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.put('a', {'exp': exp})
+        cache.put('b', {'exp': exp})
+        cache.get('a')
+        cache.put('c', {'exp': exp})
+
+        assert cache.get('b') is None
+        assert cache.get('a') is not None
+        assert cache.get('c') is not None
+
+
+@pytest.mark.unit
+class TestVerifyTokenCaching:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        token_cache.clear()
+        yield
+        token_cache.clear()
+
+    def test_signature_verified_once(self, mocker):
+        token = AuthenticationService.generate_access_token(7)
+        decode_spy = mocker.spy(auth_service.jwt, 'decode')
+
+        assert AuthenticationService.get_user_from_token(token, 'access') == 7
+        assert AuthenticationService.get_user_from_token(token, 'access') == 7
+        assert decode_spy.call_count == 1
+
+    def test_cached_token_still_checks_type(self):
+        token = AuthenticationService.generate_access_token(7)
+        AuthenticationService.verify_token(token, 'access')
+
+        assert AuthenticationService.verify_token(token, 'refresh') is None
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from app.auth.dependencies import get_current_user
+from app.auth.service import AuthenticationService
+from app.auth.user_cache import UserCache, user_cache
+from app.userapp.model import UserOut
+
+
+@pytest.fixture
+def cached_user():
+    return UserOut(id=11, name='Cached User', email='cached@example.com')
+
+
+@pytest.mark.unit
+class TestUserCache:
+    def test_put_and_get(self, cached_user):
+        cache = UserCache(maxsize=10, ttl_seconds=60)
+        cache.put(cached_user)
+
+        assert cache.get(cached_user.id) == cached_user
+
+    def test_ttl_expiry(self, cached_user, mocker):
+        cache = UserCache(maxsize=10, ttl_seconds=5)
+        clock = mocker.patch('app.auth.user_cache.time.monotonic', return_value=100.0)
+        cache.put(cached_user)
+
+        clock.return_value = 106.0
+        assert cache.get(cached_user.id) is None
+
+    def test_invalidate(self, cached_user):
+        cache = UserCache(maxsize=10, ttl_seconds=60)
+        cache.put(cached_user)
+        cache.invalidate(cached_user.id)
+
+        assert cache.get(cached_user.id) is None
+
+
+@pytest.mark.unit
+class TestGetCurrentUserCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        user_cache.clear()
+        yield
+        user_cache.clear()
+
+    async def test_cached_user_skips_db(self, cached_user, mock_db_session):
+        user_cache.put(cached_user)
+        token = AuthenticationService.generate_access_token(cached_user.id)
+
+        result = await get_current_user(Mock(state=Mock(spec=[])), token, mock_db_session)
+
+        assert result == cached_user
+        mock_db_session.get.assert_not_called()
+
+    async def test_cache_miss_loads_and_caches(self, cached_user, mock_db_session):
+        mock_db_session.get = AsyncMock(return_value=cached_user)
+        token = AuthenticationService.generate_access_token(cached_user.id)
+
+        await get_current_user(Mock(state=Mock(spec=[])), token, mock_db_session)
+        await get_current_user(Mock(state=Mock(spec=[])), token, mock_db_session)
+
+        mock_db_session.get.assert_called_once()
+        assert user_cache.get(cached_user.id) == cached_user
@@ -1,61 +1,66 @@
 import os
 import pytest
-from typing import Generator
+import pytest_asyncio
+from typing import AsyncGenerator
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from unittest.mock import Mock
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool, StaticPool
+from unittest.mock import Mock, AsyncMock
 
 from app.database.core import Base, get_db
 from app.main import app
 
 # database fixture
 
-@pytest.fixture(scope='session')
-def db_engine():
+@pytest_asyncio.fixture(scope='session')
+async def db_engine():
     """
     create a test db engine
     """
     database_url = os.getenv('DATABASE_URL')
 
     if database_url and "postgresql" in database_url:
-        engine = create_engine(database_url)
+        # asyncpg connections belong to the loop that opened them and TestClient runs the app on its own
+        # loop, so no connection may be pooled across tests
+        engine = create_async_engine(database_url, poolclass=NullPool)
     else:
-        engine = create_engine(
-            'sqlite:///:memory:',
+        engine = create_async_engine(
+            'sqlite+aiosqlite:///:memory:',
             connect_args={"check_same_thread": False},
             poolclass=StaticPool
         )
 
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     yield engine
-    Base.metadata.drop_all(bind=engine)
-    engine.dispose()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
 
-@pytest.fixture(scope='function')
-def db_session(db_engine) -> Generator[Session, None, None]:
-    session_local = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+@pytest_asyncio.fixture(scope='function')
+async def db_session(db_engine) -> AsyncGenerator[AsyncSession, None]:
+    session_local = async_sessionmaker(bind=db_engine, autoflush=False, expire_on_commit=False)
     session = session_local()
 
     try:
         yield session
     finally:
-        session.rollback()
-        session.close()
+        await session.rollback()
+        await session.close()
 
 # fastapi client fixture
 
 @pytest.fixture(scope='function')
-def client(db_session):
+def client(db_engine):
     """
-    fastapi testclient with DB dependency override for each test with a clean client and isolated db session
+    fastapi testclient with DB dependency override for each test with a clean client. every request gets
+    its own session, opened on the loop TestClient runs the app on
     """
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    session_local = async_sessionmaker(bind=db_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_local() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
 
@@ -71,12 +76,14 @@ def mock_db_session():
     """
     mock db session for unit tests
     """
-    mock_session = Mock(spec=Session)
+    mock_session = Mock(spec=AsyncSession)
     mock_session.add = Mock()
-    mock_session.commit = Mock()
-    mock_session.rollback = Mock()
-    mock_session.refresh = Mock()
-    mock_session.query = Mock()
+    mock_session.commit = AsyncMock()
+    mock_session.rollback = AsyncMock()
+    mock_session.refresh = AsyncMock()
+    mock_session.scalar = AsyncMock()
+    mock_session.scalars = AsyncMock()
+    mock_session.get = AsyncMock()
 
     return mock_session
 
@@ -87,8 +94,8 @@ def mock_auth_service(mocker):
     """
     auth_mock = mocker.patch('app.userapp.service.AuthenticationService')
 
-    auth_mock.hash_pwd.return_value = 'hashed_password_123'
-    auth_mock.verify_pwd.return_value = (True, False)
+    auth_mock.hash_pwd = AsyncMock(return_value='hashed_password_123')
+    auth_mock.verify_pwd = AsyncMock(return_value=(True, False))
     auth_mock.generate_access_token.return_value = 'mock_access_token'
     auth_mock.generate_refresh_token.return_value = 'mock_refresh_token'
 
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.core import Base
+from app.taskapp.document_model import DocumentCreate
+from app.taskapp.document_service import DocumentService
+from app.userapp.entities import DocumentUser
+
+MIGRATED_SCHEMA = 'alembic_check'
+
+
+def upgrade_head(sync_conn) -> None:
+    config = Config()
+    config.set_main_option('script_location', str(Path(__file__).parents[2] / 'alembic'))
+    config.attributes['connection'] = sync_conn
+    command.upgrade(config, 'head')
+
+
+@pytest.fixture
+async def migrated_conn(db_engine):
+    """
+    a connection whose search_path resolves to a schema built by `alembic upgrade head`, not create_all
+    """
+    if db_engine.dialect.name != 'postgresql':
+        pytest.skip('migrations need postgres')
+
+    async with db_engine.connect() as conn:
+        await conn.execute(text(f'DROP SCHEMA IF EXISTS {MIGRATED_SCHEMA} CASCADE'))
+        await conn.execute(text(f'CREATE SCHEMA {MIGRATED_SCHEMA}'))
+        # public stays on the path for extension objects (pg_trgm operator classes)
+        await conn.execute(text(f'SET search_path TO {MIGRATED_SCHEMA}, public'))
+        await conn.run_sync(upgrade_head)
+        await conn.commit()
+        try:
+            yield conn
+        finally:
+            await conn.rollback()
+            await conn.execute(text(f'DROP SCHEMA {MIGRATED_SCHEMA} CASCADE'))
+            await conn.execute(text('RESET search_path'))
+            await conn.commit()
+
+
+@pytest.mark.integration
+class TestMigrations:
+    async def test_every_mapped_column_is_migrated(self, migrated_conn):
+        def migrated_columns(sync_conn):
+            inspector = inspect(sync_conn)
+            return {
+                table: {column['name']: column['nullable'] for column in inspector.get_columns(table, schema=MIGRATED_SCHEMA)}
+                for table in inspector.get_table_names(schema=MIGRATED_SCHEMA)
+            }
+
+        columns = await migrated_conn.run_sync(migrated_columns)
+
+        missing = {
+            f'{table.name}.{column.name}'
+            for table in Base.metadata.sorted_tables
+            for column in table.columns
+            if column.name not in columns.get(table.name, {})
+        }
+        # a NOT NULL column the model leaves empty fails its inserts
+        not_nullable = {
+            f'{table.name}.{column.name}'
+            for table in Base.metadata.sorted_tables
+            for column in table.columns
+            if column.nullable and columns.get(table.name, {}).get(column.name) is False
+        }
+        assert missing == set()
+        assert not_nullable == set()
+
+    async def test_document_write_on_migrated_schema(self, migrated_conn):
+        async with AsyncSession(bind=migrated_conn, expire_on_commit=False) as session:
+            user = DocumentUser(name='Migrated', email='migrated@example.com', hashed_pwd='x')
+            session.add(user)
+            await session.flush()
+
+            user_id = user.id
+            document_id = await DocumentService(db=session).create_document(user_id, DocumentCreate(title='first'))
+
+            assert document_id is not None
+            assert await session.scalar(select(DocumentUser.documents_version).filter_by(id=user_id)) == 1
@@ -0,0 +1,75 @@
+import pytest
+from faker import Faker
+from datetime import datetime, timezone, timedelta
+
+from app.database.pagination import encode_cursor, decode_cursor
+from app.taskapp.document_model import DocumentCreate
+from app.taskapp.document_service import DocumentService
+from app.taskapp.entities import DocumentCollection
+from app.userapp.entities import DocumentUser
+
+
+fake = Faker()
+
+
+@pytest.mark.unit
+class TestCursor:
+    def test_round_trip(self):
+        created_at = datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+
+        assert decode_cursor(encode_cursor('created_at', created_at, 42), 'created_at') == (created_at, 42)
+
+    def test_round_trip_string_key(self):
+        assert decode_cursor(encode_cursor('-title', 'Paris trip', 7), '-title', str) == ('Paris trip', 7)
+
+    def test_wrong_key_type(self):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor('title', 3, 7), 'title', str)
+
+    @pytest.mark.parametrize('cursor', ['', 'not-a-cursor', 'W10', '!!!'])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, 'created_at')
+
+    @pytest.mark.parametrize('issued, requested', [('created_at', '-created_at'), ('-title', 'title'), ('title', 'created_at')])
+    def test_cursor_of_other_sort(self, issued, requested):
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(issued, 'Paris trip', 7), requested, str)
+
+
+@pytest.mark.integration
+@pytest.mark.taskapp
+class TestDocumentPagination:
+    @pytest.fixture
+    async def owner(self, db_session):
+        user = DocumentUser(name='Page Owner', email=fake.email(), hashed_pwd='hashed_pwd_123')
+        db_session.add(user)
+        await db_session.commit()
+        return user
+
+    async def test_pages_cover_all_rows_once(self, db_session, owner):
+        service = DocumentService(db=db_session)
+        user_id = owner.id
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # two rows share a timestamp so the id tie-breaker is exercised
+        for i, offset in enumerate([0, 1, 1, 2, 3]):
+            db_session.add(DocumentCollection(title=f'doc-{i}', user_id=user_id, created_at=base + timedelta(seconds=offset)))
+        await db_session.commit()
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = await service.fetch_documents(user_id=user_id, limit=2, cursor=cursor)
+            seen.extend(doc.title for doc in page)
+            if cursor is None:
+                break
+
+        assert seen == [f'doc-{i}' for i in range(5)]
+
+    async def test_last_page_has_no_cursor(self, db_session, owner):
+        service = DocumentService(db=db_session)
+        await service.create_document(owner.id, DocumentCreate(title='only'))
+
+        page, cursor = await service.fetch_documents(user_id=owner.id, limit=10)
+
+        assert len(page) == 1
+        assert cursor is None
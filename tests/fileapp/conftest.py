@@ -0,0 +1,30 @@
+import io
+import uuid
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.fileapp.services.upload_service import FileUploadService
+from app.userapp.entities import DocumentUser
+
+
+@pytest.fixture
+async def owner(db_session):
+    user = DocumentUser(name='File Owner', email=f'{uuid.uuid4().hex}@example.com', hashed_pwd='hashed_pwd_123')
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+@pytest.fixture
+def upload_service(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'upload_dir', tmp_path)
+    return FileUploadService(db=db_session)
+
+
+@pytest.fixture
+def make_upload():
+    def _make_upload(content: bytes, filename: str = 'notes.txt') -> UploadFile:
+        return UploadFile(file=io.BytesIO(content), filename=filename)
+    return _make_upload
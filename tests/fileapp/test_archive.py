@@ -0,0 +1,70 @@
+import io
+import uuid
+import zipfile
+from datetime import datetime, timezone
+
+import pytest
+
+from app.fileapp.exceptions import FileNotFoundException
+from app.fileapp.services.archive import ArchiveEntry, compress_type, unique_names, zip_stream
+from app.fileapp.services.base_service import FileService
+from app.taskapp.entities import DocumentCollection
+
+
+def entry(tmp_path, name: str, content: bytes, mime_type: str = 'text/plain') -> ArchiveEntry:
+    path = tmp_path / uuid.uuid4().hex
+    path.write_bytes(content)
+    return ArchiveEntry(name=name, path=path, size=len(content), mime_type=mime_type, modified=datetime.now(timezone.utc))
+
+
+@pytest.mark.unit
+@pytest.mark.fileapp
+class TestZipStream:
+    def test_unique_names(self):
+        assert unique_names(['a.txt', 'A.txt', 'dir/b.csv', 'a.txt']) == ['a.txt', 'A (2).txt', 'b.csv', 'a (3).txt']
+
+    def test_compressed_types_are_stored(self):
+        assert compress_type('image/png') == zipfile.ZIP_STORED
+        assert compress_type('application/pdf') == zipfile.ZIP_STORED
+        assert compress_type('text/csv') == zipfile.ZIP_DEFLATED
+
+    def test_archive_round_trip(self, tmp_path):
+        text = b'hello,world\n' * 5000
+        image = bytes(range(256)) * 40
+        chunks = list(zip_stream(
+            [entry(tmp_path, 'notes.txt', text), entry(tmp_path, 'pic.png', image, 'image/png')],
+            chunk_size=4096
+        ))
+
+        assert len(chunks) > 2
+        with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as archive:
+            assert archive.testzip() is None
+            assert archive.read('notes.txt') == text
+            assert archive.read('pic.png') == image
+            assert archive.getinfo('notes.txt').compress_type == zipfile.ZIP_DEFLATED
+            assert archive.getinfo('pic.png').compress_type == zipfile.ZIP_STORED
+
+    def test_empty_archive(self):
+        with zipfile.ZipFile(io.BytesIO(b''.join(zip_stream([], chunk_size=4096)))) as archive:
+            assert archive.namelist() == []
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestDocumentFiles:
+    async def test_lists_active_files_of_owned_document(self, upload_service, owner, make_upload, db_session):
+        document = DocumentCollection(title='Trip', user_id=owner.id)
+        db_session.add(document)
+        await db_session.commit()
+
+        kept = await upload_service.upload_file(make_upload(uuid.uuid4().bytes.hex().encode()), owner.id, document.id)
+        deleted = await upload_service.upload_file(make_upload(uuid.uuid4().bytes.hex().encode()), owner.id, document.id)
+        file_service = FileService(db_session)
+        await file_service.delete_file(owner.id, deleted.id)
+
+        files = await file_service.fetch_document_files(owner.id, document.id)
+        assert [f.id for f in files] == [kept.id]
+
+    async def test_other_users_document(self, owner, db_session):
+        with pytest.raises(FileNotFoundException):
+            await FileService(db_session).fetch_document_files(owner.id + 1000, 1)
@@ -0,0 +1,79 @@
+import hashlib
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from app.fileapp.entities import DocumentCollectionFile, FileBlob
+from app.fileapp.exceptions import InvalidFileTypeException
+
+
+PNG_HEADER = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde'
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode()
+
+
+def stored_files(root) -> list:
+    return sorted(path for path in root.rglob('*') if path.is_file())
+
+
+async def count_files(db_session, user_id: int) -> int:
+    return await db_session.scalar(
+        select(func.count()).select_from(DocumentCollectionFile).filter_by(user_id=user_id)
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestBatchUpload:
+    async def test_uploads_all_files_in_one_go(self, upload_service, owner, make_upload, db_session, tmp_path):
+        first, second = unique_content(), unique_content()
+
+        new_files = await upload_service.upload_files(
+            [make_upload(first, 'a.txt'), make_upload(second, 'b.txt'), make_upload(first, 'c.txt')],
+            owner.id
+        )
+
+        assert [f.title for f in new_files] == ['a.txt', 'b.txt', 'c.txt']
+        assert all(f.id is not None for f in new_files)
+        assert new_files[0].file_path == new_files[2].file_path
+        assert Path(new_files[1].file_path).read_bytes() == second
+        assert len(stored_files(tmp_path)) == 2
+
+        blob = await db_session.get(FileBlob, hashlib.sha256(first).hexdigest())
+        assert blob.ref_count == 2
+
+    async def test_dedups_against_stored_content(self, upload_service, owner, make_upload, db_session):
+        content = unique_content()
+        existing = await upload_service.upload_file(make_upload(content), owner.id)
+
+        new_files = await upload_service.upload_files([make_upload(content, 'again.txt')], owner.id)
+
+        assert new_files[0].file_path == existing.file_path
+        checksum = existing.checksum
+        db_session.expire_all()
+        assert (await db_session.get(FileBlob, checksum)).ref_count == 2
+
+    async def test_disallowed_extension_rejects_batch(self, upload_service, owner, make_upload, db_session, tmp_path):
+        with pytest.raises(InvalidFileTypeException):
+            await upload_service.upload_files(
+                [make_upload(unique_content(), 'a.txt'), make_upload(b'x', 'b.exe')],
+                owner.id
+            )
+
+        assert await count_files(db_session, owner.id) == 0
+        assert stored_files(tmp_path) == []
+
+    async def test_mime_mismatch_rejects_batch(self, upload_service, owner, make_upload, db_session, tmp_path):
+        with pytest.raises(InvalidFileTypeException) as exc_info:
+            await upload_service.upload_files(
+                [make_upload(unique_content(), 'a.txt'), make_upload(PNG_HEADER, 'fake.txt')],
+                owner.id
+            )
+
+        assert exc_info.value.message.startswith('fake.txt')
+        assert await count_files(db_session, owner.id) == 0
+        assert stored_files(tmp_path) == []
@@ -0,0 +1,122 @@
+import hashlib
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.fileapp.entities import FileBlob
+from app.fileapp.services.base_service import FileService
+from app.fileapp.services.blob_service import BlobService
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode()
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestBlobRefCount:
+    async def test_acquire_and_release(self, db_session):
+        blobs = BlobService(db_session)
+        checksum = uuid.uuid4().hex * 2
+
+        assert (await blobs.acquire(checksum, '.txt', 10)).ref_count == 1
+        assert (await blobs.acquire(checksum, '.csv', 10)).extension == '.txt'
+        assert await blobs.release(checksum) == 1
+        assert await blobs.release(checksum) == 0
+        assert await blobs.release(checksum) is None
+        await db_session.commit()
+
+    async def test_acquire_many_writes_in_checksum_order(self, db_session, monkeypatch):
+        statements = []
+        execute = db_session.execute
+
+        async def recording_execute(statement, *args, **kwargs):
+            statements.append(statement)
+            return await execute(statement, *args, **kwargs)
+
+        monkeypatch.setattr(db_session, 'execute', recording_execute)
+        checksums = sorted(uuid.uuid4().hex * 2 for _ in range(3))
+
+        acquired = await BlobService(db_session).acquire_many({checksum: ('.txt', 10, 1) for checksum in reversed(checksums)})
+        await db_session.rollback()
+
+        params = statements[0].compile(dialect=db_session.get_bind().dialect).params
+        assert [value for key, value in params.items() if key.startswith('checksum')] == checksums
+        assert set(acquired) == set(checksums)
+
+    async def test_duplicate_uploads_share_one_blob(self, upload_service, owner, make_upload, db_session):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+
+        await upload_service.upload_file(make_upload(content), owner.id)
+        await upload_service.upload_file(make_upload(content, 'copy.txt'), owner.id)
+
+        blob = await db_session.get(FileBlob, checksum)
+        assert blob.ref_count == 2
+
+    async def test_last_delete_releases_blob(self, upload_service, owner, make_upload, db_session):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+        first = await upload_service.upload_file(make_upload(content), owner.id)
+        second = await upload_service.upload_file(make_upload(content, 'copy.txt'), owner.id)
+        file_path = Path(first.file_path)
+        file_service = FileService(db_session)
+
+        await file_service.delete_file(owner.id, first.id)
+        await file_service.delete_file(owner.id, second.id)
+
+        db_session.expire_all()
+        assert (await db_session.get(FileBlob, checksum)).ref_count == 0
+        # bytes stay until the storage gc reclaims the blob
+        assert file_path.exists()
+
+    async def test_reupload_after_delete_restores_bytes(self, upload_service, owner, make_upload, db_session):
+        content = unique_content()
+        first = await upload_service.upload_file(make_upload(content), owner.id)
+        await FileService(db_session).delete_file(owner.id, first.id)
+
+        checksum = hashlib.sha256(content).hexdigest()
+        assert await upload_service.link_existing_upload('notes.txt', checksum, owner.id) is None
+
+        again = await upload_service.upload_file(make_upload(content), owner.id)
+        assert Path(again.file_path).read_bytes() == content
+
+    async def test_failed_record_commit_leaves_no_orphan(self, upload_service, owner, make_upload, db_session, monkeypatch, tmp_path):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+
+        async def failing_commit():
+            raise SQLAlchemyError("connection lost")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(db_session, 'commit', failing_commit)
+            with pytest.raises(SQLAlchemyError):
+                await upload_service.upload_file(make_upload(content), owner.id)
+
+        assert await db_session.get(FileBlob, checksum) is None
+        assert [path for path in tmp_path.rglob('*') if path.is_file()] == []
+
+    async def test_failed_duplicate_keeps_shared_bytes(self, upload_service, owner, make_upload, db_session, monkeypatch):
+        content = unique_content()
+        first = await upload_service.upload_file(make_upload(content), owner.id)
+        file_path = Path(first.file_path)
+
+        async def failing_commit():
+            raise SQLAlchemyError("connection lost")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(db_session, 'commit', failing_commit)
+            with pytest.raises(SQLAlchemyError):
+                await upload_service.upload_file(make_upload(content, 'copy.txt'), owner.id)
+
+        assert file_path.read_bytes() == content
+
+    async def test_reclaim_skips_referenced_blob(self, upload_service, owner, make_upload, db_session):
+        content = unique_content()
+        new_file = await upload_service.upload_file(make_upload(content), owner.id)
+        file_path = Path(new_file.file_path)
+
+        assert await BlobService(db_session).reclaim(new_file.checksum) is None
+        assert file_path.exists()
@@ -0,0 +1,79 @@
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from app.fileapp.services.base_service import FileService
+from app.fileapp.services.document_stats import DocumentStatsService
+from app.taskapp.document_service import DocumentService
+from app.taskapp.entities import DocumentCollection
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode()
+
+
+@pytest.fixture
+async def document(db_session, owner):
+    document = DocumentCollection(title='Trip', user_id=owner.id)
+    db_session.add(document)
+    await db_session.commit()
+    return document
+
+
+async def read_stats(db_session, owner_id: int, document_id: int) -> tuple:
+    db_session.expire_all()
+    document = await DocumentService(db_session).fetch_documents_by_id(owner_id, document_id)
+    return document.file_count, document.total_bytes
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestDocumentStats:
+    async def test_new_document_has_no_files(self, db_session, owner, document):
+        assert await read_stats(db_session, owner.id, document.id) == (0, 0)
+
+    async def test_upload_and_delete_maintain_counters(self, upload_service, db_session, owner, document, make_upload):
+        owner_id, document_id = owner.id, document.id
+        first, second = unique_content(), unique_content()
+
+        uploaded = await upload_service.upload_file(make_upload(first), owner_id, document_id)
+        uploaded_id = uploaded.id
+        await upload_service.upload_files([make_upload(second, 'b.txt'), make_upload(first, 'c.txt')], owner_id, document_id)
+        assert await read_stats(db_session, owner_id, document_id) == (3, 2 * len(first) + len(second))
+
+        await FileService(db_session).delete_file(owner_id, uploaded_id)
+        assert await read_stats(db_session, owner_id, document_id) == (2, len(first) + len(second))
+
+    async def test_counters_do_not_touch_updated_at(self, upload_service, db_session, owner, document, make_upload):
+        owner_id, document_id = owner.id, document.id
+
+        await upload_service.upload_file(make_upload(unique_content()), owner_id, document_id)
+
+        db_session.expire_all()
+        assert (await db_session.get(DocumentCollection, document_id)).updated_at is None
+
+    async def test_files_outside_documents_are_not_counted(self, upload_service, db_session, owner, document, make_upload):
+        owner_id, document_id = owner.id, document.id
+
+        await upload_service.upload_file(make_upload(unique_content()), owner_id)
+
+        assert await read_stats(db_session, owner_id, document_id) == (0, 0)
+
+    async def test_reconcile_repairs_drift(self, upload_service, db_session, owner, document, make_upload):
+        owner_id, document_id = owner.id, document.id
+        content = unique_content()
+        await upload_service.upload_file(make_upload(content), owner_id, document_id)
+
+        await db_session.execute(
+            update(DocumentCollection).where(DocumentCollection.id == document_id).values(file_count=7, total_bytes=1)
+        )
+        await db_session.commit()
+
+        stats = DocumentStatsService(db_session)
+        assert await stats.reconcile(dry_run=True) >= 1
+        assert await read_stats(db_session, owner_id, document_id) == (7, 1)
+
+        assert await stats.reconcile() >= 1
+        assert await read_stats(db_session, owner_id, document_id) == (1, len(content))
+        assert await stats.reconcile(dry_run=True) == 0
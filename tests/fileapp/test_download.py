@@ -0,0 +1,130 @@
+import hashlib
+from datetime import datetime, timezone
+
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.config import settings
+from app.fileapp.controller.download_file import build_download_response, etag_matches
+from app.fileapp.model import FileRead
+from app.fileapp.services.download_service import FileDownloadService
+
+
+CONTENT = b'0123456789' * 10
+
+
+@pytest.fixture
+def stored_file(tmp_path, monkeypatch) -> FileRead:
+    monkeypatch.setattr(settings, 'upload_dir', tmp_path)
+    checksum = hashlib.sha256(CONTENT).hexdigest()
+    path = tmp_path / f'{checksum}.txt'
+    path.write_bytes(CONTENT)
+    return FileRead(
+        id=1, title='notes.txt', is_active=True, file_path=str(path), file_size=len(CONTENT),
+        mime_type='text/plain', extension='.txt', checksum=checksum, created_at=datetime.now(timezone.utc),
+        updated_at=None, document_id=None, user_id=1
+    )
+
+
+@pytest.fixture
+def download_client(stored_file):
+    async def endpoint(request):
+        return build_download_response(stored_file, request.headers.get('if-none-match'))
+
+    return TestClient(Starlette(routes=[Route('/download', endpoint)]))
+
+
+@pytest.mark.unit
+@pytest.mark.fileapp
+class TestEtagMatches:
+    @pytest.mark.parametrize('header', ['"abc"', 'W/"abc"', '"x", "abc"', '*'])
+    def test_matches(self, header):
+        assert etag_matches(header, '"abc"')
+
+    @pytest.mark.parametrize('header', [None, '', '"abcd"', '"x", "y"'])
+    def test_does_not_match(self, header):
+        assert not etag_matches(header, '"abc"')
+
+    def test_no_etag(self):
+        assert not etag_matches('*', None)
+
+
+@pytest.mark.unit
+@pytest.mark.fileapp
+class TestDownloadResponse:
+    def test_full_download_headers(self, download_client, stored_file):
+        response = download_client.get('/download')
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers['etag'] == f'"{stored_file.checksum}"'
+        assert 'immutable' in response.headers['cache-control']
+        assert response.headers['accept-ranges'] == 'bytes'
+
+    def test_revalidation_not_modified(self, download_client, stored_file):
+        response = download_client.get('/download', headers={'If-None-Match': f'"{stored_file.checksum}"'})
+
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == f'"{stored_file.checksum}"'
+
+    def test_single_range(self, download_client):
+        response = download_client.get('/download', headers={'Range': 'bytes=10-19'})
+
+        assert response.status_code == 206
+        assert response.content == CONTENT[10:20]
+        assert response.headers['content-range'] == f'bytes 10-19/{len(CONTENT)}'
+
+    def test_multi_range(self, download_client):
+        response = download_client.get('/download', headers={'Range': 'bytes=0-4,50-54'})
+
+        assert response.status_code == 206
+        assert response.headers['content-type'].startswith('multipart/byteranges')
+        assert CONTENT[0:5] in response.content and CONTENT[50:55] in response.content
+
+    def test_stale_if_range_gets_full_file(self, download_client):
+        response = download_client.get('/download', headers={'Range': 'bytes=0-4', 'If-Range': '"stale"'})
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+
+
+@pytest.mark.unit
+@pytest.mark.fileapp
+class TestDownloadOffload:
+    def test_direct_mode_streams_from_python(self, stored_file, monkeypatch):
+        monkeypatch.setattr(settings, 'download_delivery_mode', 'direct')
+        assert FileDownloadService.offload_headers(stored_file) is None
+
+    def test_x_accel_redirect(self, stored_file, monkeypatch):
+        monkeypatch.setattr(settings, 'download_delivery_mode', 'x-accel-redirect')
+        monkeypatch.setattr(settings, 'download_accel_prefix', '/protected-uploads/')
+
+        headers = FileDownloadService.offload_headers(stored_file)
+        assert headers == {'x-accel-redirect': f'/protected-uploads/{stored_file.checksum}.txt'}
+
+    def test_x_sendfile(self, stored_file, monkeypatch):
+        monkeypatch.setattr(settings, 'download_delivery_mode', 'x-sendfile')
+        assert FileDownloadService.offload_headers(stored_file) == {'x-sendfile': stored_file.file_path}
+
+    def test_file_outside_upload_dir_is_not_offloaded(self, stored_file, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, 'download_delivery_mode', 'x-sendfile')
+        monkeypatch.setattr(settings, 'upload_dir', tmp_path / 'elsewhere')
+        assert FileDownloadService.offload_headers(stored_file) is None
+
+    def test_offloaded_response_has_no_body(self, stored_file):
+        response = build_download_response(stored_file, offload_headers={'x-sendfile': stored_file.file_path})
+
+        assert response.status_code == 200
+        assert response.body == b''
+        assert response.headers['x-sendfile'] == stored_file.file_path
+        assert response.headers['etag'] == f'"{stored_file.checksum}"'
+        assert response.headers['content-disposition'] == 'attachment; filename="notes.txt"'
+
+    def test_offloaded_revalidation_still_not_modified(self, stored_file):
+        response = build_download_response(
+            stored_file, f'"{stored_file.checksum}"', offload_headers={'x-sendfile': stored_file.file_path}
+        )
+        assert response.status_code == 304
@@ -0,0 +1,47 @@
+import hashlib
+import io
+
+import pytest
+
+from app.fileapp.exceptions import InvalidFileTypeException
+from app.fileapp.services.ingest import ingest_stream, commit_file, SNIFF_BYTES
+
+PNG_HEADER = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00'
+
+
+@pytest.mark.unit
+@pytest.mark.fileapp
+class TestIngestStream:
+    def test_single_pass_hash_size_and_mime(self, tmp_path):
+        content = b'hello,world\n' * 5000
+
+        result = ingest_stream(io.BytesIO(content), tmp_path, chunk_size=4096)
+
+        assert result.checksum == hashlib.sha256(content).hexdigest()
+        assert result.size == len(content)
+        assert result.mime_type.startswith('text/')
+        assert result.temp_path.read_bytes() == content
+
+    def test_small_file_sniffed_at_eof(self, tmp_path):
+        result = ingest_stream(io.BytesIO(PNG_HEADER), tmp_path, chunk_size=4096)
+
+        assert result.mime_type == 'image/png'
+        assert result.size < SNIFF_BYTES
+
+    def test_rejected_mime_stops_early_and_cleans_up(self, tmp_path):
+        source = io.BytesIO(PNG_HEADER + b'\x00' * (SNIFF_BYTES * 4))
+
+        with pytest.raises(InvalidFileTypeException):
+            ingest_stream(source, tmp_path, chunk_size=SNIFF_BYTES, accept_mime=lambda mime: mime == 'application/pdf')
+
+        assert source.tell() == SNIFF_BYTES
+        assert list(tmp_path.iterdir()) == []
+
+    def test_commit_file_renames(self, tmp_path):
+        result = ingest_stream(io.BytesIO(b'abc'), tmp_path, chunk_size=4096)
+        final_path = tmp_path / f'{result.checksum}.txt'
+
+        commit_file(result.temp_path, final_path)
+
+        assert final_path.read_bytes() == b'abc'
+        assert not result.temp_path.exists()
@@ -0,0 +1,38 @@
+import uuid
+
+import pytest
+
+from app.fileapp.services.base_service import FileService
+from app.taskapp.entities import DocumentCollection
+from app.userapp.list_versions import ListVersions, ListVersionService
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode()
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestFileListVersion:
+    async def test_upload_and_delete_bump_the_files_version(self, upload_service, db_session, owner, make_upload):
+        owner_id = owner.id
+        versions = ListVersionService(db_session)
+
+        uploaded = await upload_service.upload_file(make_upload(unique_content()), owner_id)
+        await upload_service.upload_files([make_upload(unique_content(), 'b.txt')], owner_id)
+        assert await versions.get(owner_id) == ListVersions(documents=0, files=2)
+
+        await FileService(db_session).delete_file(owner_id, uploaded.id)
+        assert await FileService(db_session).list_version(owner_id) == 3
+        assert (await versions.get(owner_id)).documents == 0
+
+    async def test_document_files_bump_both_versions(self, upload_service, db_session, owner, make_upload):
+        owner_id = owner.id
+        document = DocumentCollection(title='Trip', user_id=owner_id)
+        db_session.add(document)
+        await db_session.commit()
+
+        uploaded = await upload_service.upload_file(make_upload(unique_content()), owner_id, document.id)
+        await FileService(db_session).delete_file(owner_id, uploaded.id)
+
+        assert await ListVersionService(db_session).get(owner_id) == ListVersions(documents=2, files=2)
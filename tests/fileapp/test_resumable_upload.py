@@ -0,0 +1,232 @@
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import asyncio
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.fileapp.entities import UploadSession
+from app.fileapp.exceptions import (
+    ChecksumMismatchException,
+    UploadOffsetMismatchException,
+    UploadSessionBusyException,
+    UploadTooLargeException
+)
+from app.fileapp.services.resumable_service import ResumableUploadService
+from app.fileapp.services.upload_service import FileUploadService
+
+
+async def stream(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode() * 8
+
+
+@pytest.fixture
+def resumable_service(db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'upload_dir', tmp_path)
+    return ResumableUploadService(db=db_session)
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestResumableUpload:
+    async def test_chunks_are_finalized_into_a_file(self, resumable_service, owner):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content), checksum=checksum)
+
+        half = len(content) // 2
+        await resumable_service.write_chunk(owner.id, session.id, 0, stream(content[:half]))
+        await resumable_service.write_chunk(owner.id, session.id, half, stream(content[half:]))
+        new_file = await resumable_service.finalize(owner.id, session.id)
+
+        assert new_file.checksum == checksum
+        assert new_file.file_size == len(content)
+        assert os.path.exists(new_file.file_path)
+        assert not resumable_service.part_path(session.id).exists()
+
+    async def test_wrong_offset_reports_where_to_resume(self, resumable_service, owner):
+        content = unique_content()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content))
+        await resumable_service.write_chunk(owner.id, session.id, 0, stream(content[:10]))
+
+        with pytest.raises(UploadOffsetMismatchException) as exc_info:
+            await resumable_service.write_chunk(owner.id, session.id, 0, stream(content))
+
+        assert exc_info.value.offset == 10
+        await resumable_service.write_chunk(owner.id, session.id, 10, stream(content[10:]))
+        new_file = await resumable_service.finalize(owner.id, session.id)
+        assert new_file.checksum == hashlib.sha256(content).hexdigest()
+
+    async def test_interrupted_chunk_keeps_flushed_bytes(self, resumable_service, owner, monkeypatch):
+        monkeypatch.setattr(settings, 'upload_chunk_size', 4)
+        content = unique_content()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content))
+
+        async def broken_stream():
+            yield content[:8]
+            raise ConnectionResetError()
+
+        with pytest.raises(ConnectionResetError):
+            await resumable_service.write_chunk(owner.id, session.id, 0, broken_stream())
+
+        session = await resumable_service.get_session(owner.id, session.id)
+        assert session.received_bytes == 8
+
+    async def test_finalize_incomplete_upload(self, resumable_service, owner):
+        content = unique_content()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content))
+        await resumable_service.write_chunk(owner.id, session.id, 0, stream(content[:5]))
+
+        with pytest.raises(UploadOffsetMismatchException) as exc_info:
+            await resumable_service.finalize(owner.id, session.id)
+        assert exc_info.value.offset == 5
+
+    async def test_finalize_survives_database_error(self, resumable_service, owner, db_session, monkeypatch):
+        owner_id = owner.id
+        content = unique_content()
+        session = await resumable_service.create_session(owner_id, 'notes.txt', len(content))
+        await resumable_service.write_chunk(owner_id, session.id, 0, stream(content))
+        session_id = session.id
+
+        async def failing_record(*args, **kwargs):
+            raise SQLAlchemyError("connection lost")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(FileUploadService, '_FileUploadService__create_file_record', failing_record)
+            with pytest.raises(SQLAlchemyError):
+                await resumable_service.finalize(owner_id, session_id)
+
+        assert await db_session.get(UploadSession, session_id) is not None
+        assert resumable_service.part_path(session_id).exists()
+
+        new_file = await resumable_service.finalize(owner_id, session_id)
+        assert new_file.checksum == hashlib.sha256(content).hexdigest()
+        assert os.path.exists(new_file.file_path)
+        assert not resumable_service.part_path(session_id).exists()
+
+    async def test_finalize_checksum_mismatch_drops_session(self, resumable_service, owner, db_session):
+        content = unique_content()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content), checksum='0' * 64)
+        await resumable_service.write_chunk(owner.id, session.id, 0, stream(content))
+        session_id = session.id
+
+        with pytest.raises(ChecksumMismatchException):
+            await resumable_service.finalize(owner.id, session_id)
+
+        assert await db_session.get(UploadSession, session_id) is None
+        assert not resumable_service.part_path(session_id).exists()
+
+    async def test_chunk_past_declared_size(self, resumable_service, owner):
+        session = await resumable_service.create_session(owner.id, 'notes.txt', 4)
+
+        with pytest.raises(UploadTooLargeException):
+            await resumable_service.write_chunk(owner.id, session.id, 0, stream(b'too long'))
+
+    async def test_cleanup_expired_sessions(self, resumable_service, owner, db_session):
+        stale = await resumable_service.create_session(owner.id, 'old.txt', 10)
+        fresh = await resumable_service.create_session(owner.id, 'new.txt', 10)
+        stale.updated_at = datetime.now(timezone.utc) - timedelta(days=2)
+        await db_session.commit()
+
+        assert await resumable_service.cleanup_expired(timedelta(hours=24)) == 1
+        assert await db_session.get(UploadSession, stale.id) is None
+        assert not resumable_service.part_path(stale.id).exists()
+        assert resumable_service.part_path(fresh.id).exists()
+
+    async def test_chunk_streams_without_open_transaction(self, resumable_service, owner, db_session):
+        content = unique_content()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content))
+        in_transaction = []
+
+        async def watched_stream():
+            for part in (content[:10], content[10:]):
+                in_transaction.append(db_session.in_transaction())
+                yield part
+
+        session = await resumable_service.write_chunk(owner.id, session.id, 0, watched_stream())
+
+        assert in_transaction == [False, False]
+        assert session.received_bytes == len(content)
+        assert session.lease_token is None
+
+    async def test_leased_session_rejects_other_requests(self, resumable_service, owner):
+        owner_id = owner.id
+        content = unique_content()
+        session = await resumable_service.create_session(owner_id, 'notes.txt', len(content))
+        session_id = session.id
+        rejected = []
+
+        async def contended_stream():
+            yield content[:10]
+            for attempt in (
+                resumable_service.write_chunk(owner_id, session_id, 0, stream(content)),
+                resumable_service.finalize(owner_id, session_id),
+                resumable_service.abort(owner_id, session_id)
+            ):
+                with pytest.raises(UploadSessionBusyException) as exc_info:
+                    await attempt
+                rejected.append(exc_info.value.status_code)
+            yield content[10:]
+
+        session = await resumable_service.write_chunk(owner_id, session_id, 0, contended_stream())
+
+        assert rejected == [409, 409, 409]
+        assert session.received_bytes == len(content)
+        new_file = await resumable_service.finalize(owner_id, session_id)
+        assert new_file.checksum == hashlib.sha256(content).hexdigest()
+
+    async def test_expired_lease_is_taken_over(self, resumable_service, owner, db_session, monkeypatch):
+        monkeypatch.setattr(settings, 'upload_session_lease_seconds', 0.05)
+        owner_id = owner.id
+        content = unique_content()
+        session = await resumable_service.create_session(owner_id, 'notes.txt', len(content))
+        session_id = session.id
+
+        async def stalled_stream():
+            yield content[:10]
+            await asyncio.sleep(0.1)
+            # the stalled request's lease ran out, another one resumes the session meanwhile
+            await resumable_service.write_chunk(owner_id, session_id, 0, stream(content[:20]))
+            yield content[10:]
+
+        with pytest.raises(UploadSessionBusyException):
+            await resumable_service.write_chunk(owner_id, session_id, 0, stalled_stream())
+
+        session = await resumable_service.get_session(owner_id, session_id)
+        assert session.received_bytes == 20
+
+    async def test_stale_lease_does_not_block(self, resumable_service, owner, db_session):
+        content = unique_content()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content))
+        await db_session.execute(
+            update(UploadSession)
+            .filter_by(id=session.id)
+            .values(lease_token='0' * 32, leased_until=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        await db_session.commit()
+
+        session = await resumable_service.write_chunk(owner.id, session.id, 0, stream(content))
+        assert session.received_bytes == len(content)
+
+    async def test_chunk_request_byte_limit(self, resumable_service, owner, monkeypatch):
+        monkeypatch.setattr(settings, 'upload_request_max_bytes', 16)
+        monkeypatch.setattr(settings, 'upload_chunk_size', 4)
+        content = unique_content()
+        session = await resumable_service.create_session(owner.id, 'notes.txt', len(content))
+
+        with pytest.raises(UploadTooLargeException):
+            await resumable_service.write_chunk(owner.id, session.id, 0, stream(content[:10], content[10:]))
+
+        # the flushed bytes that fit were kept and the lease released
+        session = await resumable_service.write_chunk(owner.id, session.id, 10, stream(content[10:26]))
+        assert session.received_bytes == 26
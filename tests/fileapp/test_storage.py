@@ -0,0 +1,100 @@
+import hashlib
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.fileapp.entities import DocumentCollectionFile
+from app.fileapp.migrate_storage import migrate_storage
+from app.fileapp.storage import relative_path, resolve_path, TEMP_DIR_NAME
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode()
+
+
+@pytest.mark.unit
+@pytest.mark.fileapp
+class TestStorageLayout:
+    def test_sharded_relative_path(self):
+        checksum = 'abcdef' + '0' * 58
+        assert relative_path(checksum, '.txt') == Path('ab', 'cd', f'{checksum}.txt')
+
+    def test_resolves_from_checksum(self, upload_service, tmp_path):
+        checksum = 'ab' * 32
+        assert resolve_path(checksum, '.txt') == tmp_path / 'ab' / 'ab' / f'{checksum}.txt'
+
+    def test_unmigrated_row_keeps_stored_path(self):
+        assert resolve_path('ab' * 32, '.txt', '/old/flat.txt') == Path('/old/flat.txt')
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestShardedUpload:
+    async def test_upload_lands_in_shard(self, upload_service, owner, make_upload, tmp_path):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+
+        new_file = await upload_service.upload_file(make_upload(content), owner.id)
+
+        assert new_file.stored_path is None
+        assert Path(new_file.file_path) == tmp_path / checksum[:2] / checksum[2:4] / f'{checksum}.txt'
+        assert Path(new_file.file_path).read_bytes() == content
+        assert list((tmp_path / TEMP_DIR_NAME).iterdir()) == []
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestStorageMigration:
+    async def legacy_file(self, db_session, owner, path: Path, content: bytes, checksum=None) -> DocumentCollectionFile:
+        path.write_bytes(content)
+        row = DocumentCollectionFile(
+            title='old.txt', stored_path=str(path), file_size=len(content), mime_type='text/plain',
+            extension='.txt', checksum=checksum, user_id=owner.id
+        )
+        db_session.add(row)
+        await db_session.commit()
+        return row
+
+    async def test_moves_flat_files_and_clears_path(self, upload_service, owner, db_session, tmp_path):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+        flat = tmp_path / f'{checksum}.txt'
+        first = await self.legacy_file(db_session, owner, flat, content, checksum)
+        shared = DocumentCollectionFile(
+            title='copy.txt', stored_path=str(flat), file_size=len(content), mime_type='text/plain',
+            extension='.txt', checksum=checksum, user_id=owner.id
+        )
+        db_session.add(shared)
+        await db_session.commit()
+
+        stats = await migrate_storage(db_session, batch_size=1)
+
+        assert stats['migrated_files'] == 1 and stats['updated_rows'] == 2
+        for row in (first, shared):
+            await db_session.refresh(row)
+            assert row.stored_path is None
+            assert Path(row.file_path).read_bytes() == content
+        assert not flat.exists()
+
+    async def test_hashes_rows_without_checksum(self, upload_service, owner, db_session, tmp_path):
+        content = unique_content()
+        row = await self.legacy_file(db_session, owner, tmp_path / 'legacy.txt', content)
+
+        await migrate_storage(db_session)
+        await db_session.refresh(row)
+
+        assert row.checksum == hashlib.sha256(content).hexdigest()
+        assert Path(row.file_path).read_bytes() == content
+
+    async def test_dry_run_and_missing_files(self, upload_service, owner, db_session, tmp_path):
+        content = unique_content()
+        row = await self.legacy_file(db_session, owner, tmp_path / 'kept.txt', content)
+        gone = await self.legacy_file(db_session, owner, tmp_path / 'gone.txt', content)
+        Path(gone.stored_path).unlink()
+
+        stats = await migrate_storage(db_session, dry_run=True)
+        await db_session.refresh(row)
+
+        assert stats['missing'] >= 1
+        assert row.stored_path == str(tmp_path / 'kept.txt')
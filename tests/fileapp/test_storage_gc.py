@@ -0,0 +1,94 @@
+import hashlib
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from app.fileapp.entities import DocumentCollectionFile, FileBlob
+from app.fileapp.services.base_service import FileService
+from app.fileapp.services.storage_gc import StorageGarbageCollector
+from app.fileapp.storage import temp_dir
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode()
+
+
+def make_collector(dry_run: bool = False) -> StorageGarbageCollector:
+    return StorageGarbageCollector(
+        interval=3600,
+        grace=timedelta(hours=1),
+        temp_max_age=timedelta(hours=1),
+        batch_size=2,
+        batch_pause=0,
+        dry_run=dry_run
+    )
+
+
+def later(hours: int = 2) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(hours=hours)
+
+
+@pytest.fixture
+async def deleted_file(upload_service, owner, make_upload, db_session):
+    content = unique_content()
+    new_file = await upload_service.upload_file(make_upload(content), owner.id)
+    file_id, file_path = new_file.id, Path(new_file.file_path)
+    await FileService(db_session).delete_file(owner.id, file_id)
+    return file_id, file_path, hashlib.sha256(content).hexdigest(), len(content)
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestStorageGarbageCollector:
+    async def test_reclaims_released_blob_and_row(self, deleted_file, db_session):
+        file_id, file_path, checksum, size = deleted_file
+        collector = make_collector()
+
+        result = await collector.collect(db_session, now=later())
+
+        assert result['blobs'] >= 1 and result['blob_bytes'] >= size
+        assert result['rows'] >= 1
+        assert not file_path.exists()
+        db_session.expire_all()
+        assert await db_session.get(FileBlob, checksum) is None
+        assert await db_session.get(DocumentCollectionFile, file_id) is None
+        assert collector.stats()['totals']['blob_bytes'] >= size
+
+    async def test_grace_period_keeps_recent_deletes(self, deleted_file, db_session):
+        file_id, file_path, checksum, _ = deleted_file
+
+        await make_collector().collect(db_session, now=datetime.now(timezone.utc))
+
+        assert file_path.exists()
+        assert await db_session.get(DocumentCollectionFile, file_id) is not None
+
+    async def test_dry_run_changes_nothing(self, deleted_file, db_session):
+        file_id, file_path, checksum, size = deleted_file
+        collector = make_collector(dry_run=True)
+
+        result = await collector.collect(db_session, now=later())
+
+        assert result['blob_bytes'] >= size
+        assert file_path.exists()
+        assert await db_session.get(DocumentCollectionFile, file_id) is not None
+        assert collector.stats()['totals']['blob_bytes'] == 0
+
+    async def test_removes_stale_temp_files(self, upload_service, db_session, tmp_path):
+        stale = temp_dir() / 'temp_stale'
+        legacy = tmp_path / 'temp_legacy'
+        fresh = temp_dir() / 'temp_fresh'
+        for path in (stale, legacy, fresh):
+            path.write_bytes(b'partial')
+        old = time.time() - 3 * 3600
+        os.utime(stale, (old, old))
+        os.utime(legacy, (old, old))
+
+        result = await make_collector().collect(db_session)
+
+        assert result['temp_files'] == 2 and result['temp_bytes'] == 14
+        assert not stale.exists() and not legacy.exists()
+        assert fresh.exists()
@@ -0,0 +1,75 @@
+import hashlib
+import uuid
+
+import pytest
+
+from app.fileapp.exceptions import ChecksumMismatchException
+from app.fileapp.services.ingest import parse_checksum_header
+from app.userapp.entities import DocumentUser
+
+
+def stored_files(root) -> list:
+    return sorted(path for path in root.rglob('*') if path.is_file())
+
+
+def unique_content() -> bytes:
+    return b'hello,world\n' + uuid.uuid4().hex.encode()
+
+
+@pytest.mark.unit
+@pytest.mark.fileapp
+class TestChecksumHeader:
+    def test_normalises_hex(self):
+        assert parse_checksum_header('AB' * 32) == 'ab' * 32
+
+    def test_missing_header(self):
+        assert parse_checksum_header(None) is None
+
+    @pytest.mark.parametrize('value', ['', 'abc', 'zz' * 32])
+    def test_malformed_header(self, value):
+        with pytest.raises(ValueError):
+            parse_checksum_header(value)
+
+
+@pytest.mark.integration
+@pytest.mark.fileapp
+class TestUploadDedupFastPath:
+    async def test_preflight_miss_then_hit(self, upload_service, owner, make_upload):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+
+        assert await upload_service.link_existing_upload('notes.txt', checksum, owner.id) is None
+
+        first = await upload_service.upload_file(make_upload(content), owner.id)
+        linked = await upload_service.link_existing_upload('copy.txt', checksum, owner.id)
+
+        assert linked.id != first.id
+        assert linked.file_path == first.file_path
+        assert linked.title == 'copy.txt'
+
+    async def test_preflight_ignores_other_users_files(self, upload_service, owner, make_upload, db_session):
+        content = unique_content()
+        await upload_service.upload_file(make_upload(content), owner.id)
+
+        other = DocumentUser(name='Other', email=f'{uuid.uuid4().hex}@example.com', hashed_pwd='x')
+        db_session.add(other)
+        await db_session.commit()
+
+        assert await upload_service.link_existing_upload('notes.txt', hashlib.sha256(content).hexdigest(), other.id) is None
+
+    async def test_declared_duplicate_verified_without_writing(self, upload_service, owner, make_upload, tmp_path):
+        content = unique_content()
+        checksum = hashlib.sha256(content).hexdigest()
+        first = await upload_service.upload_file(make_upload(content), owner.id)
+        files_before = stored_files(tmp_path)
+
+        second = await upload_service.upload_file(make_upload(content), owner.id, expected_checksum=checksum)
+
+        assert second.file_path == first.file_path
+        assert stored_files(tmp_path) == files_before
+
+    async def test_checksum_mismatch_rejected(self, upload_service, owner, make_upload, tmp_path):
+        with pytest.raises(ChecksumMismatchException):
+            await upload_service.upload_file(make_upload(unique_content()), owner.id, expected_checksum='0' * 64)
+
+        assert stored_files(tmp_path) == []
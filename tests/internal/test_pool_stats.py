@@ -0,0 +1,88 @@
+import pytest
+from fastapi import status
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.config import settings
+from app.database.metrics import InstrumentedQueuePool, PoolWaitHistogram, checkout_wait_histogram
+
+
+@pytest.mark.unit
+class TestPoolWaitHistogram:
+    def test_observe_cumulative_buckets(self):
+        histogram = PoolWaitHistogram(buckets=(0.01, 0.1))
+
+        histogram.observe(0.005)
+        histogram.observe(0.05)
+        histogram.observe(2.0)
+        histogram.observe_timeout()
+
+        snapshot = histogram.snapshot()
+        assert snapshot['count'] == 3
+        assert snapshot['timeouts'] == 1
+        assert snapshot['max_ms'] == 2000.0
+        assert snapshot['buckets'] == {'le_10ms': 1, 'le_100ms': 2, 'le_inf': 3}
+
+    def test_reset(self):
+        histogram = PoolWaitHistogram()
+        histogram.observe(0.2)
+        histogram.reset()
+
+        assert histogram.snapshot()['count'] == 0
+
+
+@pytest.mark.integration
+class TestInstrumentedQueuePool:
+    async def test_records_pool_waits_and_timeouts_apart(self, tmp_path):
+        engine = create_async_engine(
+            f'sqlite+aiosqlite:///{tmp_path}/pool.db',
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05
+        )
+        before = checkout_wait_histogram.snapshot()
+        try:
+            # the first checkout opens the connection, it did not wait for the pool
+            async with engine.connect() as conn:
+                assert checkout_wait_histogram.snapshot()['count'] == before['count']
+
+                with pytest.raises(PoolTimeoutError):
+                    await engine.connect().start()
+
+            async with engine.connect():
+                pass
+        finally:
+            await engine.dispose()
+
+        after = checkout_wait_histogram.snapshot()
+        assert after['timeouts'] == before['timeouts'] + 1
+        # only the reuse of the pooled connection is a wait, neither the timeout nor dispose are
+        assert after['count'] == before['count'] + 1
+
+
+@pytest.mark.integration
+class TestPoolStatsRoute:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        self._url = '/internal/db/pool'
+        monkeypatch.setattr(settings, 'internal_api_key', 'internal-key')
+
+    def test_pool_stats(self, client):
+        response = client.get(self._url, headers={'X-Internal-Key': 'internal-key'})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()['data']
+        assert data['pool_size'] == settings.db_pool_size
+        assert 'buckets' in data['wait']
+
+    def test_pool_stats_wrong_key(self, client):
+        response = client.get(self._url, headers={'X-Internal-Key': 'wrong'})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_pool_stats_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(settings, 'internal_api_key', None)
+        response = client.get(self._url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,25 @@
+import pytest
+from fastapi import status
+
+from app.config import settings
+
+
+@pytest.mark.integration
+class TestStorageGCStatsRoute:
+    @pytest.fixture(autouse=True)
+    def setup(self, monkeypatch):
+        self._url = '/internal/storage/gc'
+        monkeypatch.setattr(settings, 'internal_api_key', 'internal-key')
+
+    def test_storage_gc_stats(self, client):
+        response = client.get(self._url, headers={'X-Internal-Key': 'internal-key'})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()['data']
+        assert 'blob_bytes' in data['totals']
+        assert data['dry_run'] == settings.storage_gc_dry_run
+
+    def test_storage_gc_stats_wrong_key(self, client):
+        response = client.get(self._url, headers={'X-Internal-Key': 'wrong'})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
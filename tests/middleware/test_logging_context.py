@@ -0,0 +1,225 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse, Response
+
+from app.middleware.logging_context import BodyTee, LoggingContextMiddleware
+
+
+@pytest.fixture
+def mock_logger(mocker):
+    return mocker.patch('app.middleware.logging_context.logger')
+
+
+@pytest.fixture
+def tee_client():
+    test_app = FastAPI()
+    test_app.add_middleware(LoggingContextMiddleware, max_body_bytes=16)
+
+    @test_app.post('/echo')
+    async def echo(request: Request):
+        body = await request.body()
+        return JSONResponse({'size': len(body), 'password': 'hunter2'})
+
+    @test_app.get('/download')
+    async def download():
+        return Response(b'x' * 1024, media_type='text/plain', headers={'Content-Disposition': 'attachment; filename="a.txt"'})
+
+    @test_app.get('/state')
+    async def state(request: Request):
+        return {'user_id': getattr(request.state, 'token_user_id', None)}
+
+    return TestClient(test_app)
+
+
+def finished_kwargs(mock_logger) -> dict:
+    call = next(c for c in mock_logger.info.call_args_list if c.args[0] == "Request finished")
+    return call.kwargs
+
+
+@pytest.mark.unit
+class TestBodyTee:
+    def test_keeps_at_most_max_bytes(self):
+        tee = BodyTee(max_bytes=5)
+        tee.feed(b'abc')
+        tee.feed(b'defgh')
+        tee.feed(b'ijk')
+
+        assert tee.body == b'abcde'
+        assert tee.truncated
+
+    def test_disabled_captures_nothing(self):
+        tee = BodyTee(max_bytes=5, enabled=False)
+        tee.feed(b'abc')
+
+        assert tee.body == b''
+        assert not tee.truncated
+
+
+@pytest.mark.unit
+class TestLoggingContextMiddleware:
+    def test_request_body_passes_through_and_is_capped(self, tee_client, mock_logger):
+        response = tee_client.post('/echo', content=b'a' * 1000, headers={'Content-Type': 'text/plain'})
+
+        assert response.json()['size'] == 1000
+        logged = finished_kwargs(mock_logger)
+        assert logged['request_payload'] == {'omitted': True, 'bytes': 1000}
+        assert logged['truncated'] is True
+        assert logged['status_code'] == 200
+
+    def test_truncated_json_with_masked_key_is_omitted(self, tee_client, mock_logger):
+        body = '{"password": "SuperSecret123", "name": "' + 'x' * 5000 + '"}'
+
+        tee_client.post('/echo', content=body, headers={'Content-Type': 'application/json'})
+
+        logged = finished_kwargs(mock_logger)
+        assert logged['request_payload'] == {'omitted': True, 'bytes': len(body)}
+        assert 'SuperSecret123' not in repr(mock_logger.mock_calls)
+
+    def test_form_body_is_omitted(self, tee_client, mock_logger):
+        tee_client.post('/echo', data={'pwd': 'hunter'}, headers={'Content-Type': 'application/x-www-form-urlencoded'})
+
+        assert finished_kwargs(mock_logger)['request_payload'] == {'omitted': True, 'bytes': len('pwd=hunter')}
+
+    def test_multipart_upload_not_captured(self, tee_client, mock_logger):
+        response = tee_client.post('/echo', files={'file': ('a.bin', b'z' * 5000, 'application/octet-stream')})
+
+        assert response.json()['size'] > 5000
+        assert finished_kwargs(mock_logger)['request_payload'] is None
+
+    def test_small_json_response_logged_and_masked(self, mock_logger):
+        test_app = FastAPI()
+        test_app.add_middleware(LoggingContextMiddleware, max_body_bytes=4096)
+
+        @test_app.post('/echo')
+        async def echo(payload: dict):
+            return {'password': 'hunter2', 'saved': bool(payload)}
+
+        TestClient(test_app).post('/echo', json={'password': 'secret', 'name': 'n'})
+
+        logged = finished_kwargs(mock_logger)
+        assert logged['request_payload'] == {'password': '***', 'name': 'n'}
+        assert logged['payload'] == {'password': '***', 'saved': True}
+        assert logged['truncated'] is False
+
+    def test_attachment_response_not_captured(self, tee_client, mock_logger):
+        response = tee_client.get('/download')
+
+        assert len(response.content) == 1024
+        assert finished_kwargs(mock_logger)['payload'] is None
+
+    def test_token_user_shared_through_scope_state(self, tee_client, mock_logger, mocker):
+        mocker.patch('app.middleware.logging_context.AuthenticationService.get_user_from_token', return_value=42)
+
+        response = tee_client.get('/state', headers={'Authorization': 'Bearer abc'})
+
+        assert response.json() == {'user_id': 42}
+
+
+def mode_client(**middleware_kwargs) -> TestClient:
+    test_app = FastAPI()
+    test_app.add_middleware(LoggingContextMiddleware, max_body_bytes=4096, **middleware_kwargs)
+
+    @test_app.post('/api/items')
+    async def create(payload: dict):
+        return {'name': payload['name']}
+
+    @test_app.post('/api/fail')
+    async def fail(payload: dict):
+        return JSONResponse({'detail': 'bad'}, status_code=422)
+
+    @test_app.post('/api/files/{file_id}/download')
+    async def download(file_id: int, payload: dict):
+        return {'id': file_id}
+
+    return TestClient(test_app)
+
+
+@pytest.mark.unit
+class TestPayloadLogModes:
+    def test_headers_mode_skips_payloads(self, mock_logger):
+        mode_client(payload_mode='headers', route_overrides=[]).post('/api/items', json={'name': 'n'})
+
+        assert 'payload' not in finished_kwargs(mock_logger)
+
+    def test_on_error_logs_only_failures(self, mock_logger):
+        client = mode_client(payload_mode='on_error', route_overrides=[])
+
+        client.post('/api/items', json={'name': 'n'})
+        assert 'payload' not in finished_kwargs(mock_logger)
+
+        mock_logger.reset_mock()
+        client.post('/api/fail', json={'name': 'n'})
+        logged = finished_kwargs(mock_logger)
+        assert logged['request_payload'] == {'name': 'n'}
+        assert logged['payload'] == {'detail': 'bad'}
+
+    @pytest.mark.parametrize('roll, logged', [(0.05, True), (0.5, False)])
+    def test_sampled_mode(self, mock_logger, mocker, roll, logged):
+        mocker.patch('app.middleware.logging_context.random.random', return_value=roll)
+
+        mode_client(payload_mode='sampled', sample_rate=0.1, route_overrides=[]).post('/api/items', json={'name': 'n'})
+
+        assert ('payload' in finished_kwargs(mock_logger)) is logged
+
+    def test_route_override_wins(self, mock_logger):
+        client = mode_client(payload_mode='full', route_overrides=[('/api/files/*/download', 'headers')])
+
+        client.post('/api/files/3/download', json={'name': 'n'})
+        assert 'payload' not in finished_kwargs(mock_logger)
+
+        mock_logger.reset_mock()
+        client.post('/api/items', json={'name': 'n'})
+        assert finished_kwargs(mock_logger)['payload'] == {'name': 'n'}
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            LoggingContextMiddleware(FastAPI(), payload_mode='verbose')
+
+
+@pytest.mark.unit
+class TestAuditRecording:
+    def test_request_recorded_with_captured_payloads(self, mock_logger, mocker):
+        record = mocker.patch('app.middleware.logging_context.audit_log_writer.record')
+        mocker.patch('app.middleware.logging_context.AuthenticationService.get_user_from_token', return_value=42)
+
+        mode_client(payload_mode='full', route_overrides=[]).post(
+            '/api/items', json={'name': 'n'}, headers={'Authorization': 'Bearer abc'}
+        )
+
+        entry = record.call_args.kwargs
+        assert entry['method'] == 'POST'
+        assert entry['path'] == '/api/items'
+        assert entry['status_code'] == 200
+        assert entry['user_id'] == 42
+        assert entry['request_payload'] == {'name': 'n'}
+        assert entry['duration_ms'] >= 0
+
+    def test_truncated_credentials_not_recorded(self, mock_logger, mocker):
+        record = mocker.patch('app.middleware.logging_context.audit_log_writer.record')
+        test_app = FastAPI()
+        test_app.add_middleware(LoggingContextMiddleware, payload_mode='full', route_overrides=[], max_body_bytes=64)
+
+        @test_app.post('/register')
+        async def register(request: Request):
+            await request.body()
+            return {'ok': True}
+
+        body = '{"password": "SuperSecret123", "name": "' + 'x' * 5000 + '"}'
+        TestClient(test_app).post('/register', content=body, headers={'Content-Type': 'application/json'})
+
+        entry = record.call_args.kwargs
+        assert entry['request_payload'] == {'omitted': True, 'bytes': len(body)}
+        assert 'SuperSecret123' not in repr(entry)
+
+    def test_token_keys_masked(self, mock_logger):
+        test_app = FastAPI()
+        test_app.add_middleware(LoggingContextMiddleware, payload_mode='full', route_overrides=[])
+
+        @test_app.post('/login')
+        async def login(payload: dict):
+            return {'access_token': 'abc', 'refresh_token': 'def', 'token_type': 'bearer'}
+
+        TestClient(test_app).post('/login', json={'email': 'e'})
+
+        assert finished_kwargs(mock_logger)['payload'] == {'access_token': '***', 'refresh_token': '***', 'token_type': '***'}
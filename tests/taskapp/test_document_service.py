@@ -0,0 +1,222 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.taskapp.document_model import DocumentBatchUpdateItem, DocumentCreate, DocumentUpdate
+from app.taskapp.document_service import DocumentService
+from app.taskapp.entities import DocumentCollection
+from app.userapp.entities import DocumentUser
+
+
+async def make_user(db_session) -> int:
+    user = DocumentUser(name='Doc Owner', email=f'{uuid.uuid4().hex}@example.com', hashed_pwd='hashed_pwd_123')
+    db_session.add(user)
+    await db_session.commit()
+    return user.id
+
+
+@pytest.mark.integration
+@pytest.mark.taskapp
+class TestDocumentWrites:
+    async def test_update_returns_fresh_document(self, db_session):
+        user_id = await make_user(db_session)
+        service = DocumentService(db=db_session)
+        document_id = await service.create_document(user_id, DocumentCreate(title='Before', description='kept'))
+
+        updated = await service.update_document(user_id, document_id, DocumentUpdate(title='After'))
+
+        assert updated.id == document_id
+        assert updated.title == 'After'
+        assert updated.description == 'kept'
+        assert updated.updated_at is not None
+        assert (await service.fetch_documents_by_id(user_id, document_id)).title == 'After'
+
+    async def test_empty_update_returns_document(self, db_session):
+        user_id = await make_user(db_session)
+        service = DocumentService(db=db_session)
+        document_id = await service.create_document(user_id, DocumentCreate(title='Same'))
+
+        updated = await service.update_document(user_id, document_id, DocumentUpdate())
+
+        assert updated.title == 'Same'
+
+    async def test_update_of_foreign_document_is_not_found(self, db_session):
+        owner_id, other_id = await make_user(db_session), await make_user(db_session)
+        service = DocumentService(db=db_session)
+        document_id = await service.create_document(owner_id, DocumentCreate(title='Mine'))
+
+        assert await service.update_document(other_id, document_id, DocumentUpdate(title='Stolen')) is None
+        assert (await service.fetch_documents_by_id(owner_id, document_id)).title == 'Mine'
+
+    async def test_delete(self, db_session):
+        owner_id, other_id = await make_user(db_session), await make_user(db_session)
+        service = DocumentService(db=db_session)
+        document_id = await service.create_document(owner_id, DocumentCreate(title='Gone'))
+
+        assert await service.delete_collection(other_id, document_id) is False
+        assert await service.delete_collection(owner_id, document_id) is True
+        assert await service.delete_collection(owner_id, document_id) is False
+        assert await db_session.get(DocumentCollection, document_id) is None
+
+
+@pytest.mark.integration
+@pytest.mark.taskapp
+class TestDocumentBatch:
+    async def test_create_keeps_item_order(self, db_session):
+        user_id = await make_user(db_session)
+        service = DocumentService(db=db_session)
+
+        created = await service.create_documents(user_id, [DocumentCreate(title=f'doc-{i}') for i in range(25)])
+
+        assert [document.title for document in created] == [f'doc-{i}' for i in range(25)]
+        assert len({document.id for document in created}) == 25
+        assert all(document.created_at is not None for document in created)
+
+    async def test_update_reports_missing_ids(self, db_session):
+        owner_id, other_id = await make_user(db_session), await make_user(db_session)
+        service = DocumentService(db=db_session)
+        first, second, untouched = await service.create_documents(
+            owner_id, [DocumentCreate(title='a'), DocumentCreate(title='b', description='keep'), DocumentCreate(title='c')]
+        )
+        foreign, = await service.create_documents(other_id, [DocumentCreate(title='theirs')])
+
+        updated = await service.update_documents(owner_id, [
+            DocumentBatchUpdateItem(id=first.id, title='A', description='new'),
+            DocumentBatchUpdateItem(id=second.id, title='B'),
+            DocumentBatchUpdateItem(id=untouched.id),
+            DocumentBatchUpdateItem(id=foreign.id, title='stolen'),
+        ])
+
+        assert set(updated) == {first.id, second.id, untouched.id}
+        assert (updated[first.id].title, updated[first.id].description) == ('A', 'new')
+        assert (updated[second.id].title, updated[second.id].description) == ('B', 'keep')
+        assert updated[untouched.id].title == 'c'
+        assert (await service.fetch_documents_by_id(other_id, foreign.id)).title == 'theirs'
+
+    async def test_delete_only_owned(self, db_session):
+        owner_id, other_id = await make_user(db_session), await make_user(db_session)
+        service = DocumentService(db=db_session)
+        mine = await service.create_documents(owner_id, [DocumentCreate(title='a'), DocumentCreate(title='b')])
+        foreign, = await service.create_documents(other_id, [DocumentCreate(title='theirs')])
+
+        deleted = await service.delete_documents(owner_id, [mine[0].id, mine[1].id, foreign.id])
+
+        assert deleted == {mine[0].id, mine[1].id}
+        assert await service.fetch_documents_by_id(other_id, foreign.id) is not None
+
+
+@pytest.mark.integration
+@pytest.mark.taskapp
+class TestDocumentSearch:
+    @pytest.fixture
+    async def documents(self, db_session):
+        user_id = await make_user(db_session)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        rows = [
+            ('Paris trip', 'flights and hotel'),
+            ('Groceries', 'milk, eggs'),
+            ('Trip to Rome', None),
+            ('Budget 100%', 'q1_report'),
+            ('archive', 'old paris photos'),
+        ]
+        for i, (title, description) in enumerate(rows):
+            db_session.add(DocumentCollection(
+                title=title, description=description, user_id=user_id, created_at=base + timedelta(days=i)
+            ))
+        await db_session.commit()
+        return user_id, base
+
+    async def fetch_titles(self, db_session, user_id: int, **filters) -> list:
+        page, _ = await DocumentService(db=db_session).fetch_documents(user_id=user_id, limit=50, **filters)
+        return [document.title for document in page]
+
+    async def test_substring_matches_title_and_description(self, db_session, documents):
+        user_id, _ = documents
+
+        assert await self.fetch_titles(db_session, user_id, q='PARIS') == ['Paris trip', 'archive']
+        assert await self.fetch_titles(db_session, user_id, q='rip') == ['Paris trip', 'Trip to Rome']
+
+    async def test_full_text_matches_words_in_any_order(self, db_session, documents):
+        if db_session.get_bind().dialect.name != 'postgresql':
+            pytest.skip('full-text search needs postgres')
+        user_id, _ = documents
+
+        assert await self.fetch_titles(db_session, user_id, q='trip paris') == ['Paris trip']
+
+    async def test_like_wildcards_are_literal(self, db_session, documents):
+        user_id, _ = documents
+
+        assert await self.fetch_titles(db_session, user_id, q='100%') == ['Budget 100%']
+        assert await self.fetch_titles(db_session, user_id, q='q1_') == ['Budget 100%']
+        assert await self.fetch_titles(db_session, user_id, q='%') == ['Budget 100%']
+
+    async def test_created_range(self, db_session, documents):
+        user_id, base = documents
+
+        titles = await self.fetch_titles(
+            db_session, user_id, created_after=base + timedelta(days=1), created_before=base + timedelta(days=3)
+        )
+
+        assert titles == ['Groceries', 'Trip to Rome']
+
+    async def test_title_sort_pages_descending(self, db_session, documents):
+        user_id, _ = documents
+        service = DocumentService(db=db_session)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = await service.fetch_documents(user_id=user_id, limit=2, cursor=cursor, sort='-title')
+            seen.extend(document.title for document in page)
+            if cursor is None:
+                break
+
+        assert seen == sorted(seen, reverse=True)
+        assert len(seen) == 5
+
+    @pytest.mark.parametrize('issued, requested', [
+        ('title', 'created_at'),
+        ('created_at', '-created_at'),
+        ('-title', 'title')
+    ])
+    async def test_cursor_of_other_sort_is_rejected(self, db_session, documents, issued, requested):
+        user_id, _ = documents
+        service = DocumentService(db=db_session)
+        _, cursor = await service.fetch_documents(user_id=user_id, limit=2, sort=issued)
+
+        with pytest.raises(ValueError):
+            await service.fetch_documents(user_id=user_id, limit=2, cursor=cursor, sort=requested)
+
+
+@pytest.mark.integration
+@pytest.mark.taskapp
+class TestDocumentListVersion:
+    async def test_writes_bump_the_version(self, db_session):
+        user_id = await make_user(db_session)
+        service = DocumentService(db=db_session)
+        assert await service.list_version(user_id) == 0
+
+        document_id = await service.create_document(user_id, DocumentCreate(title='a'))
+        assert await service.list_version(user_id) == 1
+
+        await service.update_document(user_id, document_id, DocumentUpdate(title='b'))
+        created = await service.create_documents(user_id, [DocumentCreate(title='c'), DocumentCreate(title='d')])
+        await service.update_documents(user_id, [DocumentBatchUpdateItem(id=created[0].id, title='e')])
+        assert await service.list_version(user_id) == 4
+
+        await service.delete_documents(user_id, [created[1].id])
+        await service.delete_collection(user_id, document_id)
+        assert await service.list_version(user_id) == 6
+
+    async def test_misses_keep_the_version(self, db_session):
+        owner_id, other_id = await make_user(db_session), await make_user(db_session)
+        service = DocumentService(db=db_session)
+        document_id = await service.create_document(owner_id, DocumentCreate(title='mine'))
+
+        await service.update_document(other_id, document_id, DocumentUpdate(title='stolen'))
+        await service.update_documents(other_id, [DocumentBatchUpdateItem(id=document_id, title='stolen')])
+        await service.delete_documents(other_id, [document_id])
+        await service.delete_collection(other_id, document_id)
+
+        assert await service.list_version(other_id) == 0
+        assert await service.list_version(owner_id) == 1
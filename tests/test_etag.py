@@ -0,0 +1,29 @@
+import pytest
+from starlette.datastructures import QueryParams
+
+from app.etag import etag_matches, list_etag
+
+
+@pytest.mark.unit
+class TestListEtag:
+    def test_weak_and_stable_across_param_order(self):
+        etag = list_etag(1, 5, QueryParams('limit=10&q=trip'))
+
+        assert etag.startswith('W/"')
+        assert etag == list_etag(1, 5, QueryParams('q=trip&limit=10'))
+
+    @pytest.mark.parametrize('user_id, version, query', [
+        (2, 5, 'limit=10&q=trip'),
+        (1, 6, 'limit=10&q=trip'),
+        (1, 5, 'limit=10&q=trips'),
+        (1, 5, 'limit=10'),
+    ])
+    def test_changes_with_user_version_and_query(self, user_id, version, query):
+        assert list_etag(user_id, version, QueryParams(query)) != list_etag(1, 5, QueryParams('limit=10&q=trip'))
+
+    def test_matches_if_none_match(self):
+        etag = list_etag(1, 5, QueryParams(''))
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag}', etag)
+        assert not etag_matches(list_etag(1, 6, QueryParams('')), etag)
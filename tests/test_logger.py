@@ -0,0 +1,68 @@
+import json
+import logging
+from queue import Queue
+
+import pytest
+from fastapi import status
+
+from app import logger as app_logger
+from app.config import settings
+from app.logger import DroppingQueueHandler, _orjson_dumps, configure_logger, get_log_queue_stats
+
+
+def make_record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord('test', logging.INFO, __file__, 1, msg, None, None)
+
+
+@pytest.mark.unit
+class TestDroppingQueueHandler:
+    def test_enqueues_until_full_then_counts_drops(self):
+        handler = DroppingQueueHandler(Queue(maxsize=2))
+
+        for i in range(5):
+            handler.handle(make_record(f'record-{i}'))
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+        assert handler.queue.get_nowait().getMessage() == 'record-0'
+
+    def test_stats_report_queue(self):
+        stats = get_log_queue_stats()
+
+        assert stats['enabled'] is settings.log_queue_enabled
+        assert stats['dropped'] >= 0
+
+
+@pytest.mark.unit
+class TestConfigureLogger:
+    def test_repeated_calls_open_no_new_handlers(self, monkeypatch):
+        configure_logger()
+        built = []
+        monkeypatch.setattr(app_logger, '_build_handlers', lambda: built.append(1) or [])
+
+        configure_logger()
+        configure_logger()
+
+        assert built == []
+
+
+@pytest.mark.unit
+class TestOrjsonSerializer:
+    def test_matches_stdlib_output(self):
+        event = {'event': 'Request finished', 'status_code': 200, 'nested': {1: 'a'}}
+
+        assert json.loads(_orjson_dumps(event)) == {'event': 'Request finished', 'status_code': 200, 'nested': {'1': 'a'}}
+
+    def test_uses_fallback_for_unknown_types(self):
+        assert json.loads(_orjson_dumps({'value': object()}, default=repr))['value'].startswith('<object')
+
+
+@pytest.mark.integration
+class TestLogQueueRoute:
+    def test_log_queue_stats(self, client, monkeypatch):
+        monkeypatch.setattr(settings, 'internal_api_key', 'internal-key')
+
+        response = client.get('/internal/logging/queue', headers={'X-Internal-Key': 'internal-key'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['data']['capacity'] == settings.log_queue_size
@@ -1,7 +1,8 @@
 import pytest
+import pytest_asyncio
 from faker import Faker
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.userapp.entities import DocumentUser
 from app.userapp.service import UserService
@@ -72,16 +73,16 @@ def login_payload(valid_user_data):
         "password": "testpassword123"
     }
 
-@pytest.fixture(scope='session')
-def make_test_user(db_engine):
-    with Session(bind=db_engine) as session:
+@pytest_asyncio.fixture(scope='session')
+async def make_test_user(db_engine):
+    async with AsyncSession(bind=db_engine, expire_on_commit=False) as session:
         user = DocumentUser(
             name="Test User",
             email="test@example.com",
             hashed_pwd='hashed_pwd_123'
         )
         session.add(user)
-        session.commit()
-        session.refresh(user)
+        await session.commit()
+        await session.refresh(user)
 
     return user
\ No newline at end of file